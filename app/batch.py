@@ -0,0 +1,64 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+
+from app.pagination import DEFAULT_MAX_WORKERS
+
+# Called as ``on_progress(done, total, item, outcome)`` after each item.
+ProgressCallback = Callable[[int, int, object, dict], Awaitable[None]]
+
+
+def _outcome(exc: Exception) -> dict:
+    return {
+        "ok": False,
+        "error": str(exc),
+        "status_code": getattr(exc, "status_code", None),
+    }
+
+
+async def gather_each(
+    fn: Callable[[object], Awaitable],
+    items: Sequence,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    on_progress: ProgressCallback | None = None,
+) -> list[dict]:
+    """Await ``fn(item)`` for every item with at most ``max_workers`` in flight.
+
+    A failing item does not stop the others. The outcome of each item is
+    returned in input order, as ``{"ok": True, "result": ...}`` or
+    ``{"ok": False, "error": ..., "status_code": ...}``. Only ``max_workers``
+    tasks exist at a time, however long ``items`` is.
+    """
+    outcomes: list[dict | None] = [None] * len(items)
+    pending = iter(enumerate(items))
+    done = 0
+
+    async def worker():
+        nonlocal done
+        for index, item in pending:
+            try:
+                outcome = {"ok": True, "result": await fn(item)}
+            # Whatever one item raises (an API error, a network error, an
+            # open circuit or a malformed response) is reported as its own
+            # outcome rather than cancelling the rest of the batch.
+            except Exception as exc:  # noqa: BLE001
+                outcome = _outcome(exc)
+            outcomes[index] = outcome
+            done += 1
+            if on_progress is not None:
+                await on_progress(done, len(items), item, outcome)
+
+    async with asyncio.TaskGroup() as group:
+        for _ in range(min(max(max_workers, 1), len(items))):
+            group.create_task(worker())
+    return outcomes
+
+
+def summarize(results: list[dict]) -> dict:
+    """Wrap per-item results with success and failure counts."""
+    succeeded = sum(1 for result in results if result["ok"])
+    return {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results,
+    }
@@ -0,0 +1,209 @@
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Outcomes kept per endpoint, however busy, to judge its health and
+# estimate its latency.
+MAX_SAMPLES = 500
+
+# The latency quantile after which an idempotent read is sent again when
+# hedging is on, and the successful calls needed to estimate it.
+HEDGE_QUANTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+
+# The most hedged reads, as a share of an endpoint's recent requests, so that
+# a latency estimate biased low cannot make hedging snowball.
+HEDGE_BUDGET = 1 - HEDGE_QUANTILE
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to an endpoint whose circuit is open."""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(
+            f"Paystack {endpoint} is failing; not retried for another {retry_in:.0f}s."
+        )
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+@dataclass
+class BreakerConfig:
+    """When an endpoint's circuit opens, and whether its reads are hedged.
+
+    A request fails when it raises a transport error, gets a 5xx response or
+    takes longer than ``slow_call`` seconds. Once at least ``min_calls``
+    requests were sent within ``window`` seconds and ``error_rate`` of them
+    failed, the circuit opens and requests fail fast for ``cooldown``
+    seconds. A single probe is then let through: the circuit closes again
+    if it succeeds and reopens if it fails.
+    """
+
+    enabled: bool = True
+    error_rate: float = 0.5
+    slow_call: float = 10.0
+    min_calls: int = 20
+    window: float = 30.0
+    cooldown: float = 30.0
+    hedge: bool = False
+
+    @classmethod
+    def from_env(cls) -> "BreakerConfig":
+        """Build a config from ``PAYSTACK_BREAKER_*`` and ``PAYSTACK_HEDGE``."""
+        return cls(
+            enabled=os.environ.get("PAYSTACK_BREAKER", "1").lower()
+            not in ("0", "false", "no"),
+            error_rate=float(
+                os.environ.get("PAYSTACK_BREAKER_ERROR_RATE", cls.error_rate)
+            ),
+            slow_call=float(
+                os.environ.get("PAYSTACK_BREAKER_SLOW_CALL", cls.slow_call)
+            ),
+            min_calls=int(os.environ.get("PAYSTACK_BREAKER_MIN_CALLS", cls.min_calls)),
+            cooldown=float(os.environ.get("PAYSTACK_BREAKER_COOLDOWN", cls.cooldown)),
+            hedge=os.environ.get("PAYSTACK_HEDGE", "").lower() in ("1", "true", "yes"),
+        )
+
+
+class CircuitBreaker:
+    """The health of one endpoint, judged from its recent requests."""
+
+    def __init__(self, endpoint: str, config: BreakerConfig, on_change=None):
+        self.endpoint = endpoint
+        self.config = config
+        self.on_change = on_change
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+        # (finished at, seconds taken, failed) per recent request.
+        self._samples: deque[tuple[float, float, bool]] = deque(maxlen=MAX_SAMPLES)
+        # When each recent hedged read was sent.
+        self._hedges: deque[float] = deque(maxlen=MAX_SAMPLES)
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: str):
+        self.state = state
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+        self._samples.clear()
+        self._hedges.clear()
+        if self.on_change is not None:
+            self.on_change(self.endpoint, state)
+
+    def _recent(self, now: float) -> deque:
+        while self._samples and self._samples[0][0] < now - self.config.window:
+            self._samples.popleft()
+        # Hedges are judged against the requests still kept as samples.
+        oldest = self._samples[0][0] if self._samples else now
+        while self._hedges and self._hedges[0] < oldest:
+            self._hedges.popleft()
+        return self._samples
+
+    def allow(self):
+        """Let a request through, or raise :class:`CircuitOpenError`."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN:
+                retry_in = self.opened_at + self.config.cooldown - time.monotonic()
+                if retry_in > 0:
+                    raise CircuitOpenError(self.endpoint, retry_in)
+                self._set_state(HALF_OPEN)
+            if self.probing:
+                raise CircuitOpenError(self.endpoint, 0)
+            self.probing = True
+
+    def record(self, elapsed: float, failed: bool):
+        """Count the outcome of a request :meth:`allow` let through."""
+        failed = failed or elapsed > self.config.slow_call
+        now = time.monotonic()
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.probing = False
+                self._set_state(OPEN if failed else CLOSED)
+                return
+            if self.state == OPEN:
+                return
+            samples = self._recent(now)
+            samples.append((now, elapsed, failed))
+            if not self.config.enabled or len(samples) < self.config.min_calls:
+                return
+            failures = sum(1 for sample in samples if sample[2])
+            if failures >= self.config.error_rate * len(samples):
+                self._set_state(OPEN)
+
+    def release(self, elapsed: float | None = None):
+        """Forget a request :meth:`allow` let through that was cancelled.
+
+        A request cancelled after ``elapsed`` seconds, such as the loser of a
+        hedged read, took at least that long; it is kept as a latency sample,
+        not as a failure, so the hedge delay is not estimated from winners
+        alone.
+        """
+        with self._lock:
+            self.probing = False
+            if self.state == CLOSED and elapsed is not None:
+                now = time.monotonic()
+                self._recent(now).append((now, elapsed, False))
+
+    def hedged(self):
+        """Count a read sent a second time after :meth:`hedge_delay`."""
+        with self._lock:
+            self._hedges.append(time.monotonic())
+
+    def hedge_delay(self) -> float | None:
+        """Return the p95 latency of recent successful requests.
+
+        ``None`` until enough requests succeeded to estimate it, while the
+        circuit is not closed, or once :data:`HEDGE_BUDGET` of the recent
+        requests were hedged.
+        """
+        with self._lock:
+            if self.state != CLOSED:
+                return None
+            samples = self._recent(time.monotonic())
+            if len(self._hedges) >= HEDGE_BUDGET * len(samples):
+                return None
+            latencies = sorted(elapsed for _, elapsed, failed in samples if not failed)
+        if len(latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return latencies[int(HEDGE_QUANTILE * (len(latencies) - 1))]
+
+    def stats(self) -> dict:
+        with self._lock:
+            samples = list(self._recent(time.monotonic()))
+        return {
+            "state": self.state,
+            "calls": len(samples),
+            "failures": sum(1 for sample in samples if sample[2]),
+        }
+
+
+class CircuitBreakers:
+    """A circuit breaker per endpoint, created on first use."""
+
+    def __init__(self, config: BreakerConfig | None = None, on_change=None):
+        self.config = config or BreakerConfig.from_env()
+        self.on_change = on_change
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    endpoint, CircuitBreaker(endpoint, self.config, self.on_change)
+                )
+        return breaker
+
+    def stats(self) -> dict:
+        return {
+            endpoint: breaker.stats() for endpoint, breaker in self._breakers.items()
+        }
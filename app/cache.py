@@ -0,0 +1,309 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import UTC, datetime
+from typing import Protocol
+
+from app.breaker import CircuitOpenError
+from app.metrics import metrics
+
+# Seconds each read endpoint may be served from the cache. Endpoints that are
+# not listed here are never cached.
+DEFAULT_TTLS = {
+    "list_countries": 24 * 60 * 60,
+    "fetch_banks": 24 * 60 * 60,
+    "list_avs": 24 * 60 * 60,
+    "resolve_card_bin": 24 * 60 * 60,
+    "fetch_plan": 5 * 60,
+    "fetch_product": 5 * 60,
+    "fetch_payment_page": 5 * 60,
+    "fetch_customer": 60,
+    "get_balance": 60,
+    "get_balance_ledger": 60,
+}
+
+# Seconds after which a cached read is refreshed in the background; until
+# its TTL runs out, the cached response is still returned straight away.
+# Responses of these reads carry the time they were fetched.
+DEFAULT_REVALIDATE_AFTER = {
+    "get_balance": 5,
+    "get_balance_ledger": 5,
+}
+
+# Reads that are not cached otherwise but are answered from records pushed
+# into the cache by Paystack webhooks (see app.webhooks).
+PUSHED_ENDPOINTS = frozenset({"verify_transaction", "fetch_dispute"})
+
+# Reads whose last response is kept, even when not cached otherwise, to
+# answer while the endpoint's circuit is open (see app.breaker). Cached
+# reads keep their last response too.
+STALE_ENDPOINTS = frozenset({"verify_transaction"})
+
+
+class ResponseCache(Protocol):
+    """The interface a response cache must provide to be used by a client."""
+
+    def get(self, key: tuple, default=None, count_miss: bool = True): ...
+
+    def get_stale(self, key: tuple, default=None): ...
+
+    def set(self, key: tuple, value, ttl: float): ...
+
+    def keep(self, key: tuple, value): ...
+
+    def invalidate(self, *prefix): ...
+
+    def stats(self) -> dict: ...
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """A thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+
+    Alongside the live entries it keeps the last good response of each read
+    (:meth:`keep`), without expiry, for :meth:`get_stale`. These copies are
+    held in a separate LRU of ``stale_size`` entries, so they never push
+    live entries out.
+    """
+
+    def __init__(self, maxsize: int | None = None, stale_size: int | None = None):
+        if maxsize is None:
+            maxsize = int(os.environ.get("PAYSTACK_CACHE_SIZE", "1024"))
+        if stale_size is None:
+            stale_size = int(os.environ.get("PAYSTACK_STALE_CACHE_SIZE", str(maxsize)))
+        self.maxsize = maxsize
+        self.stale_size = stale_size
+        self._entries = OrderedDict()
+        self._stale = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple, default=None, count_miss: bool = True):
+        """Return a live entry and mark it as recently used.
+
+        With ``count_miss`` false, finding nothing is not counted as a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            if count_miss:
+                self.misses += 1
+            return default
+
+    def get_stale(self, key: tuple, default=None):
+        """Return the last good response kept for ``key``, however old."""
+        with self._lock:
+            return self._stale.get(key, default)
+
+    def set(self, key: tuple, value, ttl: float):
+        """Store an entry, evicting the least recently used one if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def keep(self, key: tuple, value):
+        """Keep ``value`` as the last good response for ``key``."""
+        with self._lock:
+            self._stale[key] = value
+            self._stale.move_to_end(key)
+            while len(self._stale) > self.stale_size:
+                self._stale.popitem(last=False)
+
+    def invalidate(self, *prefix):
+        """Drop every entry whose key starts with ``prefix``."""
+        size = len(prefix)
+        with self._lock:
+            for entries in (self._entries, self._stale):
+                for key in [key for key in entries if key[:size] == prefix]:
+                    del entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stale.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "stale_size": len(self._stale),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _count_lookup(client, endpoint: str, result: str):
+    tenant = getattr(client, "tenant", "default")
+    metrics.cache_lookups.inc(tenant, endpoint, result)
+
+
+def _stale(client, key: tuple):
+    """Return the last response kept for ``key``, marked as stale."""
+    value = client.cache.get_stale(key, _MISSING)
+    if value is _MISSING:
+        return _MISSING
+    _count_lookup(client, key[0], "stale")
+    return {**value, "stale": True} if isinstance(value, dict) else value
+
+
+def _stamped(value):
+    """Attach the time a response was fetched, as ``fetched_at``."""
+    if not isinstance(value, dict):
+        return value
+    fetched_at = datetime.fromtimestamp(time.time(), UTC)
+    return {**value, "fetched_at": fetched_at.isoformat(timespec="milliseconds")}
+
+
+def _age(value) -> float:
+    """Return seconds since a stamped response was fetched."""
+    try:
+        fetched_at = datetime.fromisoformat(value["fetched_at"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return float("inf")
+    return time.time() - fetched_at
+
+
+def _call_key(func, signature: inspect.Signature, args, kwargs) -> tuple:
+    """Build a cache key from the endpoint name and its bound arguments."""
+    bound = signature.bind(None, *args, **kwargs)
+    bound.apply_defaults()
+    values = list(bound.arguments.values())[1:]
+    return (func.__name__, *values)
+
+
+def cached(func):
+    """Serve a read method from ``self.cache`` for its configured TTL.
+
+    Works on both plain and ``async`` methods. The TTL is looked up by method
+    name in ``self.cache_ttls``; methods without a TTL bypass the cache,
+    except that :data:`PUSHED_ENDPOINTS` still return records pushed into it
+    (finding none is not counted as a cache miss).
+    When a call fails because the endpoint's circuit is open, the last good
+    response kept for it is returned instead, marked ``"stale": true``;
+    :data:`STALE_ENDPOINTS` keep their last response for this alone.
+
+    Async methods listed in ``self.revalidate_after`` are served
+    stale-while-revalidate: past that many seconds a cached response is
+    still returned, while a single refresh runs in the background.
+    """
+    signature = inspect.signature(func)
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            name = func.__name__
+            ttl = self.cache_ttls.get(name)
+            if not ttl and name not in PUSHED_ENDPOINTS | STALE_ENDPOINTS:
+                return await func(self, *args, **kwargs)
+            key = _call_key(func, signature, args, kwargs)
+            revalidate_after = self.revalidate_after.get(name)
+            if ttl or name in PUSHED_ENDPOINTS:
+                value = self.cache.get(key, _MISSING, count_miss=bool(ttl))
+                if value is not _MISSING:
+                    _count_lookup(self, name, "hit")
+                    if revalidate_after is not None and _age(value) >= revalidate_after:
+
+                        async def revalidate():
+                            fresh = _stamped(await func(self, *args, **kwargs))
+                            self.cache.set(key, fresh, ttl)
+                            self.cache.keep(key, fresh)
+
+                        self.inflight.start(("revalidate", *key), revalidate)
+                    return value
+                if ttl:
+                    _count_lookup(self, name, "miss")
+            try:
+                value = await func(self, *args, **kwargs)
+            except CircuitOpenError:
+                if (value := _stale(self, key)) is _MISSING:
+                    raise
+                return value
+            if revalidate_after is not None:
+                value = _stamped(value)
+            if ttl:
+                self.cache.set(key, value, ttl)
+            self.cache.keep(key, value)
+            return value
+
+    else:
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            name = func.__name__
+            ttl = self.cache_ttls.get(name)
+            if not ttl and name not in PUSHED_ENDPOINTS | STALE_ENDPOINTS:
+                return func(self, *args, **kwargs)
+            key = _call_key(func, signature, args, kwargs)
+            if ttl or name in PUSHED_ENDPOINTS:
+                value = self.cache.get(key, _MISSING, count_miss=bool(ttl))
+                if value is not _MISSING:
+                    _count_lookup(self, name, "hit")
+                    return value
+                if ttl:
+                    _count_lookup(self, name, "miss")
+            try:
+                value = func(self, *args, **kwargs)
+            except CircuitOpenError:
+                if (value := _stale(self, key)) is _MISSING:
+                    raise
+                return value
+            if ttl:
+                self.cache.set(key, value, ttl)
+            self.cache.keep(key, value)
+            return value
+
+    return wrapper
+
+
+def invalidates(*endpoints: str):
+    """Drop cached reads of ``endpoints`` once a write method succeeds.
+
+    Every entry of each endpoint is dropped, not just those cached under the
+    identifier the write was given: the same object may have been read by
+    another one, such as a customer by email rather than code, or a payment
+    page by slug rather than ID.
+    """
+
+    def decorator(func):
+        def invalidate(self):
+            for endpoint in endpoints:
+                self.cache.invalidate(endpoint)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(self, *args, **kwargs):
+                result = await func(self, *args, **kwargs)
+                invalidate(self)
+                return result
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(self, *args, **kwargs):
+                result = func(self, *args, **kwargs)
+                invalidate(self)
+                return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,186 @@
+import asyncio
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import threading
+from typing import ClassVar
+
+import httpx
+
+# Recorded interactions are appended to the cassette file this many at a
+# time (and when the process exits).
+FLUSH_EVERY = 50
+
+# Response headers not worth replaying: they describe the original
+# connection or encoding, not the response.
+SKIPPED_HEADERS = frozenset(
+    {
+        "connection",
+        "content-encoding",
+        "content-length",
+        "date",
+        "keep-alive",
+        "server",
+        "set-cookie",
+        "transfer-encoding",
+    }
+)
+
+MODES = ("record", "replay")
+
+
+class CassetteMissError(LookupError):
+    """Raised when a replayed request was never recorded."""
+
+
+def request_key(request: httpx.Request) -> str:
+    """Identify a request by method, path, sorted query and a body hash.
+
+    Headers, including the API key, are not part of the key, so cassettes
+    recorded with one key replay with any other.
+    """
+    query = "&".join(
+        f"{name}={value}" for name, value in sorted(request.url.params.multi_items())
+    )
+    body = hashlib.sha256(request.content).hexdigest()[:16] if request.content else ""
+    return f"{request.method} {request.url.path}?{query} {body}"
+
+
+class Cassette:
+    """Recorded Paystack responses, stored as gzipped JSON Lines.
+
+    Each line is one interaction: the request key and the response status,
+    headers and body. Requests are never stored, so no credentials end up
+    in the file. Responses are indexed by key; a key recorded several times
+    replays its responses in order, starting over after the last one.
+    """
+
+    _open: ClassVar[dict[str, "Cassette"]] = {}
+    _open_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        self.interactions: dict[str, list[dict]] = {}
+        self._plays: dict[str, int] = {}
+        self._unsaved: list[dict] = []
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        self._index(json.loads(line))
+
+    @classmethod
+    def open(cls, path: str) -> "Cassette":
+        """Return the process-wide cassette for ``path``, shared by every client."""
+        with cls._open_lock:
+            if path not in cls._open:
+                cls._open[path] = cassette = cls(path)
+                atexit.register(cassette.flush)
+            return cls._open[path]
+
+    def _index(self, interaction: dict):
+        self.interactions.setdefault(interaction["key"], []).append(interaction)
+
+    def record(self, request: httpx.Request, response: httpx.Response):
+        interaction = {
+            "key": request_key(request),
+            "status": response.status_code,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in SKIPPED_HEADERS
+            },
+            "body": response.text,
+        }
+        with self._lock:
+            self._index(interaction)
+            self._unsaved.append(interaction)
+            if len(self._unsaved) < FLUSH_EVERY:
+                return
+        self.flush()
+
+    def flush(self):
+        """Append unsaved interactions to the file as a new gzip member."""
+        with self._lock:
+            unsaved, self._unsaved = self._unsaved, []
+            if not unsaved:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with gzip.open(self.path, "at", encoding="utf-8") as file:
+                for interaction in unsaved:
+                    file.write(json.dumps(interaction, separators=(",", ":")) + "\n")
+
+    def play(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request)
+        recorded = self.interactions.get(key)
+        if not recorded:
+            raise CassetteMissError(f"No recorded response for {key!r} in {self.path}")
+        with self._lock:
+            play = self._plays.get(key, 0)
+            self._plays[key] = play + 1
+        interaction = recorded[play % len(recorded)]
+        return httpx.Response(
+            interaction["status"],
+            headers=interaction["headers"],
+            content=interaction["body"].encode(),
+            request=request,
+        )
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Send requests upstream and record every response in a cassette."""
+
+    def __init__(self, cassette: Cassette, transport: httpx.AsyncBaseTransport):
+        self.cassette = cassette
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        await response.aread()
+        self.cassette.record(request, response)
+        return response
+
+    async def aclose(self):
+        self.cassette.flush()
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Answer requests from a cassette, optionally after a simulated delay."""
+
+    def __init__(self, cassette: Cassette, latency: float = 0.0):
+        self.cassette = cassette
+        self.latency = latency
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        return self.cassette.play(request)
+
+
+def cassette_transport(
+    limits: httpx.Limits, http2: bool = False
+) -> httpx.AsyncBaseTransport | None:
+    """Build the cassette transport configured by ``PAYSTACK_CASSETTE*``.
+
+    Returns ``None`` when no cassette is configured. Recording sends real
+    requests through a transport with the given pool ``limits``.
+    """
+    path = os.environ.get("PAYSTACK_CASSETTE")
+    if not path:
+        return None
+    mode = os.environ.get("PAYSTACK_CASSETTE_MODE", "replay")
+    if mode not in MODES:
+        raise ValueError(f"PAYSTACK_CASSETTE_MODE must be one of {', '.join(MODES)}.")
+    cassette = Cassette.open(path)
+    if mode == "record":
+        return RecordingTransport(
+            cassette, httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+        )
+    latency = float(os.environ.get("PAYSTACK_CASSETTE_LATENCY", "0")) / 1000
+    return ReplayTransport(cassette, latency)
@@ -0,0 +1,214 @@
+import csv
+import io
+import json
+import os
+from collections.abc import Awaitable, Callable
+
+from app.batch import gather_each
+from app.pagination import DEFAULT_MAX_WORKERS
+from app.paystack_client import PaystackAPIError
+
+# Customers written to the checkpoint (and reported as progress) at a time.
+DEFAULT_CHUNK_SIZE = 500
+
+# Failed customers listed in an import summary; the rest are only counted
+# (every failure is in the checkpoint).
+MAX_REPORTED_FAILURES = 50
+
+CUSTOMER_FIELDS = ("email", "first_name", "last_name", "phone")
+
+# Column names other systems commonly export, mapped to ours.
+FIELD_ALIASES = {
+    "firstname": "first_name",
+    "lastname": "last_name",
+    "phone_number": "phone",
+    "email_address": "email",
+}
+
+
+def _field(name: str) -> str:
+    name = name.strip().lower().replace(" ", "_").replace("-", "_")
+    return FIELD_ALIASES.get(name, name)
+
+
+def _customer(record: dict) -> dict:
+    customer = {}
+    for name, value in record.items():
+        if name is None:
+            continue
+        field = _field(name)
+        if field in CUSTOMER_FIELDS:
+            value = str(value).strip() if value is not None else ""
+            customer[field] = value or None
+    return customer
+
+
+def import_path(path: str) -> str:
+    """Resolve ``path`` inside ``PAYSTACK_IMPORT_DIR``, refusing anything else.
+
+    Relative paths are taken from the import directory. Paths that lead
+    outside it, including through symlinks, are rejected, so callers of the
+    server cannot read or write other files.
+    """
+    directory = os.environ.get("PAYSTACK_IMPORT_DIR")
+    if not directory:
+        raise ValueError("Set PAYSTACK_IMPORT_DIR to import customers from files.")
+    root = os.path.realpath(directory)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"{path!r} is outside the import directory.")
+    return resolved
+
+
+def parse_customers(payload: str | None = None, path: str | None = None) -> list[dict]:
+    """Read customers from CSV or JSON Lines text, or from a file holding either.
+
+    The format is taken from the file extension (``.csv``, ``.jsonl``,
+    ``.ndjson``) and otherwise guessed from the first character. CSV files
+    need a header row; ``email``, ``first_name``, ``last_name`` and ``phone``
+    are read and other columns are ignored.
+    """
+    if (payload is None) == (path is None):
+        raise ValueError("Provide either customer data or a file path.")
+    if path is not None:
+        with open(path, encoding="utf-8-sig", newline="") as file:
+            payload = file.read()
+        extension = os.path.splitext(path)[1].lower()
+    else:
+        extension = ""
+    if extension in (".jsonl", ".ndjson") or (
+        extension != ".csv" and payload.lstrip().startswith("{")
+    ):
+        records = [json.loads(line) for line in payload.splitlines() if line.strip()]
+    else:
+        records = list(csv.DictReader(io.StringIO(payload)))
+    return [_customer(record) for record in records]
+
+
+def dedupe_by_email(customers: list[dict]) -> list[dict]:
+    """Merge customers sharing an email address; later values win.
+
+    Emails are compared case-insensitively. Customers without an email are
+    kept as they are so they can be reported as failures.
+    """
+    merged: dict[str, dict] = {}
+    without_email = []
+    for customer in customers:
+        email = (customer.get("email") or "").lower()
+        if not email:
+            without_email.append(customer)
+            continue
+        entry = merged.setdefault(email, {})
+        entry.update({key: value for key, value in customer.items() if value})
+        entry["email"] = email
+    return [*merged.values(), *without_email]
+
+
+class ImportCheckpoint:
+    """An append-only JSON Lines record of customers already imported.
+
+    Each finished customer is one line, so a crashed import loses at most
+    the chunk in flight. Customers recorded as successful are skipped when
+    the import is run again; failed ones are retried.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.completed: dict[str, dict] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash.
+                        continue
+                    if entry.get("ok"):
+                        self.completed[entry["email"]] = entry
+
+    def record(self, entries: list[dict]):
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.writelines(json.dumps(entry) + "\n" for entry in entries)
+            file.flush()
+            os.fsync(file.fileno())
+        self.completed.update(
+            (entry["email"], entry) for entry in entries if entry.get("ok")
+        )
+
+
+async def upsert_customer(client, customer: dict) -> dict:
+    """Create a customer, or update the one that already has its email."""
+    email = customer.get("email")
+    if not email:
+        raise ValueError("Customer has no email address.")
+    try:
+        existing = await client.fetch_customer(email)
+    except PaystackAPIError as exc:
+        if exc.status_code != 404:
+            raise
+        existing = None
+    fields = (customer.get("first_name"), customer.get("last_name"))
+    if existing is None:
+        response = await client.create_customer(email, *fields, customer.get("phone"))
+        action = "created"
+    else:
+        code = existing["data"]["customer_code"]
+        response = await client.update_customer(code, *fields, customer.get("phone"))
+        action = "updated"
+    return {"action": action, "customer_code": response["data"]["customer_code"]}
+
+
+async def import_customers(
+    client,
+    customers: list[dict],
+    checkpoint: ImportCheckpoint | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    on_progress: Callable[[int, int], Awaitable[None]] | None = None,
+) -> dict:
+    """Upsert customers concurrently, a chunk at a time.
+
+    Customers are deduplicated by email and any already recorded in
+    ``checkpoint`` are skipped. After each chunk its outcomes are appended to
+    the checkpoint and ``on_progress(done, total)`` is awaited. The summary
+    lists the first :data:`MAX_REPORTED_FAILURES` failures.
+    """
+    chunk_size = max(chunk_size, 1)
+    unique = dedupe_by_email(customers)
+    completed = checkpoint.completed if checkpoint is not None else {}
+    pending = [
+        customer for customer in unique if customer.get("email") not in completed
+    ]
+    summary = {
+        "total": len(unique),
+        "duplicates": len(customers) - len(unique),
+        "skipped": len(unique) - len(pending),
+        "created": 0,
+        "updated": 0,
+        "failed": 0,
+        "failures": [],
+    }
+    done = summary["skipped"]
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start : start + chunk_size]
+        outcomes = await gather_each(
+            lambda customer: upsert_customer(client, customer), chunk, max_workers
+        )
+        entries = []
+        for customer, outcome in zip(chunk, outcomes):
+            entry = {"email": customer.get("email"), "ok": outcome["ok"]}
+            if outcome["ok"]:
+                entry.update(outcome["result"])
+                summary[entry["action"]] += 1
+            else:
+                entry["error"] = outcome["error"]
+                summary["failed"] += 1
+                if len(summary["failures"]) < MAX_REPORTED_FAILURES:
+                    summary["failures"].append(entry)
+            entries.append(entry)
+        if checkpoint is not None:
+            checkpoint.record(entries)
+        done += len(chunk)
+        if on_progress is not None:
+            await on_progress(done, len(unique))
+    return summary
@@ -0,0 +1,139 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from collections.abc import AsyncIterable, Awaitable, Callable
+
+# Records stored per chunk, i.e. per resource read.
+DEFAULT_CHUNK_SIZE = 500
+
+# Exports older than this many seconds are deleted when a new one is written.
+DEFAULT_TTL = 60 * 60
+
+EXPORT_URI = "paystack://exports/{export_id}/{chunk}"
+
+
+class ExportStore:
+    """Large exports written to disk a chunk at a time.
+
+    Each export is a directory of numbered JSON chunk files plus a manifest
+    written once it is complete. Only the chunk being filled is held in
+    memory, and chunks can be read (through the ``paystack://exports``
+    resource) by any worker process sharing the directory.
+    """
+
+    def __init__(self, directory: str | None = None, ttl: float | None = None):
+        self._directory = directory
+        self._ttl = ttl
+
+    @property
+    def directory(self) -> str:
+        # Read lazily so settings loaded from .env after import still apply.
+        if self._directory is None:
+            self._directory = os.environ.get("PAYSTACK_EXPORT_DIR") or os.path.join(
+                tempfile.gettempdir(), "paystack-exports"
+            )
+        return self._directory
+
+    @property
+    def ttl(self) -> float:
+        if self._ttl is None:
+            self._ttl = float(os.environ.get("PAYSTACK_EXPORT_TTL", DEFAULT_TTL))
+        return self._ttl
+
+    def _path(self, export_id: str, name: str = "") -> str:
+        # Export ids are generated hex strings; anything else is not ours.
+        if not export_id.isalnum():
+            raise ValueError(f"Unknown export: {export_id!r}")
+        return os.path.join(self.directory, export_id, name)
+
+    def _write(self, path: str, value):
+        partial = path + ".partial"
+        with open(partial, "w", encoding="utf-8") as file:
+            json.dump(value, file, separators=(",", ":"))
+        os.replace(partial, path)
+
+    def prune(self):
+        """Delete exports older than the store's TTL."""
+        if not os.path.isdir(self.directory):
+            return
+        cutoff = time.time() - self.ttl
+        for entry in os.scandir(self.directory):
+            if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    async def write(
+        self,
+        records: AsyncIterable,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        on_chunk: Callable[[int, int], Awaitable[None]] | None = None,
+        **details,
+    ) -> dict:
+        """Write ``records`` to a new export and return its manifest.
+
+        ``on_chunk(chunks, records)`` is awaited after each chunk is written.
+        ``details`` are stored in the manifest as they are.
+        """
+        self.prune()
+        chunk_size = max(chunk_size, 1)
+        export_id = uuid.uuid4().hex
+        os.makedirs(self._path(export_id))
+        chunk, chunks, count = [], 0, 0
+
+        async def flush():
+            nonlocal chunk, chunks
+            self._write(self._path(export_id, f"{chunks}.json"), chunk)
+            chunks += 1
+            chunk = []
+            if on_chunk is not None:
+                await on_chunk(chunks, count)
+
+        async for record in records:
+            chunk.append(record)
+            count += 1
+            if len(chunk) >= chunk_size:
+                await flush()
+        if chunk or not chunks:
+            await flush()
+
+        manifest = {
+            **details,
+            "export": export_id,
+            "records": count,
+            "chunks": chunks,
+            "chunk_size": chunk_size,
+            "resource": EXPORT_URI.format(export_id=export_id, chunk=0),
+        }
+        self._write(self._path(export_id, "manifest.json"), manifest)
+        return manifest
+
+    def read(self, export_id: str, chunk: int) -> dict:
+        """Return one chunk of an export and the URI of the next one."""
+        try:
+            with open(self._path(export_id, f"{chunk}.json"), encoding="utf-8") as file:
+                records = json.load(file)
+        except FileNotFoundError:
+            raise ValueError(f"Export {export_id} has no chunk {chunk}.") from None
+        try:
+            with open(self._path(export_id, "manifest.json"), encoding="utf-8") as file:
+                chunks = json.load(file)["chunks"]
+        except FileNotFoundError:
+            # Still being written; later chunks may appear.
+            chunks = None
+        has_next = chunks is None or chunk + 1 < chunks
+        return {
+            "export": export_id,
+            "chunk": chunk,
+            "chunks": chunks,
+            "records": records,
+            "next": (
+                EXPORT_URI.format(export_id=export_id, chunk=chunk + 1)
+                if has_next
+                else None
+            ),
+        }
+
+
+exports = ExportStore()
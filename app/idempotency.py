@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# How long a stored result is returned for a repeated idempotency key.
+DEFAULT_RETENTION = 24 * 60 * 60
+
+
+class IdempotencyKeyReused(ValueError):
+    """Raised when an idempotency key is replayed for a different request."""
+
+
+def request_fingerprint(method: str, path: str, body: dict | None) -> str:
+    """Hash the parts of a write request that an idempotency key stands for."""
+    payload = json.dumps([method, path, body], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class IdempotencyLedger:
+    """Results of write requests, stored by their idempotency key.
+
+    Backed by SQLite; the default ``:memory:`` database lasts for the life of
+    the process, while a file path (``PAYSTACK_IDEMPOTENCY_DB``) lets a
+    repeated call be answered after a restart.
+    """
+
+    def __init__(self, path: str = ":memory:", retention: float = DEFAULT_RETENTION):
+        self.retention = retention
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS idempotency ("
+            " key TEXT PRIMARY KEY,"
+            " fingerprint TEXT NOT NULL,"
+            " result TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idempotency_created_at"
+            " ON idempotency (created_at)"
+        )
+
+    @classmethod
+    def from_env(cls) -> "IdempotencyLedger":
+        return cls(os.environ.get("PAYSTACK_IDEMPOTENCY_DB", ":memory:"))
+
+    def get(self, key: str, fingerprint: str):
+        """Return the stored result for ``key``, if it has not expired."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fingerprint, result FROM idempotency"
+                " WHERE key = ? AND created_at > ?",
+                (key, time.time() - self.retention),
+            ).fetchone()
+        if row is None:
+            return None
+        if row[0] != fingerprint:
+            raise IdempotencyKeyReused(
+                f"Idempotency key {key!r} was already used for a different request."
+            )
+        return json.loads(row[1])
+
+    def put(self, key: str, fingerprint: str, result):
+        """Store a result, deleting results older than the retention period."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM idempotency WHERE created_at <= ?",
+                (now - self.retention,),
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO idempotency VALUES (?, ?, ?, ?)",
+                (key, fingerprint, json.dumps(result), now),
+            )
@@ -0,0 +1,249 @@
+import bisect
+import contextlib
+import contextvars
+import functools
+import os
+import threading
+from collections import defaultdict
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Upper bounds, in bytes, of the payload size histogram buckets.
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Static segments of Paystack API paths; any other segment after the first
+# is an ID and is replaced by ``{id}`` in endpoint labels.
+STATIC_SEGMENTS = frozenset(
+    {
+        "bin",
+        "disable",
+        "evidence",
+        "export",
+        "initialize",
+        "ledger",
+        "product",
+        "resolve",
+        "states",
+        "timeline",
+        "verify",
+    }
+)
+
+# Seconds spent waiting on Paystack during the current tool call. Tasks the
+# tool starts inherit the same holder, so concurrent requests are summed.
+upstream_time: contextvars.ContextVar[list[float] | None] = contextvars.ContextVar(
+    "upstream_time", default=None
+)
+
+
+def endpoint_name(method: str, path: str) -> str:
+    """Return a low-cardinality label for a request, e.g. ``GET /dispute/{id}``."""
+    segments = path.strip("/").split("/")
+    named = segments[:1] + [
+        segment if segment in STATIC_SEGMENTS else "{id}" for segment in segments[1:]
+    ]
+    return f"{method} /{'/'.join(named)}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """A monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: int = 1):
+        with self._lock:
+            self._values[labels] += amount
+
+    def value(self, *labels) -> int:
+        return self._values.get(labels, 0)
+
+    def samples(self, extra: str = ""):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in values.items():
+            yield f"{self.name}{_labels(self.labels, labels, extra)} {value}"
+
+
+class Histogram:
+    """Observations counted into fixed buckets per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # Per label set: a count per bucket (the last one is +Inf), and the sum.
+        self._values: dict[tuple, tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def count(self, *labels) -> int:
+        entry = self._values.get(labels)
+        return sum(entry[0]) if entry else 0
+
+    def samples(self, extra: str = ""):
+        with self._lock:
+            values = {
+                labels: (list(counts), total[0])
+                for labels, (counts, total) in self._values.items()
+            }
+        for labels, (counts, total) in values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = f'le="{bound}",{extra}' if extra else f'le="{bound}"'
+                yield f"{self.name}_bucket{_labels(self.labels, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labels, labels, extra)} {total}"
+            yield f"{self.name}_count{_labels(self.labels, labels, extra)} {cumulative}"
+
+
+class Metrics:
+    """The server's instruments, rendered in the Prometheus text format.
+
+    Instruments are kept per process. When the server runs several workers
+    (``PAYSTACK_MCP_WORKERS``), every sample is labelled with the ``worker``
+    process ID, since a scrape only sees the worker that answered it.
+    """
+
+    def __init__(self):
+        self.tool_seconds = Histogram(
+            "paystack_mcp_tool_duration_seconds",
+            "Time to run a tool, including serializing its result.",
+            ("tool",),
+        )
+        self.tool_upstream_seconds = Histogram(
+            "paystack_mcp_tool_upstream_seconds",
+            "Time a tool spent waiting on Paystack, summed over its requests.",
+            ("tool",),
+        )
+        self.tool_serialize_seconds = Histogram(
+            "paystack_mcp_tool_serialize_seconds",
+            "Time spent shaping and serializing a tool's result.",
+            ("tool",),
+        )
+        self.tool_response_bytes = Histogram(
+            "paystack_mcp_tool_response_bytes",
+            "Size of a tool's serialized result.",
+            ("tool",),
+            SIZE_BUCKETS,
+        )
+        self.tool_calls = Counter(
+            "paystack_mcp_tool_calls_total",
+            "Tool calls by outcome.",
+            ("tool", "outcome"),
+        )
+        self.request_seconds = Histogram(
+            "paystack_request_duration_seconds",
+            "Time for one attempt of a Paystack API request.",
+            ("tenant", "endpoint"),
+        )
+        self.requests = Counter(
+            "paystack_requests_total",
+            "Paystack API request attempts by response status.",
+            ("tenant", "endpoint", "status"),
+        )
+        self.response_bytes = Histogram(
+            "paystack_response_bytes",
+            "Size of Paystack API response bodies.",
+            ("tenant", "endpoint"),
+            SIZE_BUCKETS,
+        )
+        self.retries = Counter(
+            "paystack_retries_total",
+            "Paystack API requests sent again after a transient failure.",
+            ("tenant", "endpoint"),
+        )
+        self.circuit_changes = Counter(
+            "paystack_circuit_changes_total",
+            "Circuit breaker state changes by the state entered.",
+            ("tenant", "endpoint", "state"),
+        )
+        self.hedges = Counter(
+            "paystack_hedged_requests_total",
+            "Reads sent a second time after a slow first attempt, by the winner.",
+            ("tenant", "endpoint", "winner"),
+        )
+        self.cache_lookups = Counter(
+            "paystack_cache_lookups_total",
+            "Response cache lookups by result: hit, miss or stale.",
+            ("tenant", "endpoint", "result"),
+        )
+
+    def instruments(self) -> list:
+        return [
+            value
+            for value in vars(self).values()
+            if isinstance(value, (Counter, Histogram))
+        ]
+
+    def render(self) -> str:
+        extra = ""
+        if int(os.environ.get("PAYSTACK_MCP_WORKERS", "1")) > 1:
+            extra = f'worker="{os.getpid()}"'
+        lines = []
+        for instrument in self.instruments():
+            lines.append(f"# HELP {instrument.name} {instrument.help}")
+            lines.append(f"# TYPE {instrument.name} {instrument.kind}")
+            lines.extend(instrument.samples(extra))
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+@functools.cache
+def _tracer():
+    if not os.environ.get("PAYSTACK_OTEL"):
+        return None
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        return None
+    return trace.get_tracer("paystack-mcp")
+
+
+def span(name: str, **attributes):
+    """Start an OpenTelemetry span when ``PAYSTACK_OTEL`` is set.
+
+    Spans are exported by whatever OpenTelemetry SDK the deployment
+    configures; without ``opentelemetry-api`` installed this does nothing.
+    """
+    tracer = _tracer()
+    if tracer is None:
+        return contextlib.nullcontext()
+    return tracer.start_as_current_span(name, attributes=attributes)
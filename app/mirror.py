@@ -0,0 +1,441 @@
+import asyncio
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the table layout changes.
+SCHEMA_VERSION = 3
+
+# Records written to the mirror per SQLite transaction while syncing.
+SYNC_BATCH_SIZE = 500
+
+# Each sync re-reads this many seconds before the high-water mark, so that
+# recent records whose status changed since the last sync are updated too.
+DEFAULT_LOOKBACK = 24 * 60 * 60
+
+# Percentiles of amounts reported by Mirror.aggregate unless others are asked for.
+DEFAULT_PERCENTILES = (50, 90, 95, 99)
+
+# Queryable columns holding numbers. Every other column is TEXT, so that IDs
+# and references that look like numbers are stored exactly as Paystack sent
+# them.
+INTEGER_COLUMNS = frozenset({"amount"})
+
+
+@dataclass(frozen=True)
+class MirroredResource:
+    """A Paystack list endpoint kept in a mirror table.
+
+    ``columns`` maps queryable column names to JSON paths into the stored
+    record; they are extracted once, when a record is written, into indexed
+    columns.
+    """
+
+    name: str
+    iterate: str
+    columns: dict[str, str] = field(default_factory=dict)
+
+
+RESOURCES = {
+    resource.name: resource
+    for resource in (
+        MirroredResource(
+            "transactions",
+            "iter_transactions",
+            {
+                "reference": "$.reference",
+                "status": "$.status",
+                "amount": "$.amount",
+                "currency": "$.currency",
+                "channel": "$.channel",
+                "customer": "$.customer.customer_code",
+                "email": "$.customer.email",
+            },
+        ),
+        MirroredResource(
+            "customers",
+            "iter_customers",
+            {
+                "customer": "$.customer_code",
+                "email": "$.email",
+            },
+        ),
+        MirroredResource(
+            "disputes",
+            "iter_disputes",
+            {
+                "status": "$.status",
+                "currency": "$.currency",
+                "reference": "$.transaction.reference",
+                "customer": "$.customer.customer_code",
+            },
+        ),
+        MirroredResource(
+            "subscriptions",
+            "iter_subscriptions",
+            {
+                "subscription": "$.subscription_code",
+                "status": "$.status",
+                "amount": "$.amount",
+                "plan": "$.plan.plan_code",
+                "customer": "$.customer.customer_code",
+            },
+        ),
+    )
+}
+
+
+def _extract(record: dict, path: str):
+    """Follow a ``$.a.b`` style path into a record."""
+    value = record
+    for key in path[2:].split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _where(
+    resource: MirroredResource,
+    filters: dict | None,
+    from_date: str | None,
+    to_date: str | None,
+) -> tuple[str, list]:
+    """Build the WHERE clause for column filters and a ``created_at`` range."""
+    clauses, values = [], []
+    for column, value in (filters or {}).items():
+        if column not in resource.columns:
+            raise ValueError(f"{resource.name} cannot be filtered by {column!r}.")
+        clauses.append(f"{column} = ?")
+        values.append(value)
+    if from_date is not None:
+        clauses.append("created_at >= ?")
+        values.append(from_date)
+    if to_date is not None and len(to_date) == 10:
+        # A bare date includes the whole of that day.
+        clauses.append("created_at < ?")
+        values.append(
+            (datetime.fromisoformat(to_date) + timedelta(days=1)).date().isoformat()
+        )
+    elif to_date is not None:
+        clauses.append("created_at <= ?")
+        values.append(to_date)
+    return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), values
+
+
+class Mirror:
+    """A local SQLite copy of a merchant's Paystack records.
+
+    Transactions, customers, disputes and subscriptions are stored as JSON,
+    next to a narrow table of indexed columns that agents filter and group by,
+    so questions about past activity can be answered without paging through
+    the API. :func:`sync_mirror` brings the copy up to date incrementally.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # The mirror only holds copies, so an outdated layout is dropped
+            # and rebuilt by the next sync.
+            for table in ("sync_state", *RESOURCES):
+                self._db.execute(f"DROP TABLE IF EXISTS {table}")
+                self._db.execute(f"DROP TABLE IF EXISTS {table}_records")
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sync_state ("
+            " resource TEXT PRIMARY KEY,"
+            " high_water TEXT,"
+            " synced_at REAL NOT NULL)"
+        )
+        for resource in RESOURCES.values():
+            # Queryable fields live in a narrow table of their own so that
+            # scans and aggregates never read the full JSON records.
+            columns = ", ".join(
+                f"{name} {'INTEGER' if name in INTEGER_COLUMNS else 'TEXT'}"
+                for name in resource.columns
+            )
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {resource.name} ("
+                " id INTEGER PRIMARY KEY, created_at TEXT, updated_at TEXT,"
+                f" {columns})"
+            )
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {resource.name}_records ("
+                " id INTEGER PRIMARY KEY, payload TEXT NOT NULL)"
+            )
+            for column in ("created_at", *resource.columns):
+                self._db.execute(
+                    f"CREATE INDEX IF NOT EXISTS {resource.name}_{column}"
+                    f" ON {resource.name} ({column})"
+                )
+
+    @classmethod
+    def from_env(cls, tenant: str = "default") -> "Mirror | None":
+        """Open the mirror named by ``PAYSTACK_MIRROR_DB``, if it is set.
+
+        Tenants other than the default one get a file of their own next to
+        it, e.g. ``mirror.acme.db``.
+        """
+        path = os.environ.get("PAYSTACK_MIRROR_DB")
+        if not path:
+            return None
+        if tenant != "default":
+            root, extension = os.path.splitext(path)
+            path = f"{root}.{tenant}{extension}"
+        return cls(path)
+
+    @staticmethod
+    def resource(name: str) -> MirroredResource:
+        try:
+            return RESOURCES[name]
+        except KeyError:
+            raise ValueError(
+                f"Unknown mirrored resource {name!r}; expected one of {', '.join(RESOURCES)}."
+            ) from None
+
+    def upsert(self, resource: str, records: list[dict]):
+        """Insert records, replacing stored copies of the same IDs."""
+        spec = self.resource(resource)
+        if not records:
+            return
+        rows = [
+            (
+                record["id"],
+                record.get("createdAt") or record.get("created_at"),
+                record.get("updatedAt") or record.get("updated_at"),
+                *(_extract(record, path) for path in spec.columns.values()),
+            )
+            for record in records
+        ]
+        placeholders = ", ".join("?" * len(rows[0]))
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {spec.name} VALUES ({placeholders})", rows
+            )
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {spec.name}_records VALUES (?, ?)",
+                ((record["id"], json.dumps(record)) for record in records),
+            )
+            self._db.execute("COMMIT")
+
+    def high_water(self, resource: str) -> str | None:
+        """Return the newest ``createdAt`` of the last complete sync."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT high_water FROM sync_state WHERE resource = ?", (resource,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def mark_synced(self, resource: str):
+        table = self.resource(resource).name
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state"
+                f" SELECT ?, MAX(created_at), ? FROM {table}",
+                (resource, time.time()),
+            )
+
+    def query(
+        self,
+        resource: str,
+        filters: dict | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> list[dict]:
+        """Return stored records matching ``filters``, newest first.
+
+        ``filters`` maps column names of the resource to required values;
+        ``from_date`` and ``to_date`` bound ``created_at``.
+        """
+        spec = self.resource(resource)
+        where, values = _where(spec, filters, from_date, to_date)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT payload FROM {spec.name} JOIN {spec.name}_records USING (id)"
+                f"{where} ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                (*values, limit, offset),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def aggregate(
+        self,
+        resource: str,
+        group_by: list[str] | None = None,
+        filters: dict | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        percentiles: list[float] | None = None,
+    ) -> list[dict]:
+        """Summarize ``amount`` per group with counts, sums and percentiles.
+
+        Each group reports count, sum, mean, min, max and the requested
+        percentiles. Groups are any of the resource's columns, plus ``day`` (of
+        ``created_at``). The arithmetic runs inside SQLite over the narrow
+        column table: one grouped pass for the totals and, for percentiles,
+        one window pass that ranks amounts and keeps only the nearest-rank
+        rows each group needs.
+        """
+        spec = self.resource(resource)
+        if "amount" not in spec.columns:
+            raise ValueError(f"{resource} cannot be aggregated; they have no amount.")
+        keys = []
+        for key in group_by or []:
+            if key == "day":
+                keys.append("substr(created_at, 1, 10) AS day")
+            elif key in spec.columns:
+                keys.append(key)
+            else:
+                raise ValueError(f"{resource} cannot be grouped by {key!r}.")
+        names = list(group_by or [])
+        percentiles = DEFAULT_PERCENTILES if percentiles is None else percentiles
+        for percentile in percentiles:
+            if not 0 < percentile <= 100:
+                raise ValueError("Percentiles must be between 0 and 100.")
+        where, values = _where(spec, filters, from_date, to_date)
+        selected = ", ".join([*keys, "amount"])
+        grouping = f" GROUP BY {', '.join(names)} ORDER BY {', '.join(names)}"
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join(names + [''])} COUNT(*), SUM(amount),"
+                " AVG(amount), MIN(amount), MAX(amount)"
+                f" FROM (SELECT {selected} FROM {spec.name}{where})"
+                + (grouping if names else ""),
+                values,
+            ).fetchall()
+            groups = {
+                tuple(row[: len(names)]): dict(
+                    zip([*names, "count", "sum", "mean", "min", "max"], row)
+                )
+                for row in rows
+                if row[len(names)]
+            }
+            if groups and percentiles:
+                # Nearest rank: the smallest rank r with r >= p/100 * n. Only
+                # the rows holding those ranks leave SQLite.
+                partition = ", ".join(names) or "NULL"
+                nearest = " OR ".join(
+                    "(rank * 100.0 >= ? * n AND (rank - 1) * 100.0 < ? * n)"
+                    for _ in percentiles
+                )
+                ranked = self._db.execute(
+                    f"SELECT * FROM (SELECT {', '.join(names + [''])} amount,"
+                    f" ROW_NUMBER() OVER (PARTITION BY {partition} ORDER BY amount)"
+                    f" AS rank, COUNT(*) OVER (PARTITION BY {partition}) AS n"
+                    f" FROM (SELECT {selected} FROM {spec.name}{where}))"
+                    f" WHERE {nearest}",
+                    (*values, *(p for p in percentiles for _ in range(2))),
+                )
+                amounts = {(tuple(row[:-3]), row[-2]): row[-3] for row in ranked}
+                for key, group in groups.items():
+                    for p in percentiles:
+                        rank = max(math.ceil(p * group["count"] / 100), 1)
+                        group[f"p{p:g}"] = amounts.get((key, rank))
+        return list(groups.values())
+
+    def status(self) -> dict:
+        """Report how many records each table holds and when it was synced."""
+        with self._lock:
+            state = {
+                resource: {"high_water": high_water, "synced_at": synced_at}
+                for resource, high_water, synced_at in self._db.execute(
+                    "SELECT resource, high_water, synced_at FROM sync_state"
+                )
+            }
+            return {
+                name: {
+                    "records": self._db.execute(
+                        f"SELECT COUNT(*) FROM {name}"
+                    ).fetchone()[0],
+                    **state.get(name, {"high_water": None, "synced_at": None}),
+                }
+                for name in RESOURCES
+            }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def require_mirror(client) -> Mirror:
+    """Return the client's mirror, or explain how to enable one."""
+    if client.mirror is None:
+        raise ValueError("The local mirror is not enabled; set PAYSTACK_MIRROR_DB.")
+    return client.mirror
+
+
+def _since(high_water: str | None, lookback: float) -> str | None:
+    if high_water is None:
+        return None
+    since = datetime.fromisoformat(high_water) - timedelta(seconds=lookback)
+    return since.isoformat()
+
+
+async def sync_mirror(
+    client, resources: list[str] | None = None, lookback: float | None = None
+) -> dict:
+    """Copy records created since the last sync into ``client.mirror``.
+
+    The first sync of a resource pages through its whole history. Later ones
+    start from the high-water mark of the previous complete sync, less the
+    lookback window, and overwrite the stored copies of records they see
+    again. Returns the number of records written per resource.
+    """
+    mirror = require_mirror(client)
+    if lookback is None:
+        lookback = float(os.environ.get("PAYSTACK_MIRROR_LOOKBACK", DEFAULT_LOOKBACK))
+    written = {}
+    for name in resources or RESOURCES:
+        resource = mirror.resource(name)
+        since = _since(mirror.high_water(name), lookback)
+        batch, count = [], 0
+        async for record in getattr(client, resource.iterate)(from_date=since):
+            batch.append(record)
+            if len(batch) >= SYNC_BATCH_SIZE:
+                mirror.upsert(name, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            mirror.upsert(name, batch)
+            count += len(batch)
+        # Pages arrive newest first, so the mark only moves once the whole
+        # range has been stored.
+        mirror.mark_synced(name)
+        written[name] = count
+    return written
+
+
+async def run_sync_loop(clients, interval: float | None = None):
+    """Sync the mirror of every tenant client in use on a fixed schedule.
+
+    Does nothing unless ``PAYSTACK_MIRROR_SYNC`` (or ``interval``) is set.
+    """
+    if interval is None:
+        interval = float(os.environ.get("PAYSTACK_MIRROR_SYNC", "0"))
+    if not interval:
+        return
+    while True:
+        await asyncio.sleep(interval)
+        for tenant, client in clients.active().items():
+            if client.mirror is None:
+                continue
+            try:
+                await sync_mirror(client)
+            except Exception:
+                logger.exception("Failed to sync the mirror of tenant %s", tenant)
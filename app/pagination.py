@@ -0,0 +1,117 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_PER_PAGE = 100
+DEFAULT_MAX_WORKERS = 8
+
+
+def _page_data(response) -> list:
+    """Return the list of records held in a page response."""
+    if isinstance(response, dict):
+        data = response.get("data")
+    else:
+        data = getattr(response, "data", None)
+    if data is None:
+        return []
+    return data if isinstance(data, list) else [data]
+
+
+def _page_count(response) -> int | None:
+    """Return the total page count from a response's meta, if it has one."""
+    if not isinstance(response, dict):
+        return None
+    meta = response.get("meta") or {}
+    page_count = meta.get("pageCount")
+    return int(page_count) if page_count is not None else None
+
+
+def _is_last_page(response, page: int, per_page: int) -> bool:
+    page_count = _page_count(response)
+    if page_count is not None:
+        return page >= page_count
+    return len(_page_data(response)) < per_page
+
+
+def _more_pages(response, page: int, per_page: int, page_count: int | None):
+    """Return how many pages may follow ``page`` (``None`` if unknown)."""
+    if _is_last_page(response, page, per_page):
+        return 0
+    return None if page_count is None else page_count - page
+
+
+def iter_pages(
+    fetch_page: Callable[[int], object],
+    per_page: int = DEFAULT_PER_PAGE,
+    prefetch: int = 1,
+) -> Iterator:
+    """Yield records from a paged endpoint, fetching pages lazily.
+
+    ``fetch_page(page)`` must return one page of results. Once the first page
+    has reported ``meta.pageCount``, up to ``prefetch`` pages are requested
+    ahead of the one being consumed, never past the last page; at most
+    ``prefetch + 1`` pages are held in memory at any time.
+    """
+    with ThreadPoolExecutor(max_workers=max(prefetch, 1)) as executor:
+        pending = deque()
+        next_page = 1
+        page = 0
+        page_count = None
+        try:
+            while True:
+                if not pending:
+                    pending.append(executor.submit(fetch_page, next_page))
+                    next_page += 1
+                response = pending.popleft().result()
+                page += 1
+                if page == 1:
+                    page_count = _page_count(response)
+                more = _more_pages(response, page, per_page, page_count)
+                ahead = prefetch if more is None else min(prefetch, more)
+                while len(pending) < ahead:
+                    pending.append(executor.submit(fetch_page, next_page))
+                    next_page += 1
+                yield from _page_data(response)
+                if more == 0:
+                    return
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+async def aiter_pages(
+    fetch_page: Callable[[int], Awaitable],
+    per_page: int = DEFAULT_PER_PAGE,
+    prefetch: int = 1,
+) -> AsyncIterator:
+    """Asynchronously yield records from a paged endpoint.
+
+    The async counterpart of :func:`iter_pages`; prefetched pages are fetched
+    as tasks on the running event loop.
+    """
+    pending = deque()
+    next_page = 1
+    page = 0
+    page_count = None
+    try:
+        while True:
+            if not pending:
+                pending.append(asyncio.ensure_future(fetch_page(next_page)))
+                next_page += 1
+            response = await pending.popleft()
+            page += 1
+            if page == 1:
+                page_count = _page_count(response)
+            more = _more_pages(response, page, per_page, page_count)
+            ahead = prefetch if more is None else min(prefetch, more)
+            while len(pending) < ahead:
+                pending.append(asyncio.ensure_future(fetch_page(next_page)))
+                next_page += 1
+            for record in _page_data(response):
+                yield record
+            if more == 0:
+                return
+    finally:
+        for task in pending:
+            task.cancel()
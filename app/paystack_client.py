@@ -1,16 +1,82 @@
+import asyncio
+import functools
+import importlib.util
 import os
-import paystack
-from dotenv import load_dotenv
+import sys
+import time
+import uuid
+from urllib.parse import quote
 
-load_dotenv()
+import httpx
+
+from app.batch import ProgressCallback, gather_each
+from app.breaker import BreakerConfig, CircuitBreakers
+from app.cache import (
+    DEFAULT_REVALIDATE_AFTER,
+    DEFAULT_TTLS,
+    ResponseCache,
+    TTLCache,
+    cached,
+    invalidates,
+)
+from app.idempotency import (
+    IdempotencyKeyReused,
+    IdempotencyLedger,
+    request_fingerprint,
+)
+from app.metrics import endpoint_name, metrics, span, upstream_time
+from app.mirror import Mirror
+from app.pagination import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_PER_PAGE,
+    aiter_pages,
+    iter_pages,
+)
+from app.pool import ConnectionPool, PoolConfig
+from app.ratelimit import MAX_THROTTLED_ATTEMPTS, RateLimiter
+from app.reference_store import ReferenceStore, reference_data
+from app.retry import RetryPolicy
+from app.singleflight import SingleFlight
 
 PAYSTACK_API_BASE = "https://api.paystack.co"
 
 
+def _lazy_import(name: str):
+    """Return a module that is only executed when one of its names is used."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# The SDK takes a noticeable part of startup to import and only the
+# synchronous client uses it.
+paystack = _lazy_import("paystack")
+
+
+@functools.cache
+def load_env():
+    """Read settings from a ``.env`` file, once, the first time they are needed."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
 class PaystackClient:
     """A wrapper for the Paystack API"""
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        cache: ResponseCache | None = None,
+        cache_ttls: dict[str, float] | None = None,
+    ):
+        load_env()
         if api_key is None:
             api_key = os.environ.get("PAYSTACK_API_KEY")
         if api_key is None:
@@ -18,6 +84,8 @@ class PaystackClient:
 
         self.api_key = api_key
         paystack.api_key = self.api_key
+        self.cache = cache if cache is not None else TTLCache()
+        self.cache_ttls = DEFAULT_TTLS if cache_ttls is None else cache_ttls
 
     def get_balance(self):
         """Get the balance from the Paystack API."""
@@ -27,9 +95,31 @@ class PaystackClient:
         """Get the balance ledger from the Paystack API."""
         return paystack.Balance.ledger()
 
-    def list_customers(self):
+    def list_customers(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
         """List customers from the Paystack API."""
-        return paystack.Customer.list()
+        return paystack.Customer.list(
+            per_page=per_page, page=page, _from=from_date, to=to_date
+        )
+
+    def iter_customers(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Iterate over all customers, fetching pages lazily."""
+        return iter_pages(
+            lambda page: self.list_customers(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
 
     def create_customer(
         self, email: str, first_name: str, last_name: str, phone: str | None = None
@@ -39,10 +129,12 @@ class PaystackClient:
             email=email, first_name=first_name, last_name=last_name, phone=phone
         )
 
+    @cached
     def fetch_customer(self, customer_code: str):
         """Fetch a customer's details from the Paystack API."""
         return paystack.Customer.fetch(customer_code)
 
+    @invalidates("fetch_customer")
     def update_customer(
         self, code: str, first_name: str, last_name: str, phone: str | None = None
     ):
@@ -51,9 +143,31 @@ class PaystackClient:
             code=code, first_name=first_name, last_name=last_name, phone=phone
         )
 
-    def list_products(self):
+    def list_products(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
         """List products from the Paystack API."""
-        return paystack.Product.list()
+        return paystack.Product.list(
+            per_page=per_page, page=page, _from=from_date, to=to_date
+        )
+
+    def iter_products(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Iterate over all products, fetching pages lazily."""
+        return iter_pages(
+            lambda page: self.list_products(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
 
     def create_product(
         self, name: str, description: str, price: int, currency: str, quantity: int = 1
@@ -67,10 +181,12 @@ class PaystackClient:
             quantity=quantity,
         )
 
+    @cached
     def fetch_product(self, product_code: str):
         """Fetch a product's details from the Paystack API."""
         return paystack.Product.fetch(product_code)
 
+    @invalidates("fetch_product")
     def update_product(
         self,
         product_code: str,
@@ -90,21 +206,66 @@ class PaystackClient:
             quantity=quantity,
         )
 
+    @invalidates("fetch_product")
     def delete_product(self, product_code: str):
         """Delete a product using the Paystack API."""
         return paystack.Product.delete(product_code)
 
-    def list_invoices(self):
+    def list_invoices(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
         """List invoices from the Paystack API."""
-        return paystack.PaymentRequest.list()
+        return paystack.PaymentRequest.list(
+            per_page=per_page, page=page, _from=from_date, to=to_date
+        )
+
+    def iter_invoices(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Iterate over all invoices, fetching pages lazily."""
+        return iter_pages(
+            lambda page: self.list_invoices(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
 
     def create_invoice(self, customer: str, amount: int):
         """Create an invoice using the Paystack API."""
         return paystack.PaymentRequest.create(customer=customer, amount=amount)
 
-    def list_transactions(self):
+    def list_transactions(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
         """List transactions from the Paystack API."""
-        return paystack.Transaction.list()
+        return paystack.Transaction.list(
+            per_page=per_page, page=page, _from=from_date, to=to_date
+        )
+
+    def iter_transactions(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Iterate over all transactions, fetching pages lazily."""
+        return iter_pages(
+            lambda page: self.list_transactions(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
 
     def initialize_transaction(self, email: str, amount: int, currency: str):
         """Initialize a transaction using the Paystack API."""
@@ -140,17 +301,61 @@ class PaystackClient:
         """Create a refund using the Paystack API."""
         return paystack.Refund.create(transaction=transaction, amount=amount)
 
-    def list_subscriptions(self):
+    def list_subscriptions(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
         """List subscriptions from the Paystack API."""
-        return paystack.Subscription.list()
+        return paystack.Subscription.list(
+            per_page=per_page, page=page, _from=from_date, to=to_date
+        )
+
+    def iter_subscriptions(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Iterate over all subscriptions, fetching pages lazily."""
+        return iter_pages(
+            lambda page: self.list_subscriptions(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
 
     def disable_subscription(self, code: str, token: str):
         """Disable a subscription using the Paystack API."""
         return paystack.Subscription.disable(code=code, token=token)
 
-    def list_disputes(self):
+    def list_disputes(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
         """List disputes from the Paystack API."""
-        return paystack.Dispute.list()
+        return paystack.Dispute.list(
+            per_page=per_page, page=page, _from=from_date, to=to_date
+        )
+
+    def iter_disputes(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Iterate over all disputes, fetching pages lazily."""
+        return iter_pages(
+            lambda page: self.list_disputes(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
 
     def add_evidence_to_dispute(
         self,
@@ -205,14 +410,38 @@ class PaystackClient:
         """Create a payment page using the Paystack API."""
         return paystack.Page.create(name=name, amount=amount, description=description)
 
-    def list_payment_pages(self):
+    def list_payment_pages(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
         """List payment pages from the Paystack API."""
-        return paystack.Page.list()
+        return paystack.Page.list(
+            per_page=per_page, page=page, _from=from_date, to=to_date
+        )
+
+    def iter_payment_pages(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Iterate over all payment pages, fetching pages lazily."""
+        return iter_pages(
+            lambda page: self.list_payment_pages(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
 
+    @cached
     def fetch_payment_page(self, id: str):
         """Fetch a payment page's details from the Paystack API."""
         return paystack.Page.fetch(id)
 
+    @invalidates("fetch_payment_page")
     def update_payment_page(
         self,
         id: str,
@@ -225,14 +454,17 @@ class PaystackClient:
             id, name=name, description=description, amount=amount
         )
 
+    @invalidates("fetch_payment_page")
     def disable_payment_page(self, id: str):
         """Disable a payment page using the Paystack API."""
         return paystack.Page.update(id, active=False)
 
+    @invalidates("fetch_payment_page")
     def enable_payment_page(self, id: str):
         """Enable a payment page using the Paystack API."""
         return paystack.Page.update(id, active=True)
 
+    @invalidates("fetch_payment_page")
     def add_products_to_payment_page(self, id: str, products: list[str]):
         """Add products to a payment page using the Paystack API."""
         return paystack.Page.add_products(id=id, product=products)
@@ -241,10 +473,33 @@ class PaystackClient:
         """Create a plan using the Paystack API."""
         return paystack.Plan.create(name=name, amount=amount, interval=interval)
 
-    def list_plans(self):
+    def list_plans(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
         """List plans from the Paystack API."""
-        return paystack.Plan.list()
+        return paystack.Plan.list(
+            per_page=per_page, page=page, _from=from_date, to=to_date
+        )
+
+    def iter_plans(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Iterate over all plans, fetching pages lazily."""
+        return iter_pages(
+            lambda page: self.list_plans(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
 
+    @cached
     def fetch_plan(self, plan_code: str):
         """Fetch a plan's details from the Paystack API."""
         return paystack.Plan.fetch(plan_code)
@@ -255,6 +510,7 @@ class PaystackClient:
             account_number=account_number, bank_code=bank_code
         )
 
+    @cached
     def list_avs(
         self,
         country: str,
@@ -264,6 +520,7 @@ class PaystackClient:
         """List states for address_verification the Paystack API."""
         return paystack.Verification.avs(type=type, country=country, currency=currency)
 
+    @cached
     def fetch_banks(
         self,
         country: str | None = None,
@@ -285,14 +542,994 @@ class PaystackClient:
             gateway=gateway,
         )
 
+    @cached
     def list_countries(self):
         """List countries from the Paystack API."""
         return paystack.Verification.list_countries()
 
+    @cached
     def resolve_card_bin(self, card_bin: str):
         """Resolve a card bin using the Paystack API."""
         return paystack.Verification.resolve_card_bin(card_bin)
 
 
-# A single client instance to be used by the tools
-paystack_client = PaystackClient()
+class PaystackAPIError(Exception):
+    """Raised when the Paystack API responds with an error status."""
+
+    def __init__(self, status_code: int, message: str, response: httpx.Response):
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+        self.response = response
+
+
+def _segment(value) -> str:
+    """Quote a value for use as a single URL path segment."""
+    return quote(str(value), safe="")
+
+
+def _without_none(values: dict | None) -> dict | None:
+    """Drop unset (None) entries so they are not sent to the API."""
+    if values is None:
+        return None
+    return {key: value for key, value in values.items() if value is not None}
+
+
+class AsyncPaystackClient:
+    """An asynchronous wrapper for the Paystack API built on httpx.
+
+    All requests share a single keep-alive ``ConnectionPool`` so that tool
+    calls can be awaited concurrently without blocking the MCP event loop or
+    paying a fresh TLS handshake each time. A client acts for one merchant
+    account; ``app.registry`` keeps one per tenant.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        timeout: float = 30.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+        pool_config: PoolConfig | None = None,
+        cache: ResponseCache | None = None,
+        cache_ttls: dict[str, float] | None = None,
+        revalidate_after: dict[str, float] | None = None,
+        reference_store: ReferenceStore | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        idempotency_ledger: IdempotencyLedger | None = None,
+        mirror: Mirror | None = None,
+        breaker_config: BreakerConfig | None = None,
+        tenant: str = "default",
+    ):
+        load_env()
+        if api_key is None:
+            api_key = os.environ.get("PAYSTACK_API_KEY")
+        if api_key is None:
+            raise ValueError("Paystack API key not provided.")
+
+        if base_url is None:
+            base_url = os.environ.get("PAYSTACK_BASE_URL", PAYSTACK_API_BASE)
+
+        self.api_key = api_key
+        self.tenant = tenant
+        self.pool = ConnectionPool(
+            base_url=base_url,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Accept": "application/json",
+            },
+            timeout=timeout,
+            config=pool_config,
+            transport=transport,
+        )
+        self.cache = cache if cache is not None else TTLCache()
+        self.cache_ttls = DEFAULT_TTLS if cache_ttls is None else cache_ttls
+        if revalidate_after is None:
+            revalidate_after = DEFAULT_REVALIDATE_AFTER
+        self.revalidate_after = revalidate_after
+        if reference_store is None:
+            reference_store = ReferenceStore.from_env()
+        self.reference_store = reference_store
+        self.inflight = SingleFlight()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        if retry_policy is None:
+            retry_policy = RetryPolicy.from_env()
+        self.retry_policy = retry_policy
+        if idempotency_ledger is None:
+            idempotency_ledger = IdempotencyLedger.from_env()
+        self.idempotency_ledger = idempotency_ledger
+        # Idempotency keys of writes in flight, with their request fingerprint.
+        self._writing: dict[str, str] = {}
+        if mirror is None:
+            mirror = Mirror.from_env(tenant)
+        self.mirror = mirror
+        self.breakers = CircuitBreakers(
+            breaker_config,
+            on_change=functools.partial(metrics.circuit_changes.inc, tenant),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the underlying HTTP client and its connections."""
+        await self.pool.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict | None = None,
+        json: dict | None = None,
+        idempotency_key: str | None = None,
+    ):
+        """Send a request to the Paystack API and return the decoded body.
+
+        Identical ``GET`` requests that overlap share a single upstream call.
+        Every write carries an ``Idempotency-Key`` header, and is retried only
+        after failures that show Paystack did not apply it. When the caller
+        supplies the key, the result is also kept in the idempotency ledger
+        and a repeated call with the same key is answered from there.
+        """
+        params = _without_none(params)
+        json = _without_none(json)
+        on_retry = functools.partial(
+            metrics.retries.inc, self.tenant, endpoint_name(method, path)
+        )
+        if method == "GET":
+            key = (path, tuple(sorted((params or {}).items())))
+            return await self.inflight.do(
+                key,
+                lambda: self.retry_policy.call(
+                    lambda: self._send(method, path, params, json), on_retry
+                ),
+            )
+
+        if idempotency_key is None:
+            headers = {"Idempotency-Key": uuid.uuid4().hex}
+            return await self.retry_policy.call(
+                lambda: self._send(method, path, params, json, headers),
+                on_retry,
+                write=True,
+            )
+
+        fingerprint = request_fingerprint(method, path, json)
+        # The ledger may be shared by several tenants' clients.
+        ledger_key = f"{self.tenant}:{idempotency_key}"
+
+        async def send_once():
+            # A concurrent call with the same key but another request has not
+            # reached the ledger yet, so it is caught here.
+            if self._writing.setdefault(ledger_key, fingerprint) != fingerprint:
+                raise IdempotencyKeyReused(
+                    f"Idempotency key {idempotency_key!r} is in use for a "
+                    "different request."
+                )
+            try:
+                result = self.idempotency_ledger.get(ledger_key, fingerprint)
+                if result is None:
+                    headers = {"Idempotency-Key": idempotency_key}
+                    result = await self.retry_policy.call(
+                        lambda: self._send(method, path, params, json, headers),
+                        on_retry,
+                        write=True,
+                    )
+                    self.idempotency_ledger.put(ledger_key, fingerprint, result)
+                return result
+            finally:
+                del self._writing[ledger_key]
+
+        return await self.inflight.do(
+            ("idempotency", idempotency_key, fingerprint), send_once
+        )
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: dict | None,
+        json: dict | None,
+        headers: dict | None = None,
+    ):
+        # Requests rejected with a 429 were not processed, so they are queued
+        # on the rate limiter and sent again rather than failed.
+        for _ in range(MAX_THROTTLED_ATTEMPTS):
+            response = await self._attempt(
+                method, path, params=params, json=json, headers=headers
+            )
+            if response.status_code != 429:
+                break
+        if response.is_error:
+            try:
+                message = response.json().get("message", response.reason_phrase)
+            except ValueError:
+                message = response.reason_phrase
+            raise PaystackAPIError(response.status_code, message, response)
+        return response.json()
+
+    async def _attempt(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send one request, hedging reads when ``PAYSTACK_HEDGE`` is set.
+
+        A hedged read is sent a second time if the first attempt has not
+        answered within the endpoint's recent p95 latency; whichever attempt
+        answers first without a 429 or 5xx wins and the other is cancelled.
+        Hedging pauses while the endpoint is over its hedge budget.
+        """
+        endpoint = endpoint_name(method, path)
+        delay = None
+        if method == "GET" and self.breakers.config.hedge:
+            delay = self.breakers.get(endpoint).hedge_delay()
+        if delay is None:
+            return await self._limited(method, path, **kwargs)
+
+        first = asyncio.ensure_future(self._limited(method, path, **kwargs))
+        attempts = {first}
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if done:
+                return first.result()
+            self.breakers.get(endpoint).hedged()
+            hedge = asyncio.ensure_future(self._limited(method, path, **kwargs))
+            attempts.add(hedge)
+            while True:
+                done, _ = await asyncio.wait(
+                    attempts, return_when=asyncio.FIRST_COMPLETED
+                )
+                for attempt in done:
+                    attempts.discard(attempt)
+                    if attempt.exception() is None:
+                        status = attempt.result().status_code
+                        if status < 500 and status != 429 or not attempts:
+                            winner = "hedge" if attempt is hedge else "first"
+                            metrics.hedges.inc(self.tenant, endpoint, winner)
+                            return attempt.result()
+                    elif not attempts:
+                        return attempt.result()
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    async def _limited(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send one request once the rate limiter allows it."""
+        await self.rate_limiter.acquire(path)
+        response = await self._observed(method, path, **kwargs)
+        self.rate_limiter.observe(path, response)
+        return response
+
+    async def _observed(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send one request over the pool, recording its latency and status.
+
+        Requests to an endpoint whose circuit is open fail straight away with
+        :class:`~app.breaker.CircuitOpenError`.
+        """
+        endpoint = endpoint_name(method, path)
+        breaker = self.breakers.get(endpoint)
+        breaker.allow()
+        status = "error"
+        started = time.perf_counter()
+        try:
+            with span("paystack.request", endpoint=endpoint, tenant=self.tenant):
+                response = await self.pool.request(method, path, **kwargs)
+            status = str(response.status_code)
+            metrics.response_bytes.observe(len(response.content), self.tenant, endpoint)
+            return response
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.request_seconds.observe(elapsed, self.tenant, endpoint)
+            metrics.requests.inc(self.tenant, endpoint, status)
+            if (spent := upstream_time.get()) is not None:
+                spent[0] += elapsed
+            if status == "cancelled":
+                breaker.release(elapsed)
+            else:
+                breaker.record(elapsed, status == "error" or status.startswith("5"))
+
+    @cached
+    async def get_balance(self):
+        """Get the balance from the Paystack API."""
+        return await self._request("GET", "/balance")
+
+    @cached
+    async def get_balance_ledger(self):
+        """Get the balance ledger from the Paystack API."""
+        return await self._request("GET", "/balance/ledger")
+
+    async def list_customers(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
+        """List customers from the Paystack API."""
+        return await self._request(
+            "GET",
+            "/customer",
+            params={
+                "perPage": per_page,
+                "page": page,
+                "from": from_date,
+                "to": to_date,
+            },
+        )
+
+    def iter_customers(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Asynchronously iterate over all customers, fetching pages lazily."""
+        return aiter_pages(
+            lambda page: self.list_customers(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
+
+    async def create_customer(
+        self,
+        email: str,
+        first_name: str,
+        last_name: str,
+        phone: str | None = None,
+        idempotency_key: str | None = None,
+    ):
+        """Create a customer using the Paystack API."""
+        return await self._request(
+            "POST",
+            "/customer",
+            json={
+                "email": email,
+                "first_name": first_name,
+                "last_name": last_name,
+                "phone": phone,
+            },
+            idempotency_key=idempotency_key,
+        )
+
+    @cached
+    async def fetch_customer(self, customer_code: str):
+        """Fetch a customer's details from the Paystack API."""
+        return await self._request("GET", f"/customer/{_segment(customer_code)}")
+
+    @invalidates("fetch_customer")
+    async def update_customer(
+        self, code: str, first_name: str, last_name: str, phone: str | None = None
+    ):
+        """Update a customer's details using the Paystack API."""
+        return await self._request(
+            "PUT",
+            f"/customer/{_segment(code)}",
+            json={"first_name": first_name, "last_name": last_name, "phone": phone},
+        )
+
+    async def list_products(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
+        """List products from the Paystack API."""
+        return await self._request(
+            "GET",
+            "/product",
+            params={
+                "perPage": per_page,
+                "page": page,
+                "from": from_date,
+                "to": to_date,
+            },
+        )
+
+    def iter_products(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Asynchronously iterate over all products, fetching pages lazily."""
+        return aiter_pages(
+            lambda page: self.list_products(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
+
+    async def create_product(
+        self, name: str, description: str, price: int, currency: str, quantity: int = 1
+    ):
+        """Create a product using the Paystack API."""
+        return await self._request(
+            "POST",
+            "/product",
+            json={
+                "name": name,
+                "description": description,
+                "price": price,
+                "currency": currency,
+                "quantity": quantity,
+            },
+        )
+
+    @cached
+    async def fetch_product(self, product_code: str):
+        """Fetch a product's details from the Paystack API."""
+        return await self._request("GET", f"/product/{_segment(product_code)}")
+
+    @invalidates("fetch_product")
+    async def update_product(
+        self,
+        product_code: str,
+        name: str | None,
+        description: str | None,
+        price: int | None,
+        currency: str | None,
+        quantity: int | None = None,
+    ):
+        """Update a product's details using the Paystack API."""
+        return await self._request(
+            "PUT",
+            f"/product/{_segment(product_code)}",
+            json={
+                "name": name,
+                "description": description,
+                "price": price,
+                "currency": currency,
+                "quantity": quantity,
+            },
+        )
+
+    @invalidates("fetch_product")
+    async def delete_product(self, product_code: str):
+        """Delete a product using the Paystack API."""
+        return await self._request("DELETE", f"/product/{_segment(product_code)}")
+
+    async def list_invoices(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
+        """List invoices from the Paystack API."""
+        return await self._request(
+            "GET",
+            "/paymentrequest",
+            params={
+                "perPage": per_page,
+                "page": page,
+                "from": from_date,
+                "to": to_date,
+            },
+        )
+
+    def iter_invoices(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Asynchronously iterate over all invoices, fetching pages lazily."""
+        return aiter_pages(
+            lambda page: self.list_invoices(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
+
+    async def create_invoice(
+        self, customer: str, amount: int, idempotency_key: str | None = None
+    ):
+        """Create an invoice using the Paystack API."""
+        return await self._request(
+            "POST",
+            "/paymentrequest",
+            json={"customer": customer, "amount": amount},
+            idempotency_key=idempotency_key,
+        )
+
+    async def list_transactions(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
+        """List transactions from the Paystack API."""
+        return await self._request(
+            "GET",
+            "/transaction",
+            params={
+                "perPage": per_page,
+                "page": page,
+                "from": from_date,
+                "to": to_date,
+            },
+        )
+
+    def iter_transactions(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Asynchronously iterate over all transactions, fetching pages lazily."""
+        return aiter_pages(
+            lambda page: self.list_transactions(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
+
+    async def initialize_transaction(
+        self,
+        email: str,
+        amount: int,
+        currency: str,
+        idempotency_key: str | None = None,
+    ):
+        """Initialize a transaction using the Paystack API."""
+        return await self._request(
+            "POST",
+            "/transaction/initialize",
+            json={"email": email, "amount": amount, "currency": currency},
+            idempotency_key=idempotency_key,
+        )
+
+    @cached
+    async def verify_transaction(self, reference: str):
+        """Verify a transaction using the Paystack API."""
+        return await self._request("GET", f"/transaction/verify/{_segment(reference)}")
+
+    async def verify_transactions(
+        self,
+        references: list[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        on_progress: ProgressCallback | None = None,
+    ) -> list[dict]:
+        """Verify many transactions concurrently, reporting each one's outcome."""
+        outcomes = await gather_each(
+            self.verify_transaction, references, max_workers, on_progress
+        )
+        return [
+            {"reference": reference, **outcome}
+            for reference, outcome in zip(references, outcomes)
+        ]
+
+    async def fetch_transaction(self, transaction_id: str):
+        """Fetch a transaction's details from the Paystack API."""
+        return await self._request("GET", f"/transaction/{_segment(transaction_id)}")
+
+    async def get_transaction_timeline(self, id_or_reference: str):
+        """Get a transaction's timeline from the Paystack API."""
+        return await self._request(
+            "GET", f"/transaction/timeline/{_segment(id_or_reference)}"
+        )
+
+    async def download_transactions(
+        self,
+        per_page: int | None = 50,
+        page: int | None = 1,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
+        """Download a transactions receipt from the Paystack API."""
+        return await self._request(
+            "GET",
+            "/transaction/export",
+            params={
+                "perPage": per_page,
+                "page": page,
+                "from": from_date,
+                "to": to_date,
+            },
+        )
+
+    def iter_transaction_export(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Asynchronously iterate over a transaction export, page by page."""
+        return aiter_pages(
+            lambda page: self.download_transactions(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
+
+    async def create_refund(
+        self,
+        transaction: str,
+        amount: int | None = None,
+        idempotency_key: str | None = None,
+    ):
+        """Create a refund using the Paystack API."""
+        return await self._request(
+            "POST",
+            "/refund",
+            json={"transaction": transaction, "amount": amount},
+            idempotency_key=idempotency_key,
+        )
+
+    async def list_refunds(
+        self,
+        transaction: str | None = None,
+        per_page: int | None = None,
+        page: int | None = None,
+    ):
+        """List refunds, optionally for one transaction, from the Paystack API."""
+        return await self._request(
+            "GET",
+            "/refund",
+            params={"transaction": transaction, "perPage": per_page, "page": page},
+        )
+
+    async def list_subscriptions(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
+        """List subscriptions from the Paystack API."""
+        return await self._request(
+            "GET",
+            "/subscription",
+            params={
+                "perPage": per_page,
+                "page": page,
+                "from": from_date,
+                "to": to_date,
+            },
+        )
+
+    def iter_subscriptions(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Asynchronously iterate over all subscriptions, fetching pages lazily."""
+        return aiter_pages(
+            lambda page: self.list_subscriptions(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
+
+    async def disable_subscription(self, code: str, token: str):
+        """Disable a subscription using the Paystack API."""
+        return await self._request(
+            "POST", "/subscription/disable", json={"code": code, "token": token}
+        )
+
+    async def list_disputes(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
+        """List disputes from the Paystack API."""
+        return await self._request(
+            "GET",
+            "/dispute",
+            params={
+                "perPage": per_page,
+                "page": page,
+                "from": from_date,
+                "to": to_date,
+            },
+        )
+
+    def iter_disputes(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Asynchronously iterate over all disputes, fetching pages lazily."""
+        return aiter_pages(
+            lambda page: self.list_disputes(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
+
+    async def add_evidence_to_dispute(
+        self,
+        dispute_id: str,
+        customer_email: str,
+        customer_name: str,
+        customer_phone: str,
+        service_details: str,
+    ):
+        """Add evidence to a dispute using the Paystack API."""
+        return await self._request(
+            "POST",
+            f"/dispute/{_segment(dispute_id)}/evidence",
+            json={
+                "customer_email": customer_email,
+                "customer_name": customer_name,
+                "customer_phone": customer_phone,
+                "service_details": service_details,
+            },
+        )
+
+    @cached
+    async def fetch_dispute(self, dispute_id: str):
+        """Fetch a dispute's details from the Paystack API."""
+        return await self._request("GET", f"/dispute/{_segment(dispute_id)}")
+
+    async def download_dispute(
+        self,
+        per_page: int | None = 50,
+        page: int | None = 1,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
+        """Download a dispute receipt from the Paystack API."""
+        return await self._request(
+            "GET",
+            "/dispute/export",
+            params={
+                "perPage": per_page,
+                "page": page,
+                "from": from_date,
+                "to": to_date,
+            },
+        )
+
+    def iter_dispute_export(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Asynchronously iterate over a dispute export, page by page."""
+        return aiter_pages(
+            lambda page: self.download_dispute(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
+
+    async def resolve_dispute(
+        self,
+        dispute_id: str,
+        resolution: str,
+        message: str,
+        refund_amount: str,
+        uploaded_filename: str,
+        evidence: str | None = None,
+    ):
+        """Resolve a dispute using the Paystack API."""
+        return await self._request(
+            "PUT",
+            f"/dispute/{_segment(dispute_id)}/resolve",
+            json={
+                "resolution": resolution,
+                "message": message,
+                "refund_amount": refund_amount,
+                "uploaded_filename": uploaded_filename,
+                "evidence": evidence,
+            },
+        )
+
+    async def create_payment_page(
+        self, name: str, amount: int, description: str | None = None
+    ):
+        """Create a payment page using the Paystack API."""
+        return await self._request(
+            "POST",
+            "/page",
+            json={"name": name, "amount": amount, "description": description},
+        )
+
+    async def list_payment_pages(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
+        """List payment pages from the Paystack API."""
+        return await self._request(
+            "GET",
+            "/page",
+            params={
+                "perPage": per_page,
+                "page": page,
+                "from": from_date,
+                "to": to_date,
+            },
+        )
+
+    def iter_payment_pages(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Asynchronously iterate over all payment pages, fetching pages lazily."""
+        return aiter_pages(
+            lambda page: self.list_payment_pages(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
+
+    @cached
+    async def fetch_payment_page(self, id: str):
+        """Fetch a payment page's details from the Paystack API."""
+        return await self._request("GET", f"/page/{_segment(id)}")
+
+    @invalidates("fetch_payment_page")
+    async def update_payment_page(
+        self,
+        id: str,
+        name: str | None = None,
+        description: str | None = None,
+        amount: int | None = None,
+    ):
+        """Update a payment page using the Paystack API."""
+        return await self._request(
+            "PUT",
+            f"/page/{_segment(id)}",
+            json={"name": name, "description": description, "amount": amount},
+        )
+
+    @invalidates("fetch_payment_page")
+    async def disable_payment_page(self, id: str):
+        """Disable a payment page using the Paystack API."""
+        return await self._request(
+            "PUT", f"/page/{_segment(id)}", json={"active": False}
+        )
+
+    @invalidates("fetch_payment_page")
+    async def enable_payment_page(self, id: str):
+        """Enable a payment page using the Paystack API."""
+        return await self._request(
+            "PUT", f"/page/{_segment(id)}", json={"active": True}
+        )
+
+    @invalidates("fetch_payment_page")
+    async def add_products_to_payment_page(self, id: str, products: list[str]):
+        """Add products to a payment page using the Paystack API."""
+        return await self._request(
+            "POST", f"/page/{_segment(id)}/product", json={"product": products}
+        )
+
+    async def create_plan(
+        self,
+        name: str,
+        amount: int,
+        interval: str,
+        idempotency_key: str | None = None,
+    ):
+        """Create a plan using the Paystack API."""
+        return await self._request(
+            "POST",
+            "/plan",
+            json={"name": name, "amount": amount, "interval": interval},
+            idempotency_key=idempotency_key,
+        )
+
+    async def list_plans(
+        self,
+        per_page: int | None = None,
+        page: int | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+    ):
+        """List plans from the Paystack API."""
+        return await self._request(
+            "GET",
+            "/plan",
+            params={
+                "perPage": per_page,
+                "page": page,
+                "from": from_date,
+                "to": to_date,
+            },
+        )
+
+    def iter_plans(
+        self,
+        per_page: int = DEFAULT_PER_PAGE,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        prefetch: int = 1,
+    ):
+        """Asynchronously iterate over all plans, fetching pages lazily."""
+        return aiter_pages(
+            lambda page: self.list_plans(per_page, page, from_date, to_date),
+            per_page,
+            prefetch,
+        )
+
+    @cached
+    async def fetch_plan(self, plan_code: str):
+        """Fetch a plan's details from the Paystack API."""
+        return await self._request("GET", f"/plan/{_segment(plan_code)}")
+
+    async def resolve_account_number(self, account_number: str, bank_code: str):
+        """Resolve an account number using the Paystack API."""
+        return await self._request(
+            "GET",
+            "/bank/resolve",
+            params={"account_number": account_number, "bank_code": bank_code},
+        )
+
+    @cached
+    @reference_data
+    async def list_avs(
+        self,
+        country: str,
+        type: str | None = None,
+        currency: str | None = None,
+    ):
+        """List states for address_verification the Paystack API."""
+        return await self._request(
+            "GET",
+            "/address_verification/states",
+            params={"type": type, "country": country, "currency": currency},
+        )
+
+    @cached
+    @reference_data
+    async def fetch_banks(
+        self,
+        country: str | None = None,
+        pay_with_bank_transfer: bool | None = None,
+        use_cursor: bool | None = None,
+        per_page: int | None = None,
+        next: str | None = None,
+        previous: str | None = None,
+        gateway: str | None = None,
+    ):
+        """Fetch a bank's details from the Paystack API."""
+        return await self._request(
+            "GET",
+            "/bank",
+            params={
+                "country": country,
+                "pay_with_bank_transfer": pay_with_bank_transfer,
+                "use_cursor": use_cursor,
+                "perPage": per_page,
+                "next": next,
+                "previous": previous,
+                "gateway": gateway,
+            },
+        )
+
+    @cached
+    @reference_data
+    async def list_countries(self):
+        """List countries from the Paystack API."""
+        return await self._request("GET", "/country")
+
+    @cached
+    async def resolve_card_bin(self, card_bin: str):
+        """Resolve a card bin using the Paystack API."""
+        return await self._request("GET", f"/decision/bin/{_segment(card_bin)}")
+
+
+def __getattr__(name: str):
+    # The shared synchronous client is built on first access, so importing
+    # this module works without PAYSTACK_API_KEY.
+    if name == "paystack_client":
+        client = globals()["paystack_client"] = PaystackClient()
+        return client
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,125 @@
+import importlib.util
+import logging
+import os
+from dataclasses import dataclass
+
+import httpx
+
+from app.cassette import cassette_transport
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolConfig:
+    """Connection pool settings for the Paystack HTTP client."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        """Build a pool config from ``PAYSTACK_*`` environment variables.
+
+        ``PAYSTACK_HTTP2`` falls back to HTTP/1.1, with a warning, when the
+        ``h2`` package (the ``http2`` extra) is not installed.
+        """
+        http2 = os.environ.get("PAYSTACK_HTTP2", "").lower() in ("1", "true", "yes")
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning(
+                "PAYSTACK_HTTP2 is set but h2 is not installed; using HTTP/1.1. "
+                "Install the http2 extra to use HTTP/2."
+            )
+            http2 = False
+        return cls(
+            max_connections=int(
+                os.environ.get("PAYSTACK_MAX_CONNECTIONS", cls.max_connections)
+            ),
+            max_keepalive_connections=int(
+                os.environ.get(
+                    "PAYSTACK_MAX_KEEPALIVE_CONNECTIONS", cls.max_keepalive_connections
+                )
+            ),
+            keepalive_expiry=float(
+                os.environ.get("PAYSTACK_KEEPALIVE_EXPIRY", cls.keepalive_expiry)
+            ),
+            http2=http2,
+        )
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+class ConnectionPool:
+    """A keep-alive connection pool shared by every request a client makes.
+
+    Wraps a single ``httpx.AsyncClient`` and counts new TCP connections and TLS
+    handshakes through httpcore's ``trace`` extension, so connection reuse can
+    be observed from the ``paystack://pool/stats`` resource.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: dict[str, str],
+        timeout: float,
+        config: PoolConfig | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.config = config or PoolConfig.from_env()
+        if transport is None:
+            transport = cassette_transport(self.config.limits, self.config.http2)
+        self.http = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=self.config.limits,
+            http2=self.config.http2,
+            transport=transport,
+        )
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+
+    async def trace(self, event: str, info: dict):
+        """httpcore trace hook recording connection setup events."""
+        if event == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+        elif event == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request over a pooled connection."""
+        self.requests += 1
+        extensions = kwargs.pop("extensions", {})
+        extensions["trace"] = self.trace
+        return await self.http.request(method, path, extensions=extensions, **kwargs)
+
+    def stats(self) -> dict:
+        """Return connection reuse counters and the current pool occupancy."""
+        connections = getattr(getattr(self.http, "_transport", None), "_pool", None)
+        connections = connections.connections if connections is not None else []
+        reused = self.requests - self.connections_opened
+        return {
+            "max_connections": self.config.max_connections,
+            "max_keepalive_connections": self.config.max_keepalive_connections,
+            "keepalive_expiry": self.config.keepalive_expiry,
+            "http2": self.config.http2,
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "tls_handshakes": self.tls_handshakes,
+            "reuse_ratio": reused / self.requests if self.requests else 0.0,
+            "open_connections": len(connections),
+            "idle_connections": sum(1 for conn in connections if conn.is_idle()),
+        }
+
+    async def aclose(self):
+        """Close every pooled connection."""
+        await self.http.aclose()
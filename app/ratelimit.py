@@ -0,0 +1,165 @@
+import asyncio
+import os
+import time
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+# Requests per second allowed for each endpoint family when no explicit rate
+# is configured for it.
+DEFAULT_RATE = 20.0
+
+# How many times a request rejected with a 429 is sent before giving up.
+MAX_THROTTLED_ATTEMPTS = 5
+
+# Path prefixes that share a family with a differently named one.
+FAMILY_ALIASES = {
+    "bank": "verification",
+    "address_verification": "verification",
+    "decision": "verification",
+    "country": "verification",
+    "refund": "transaction",
+    "paymentrequest": "invoice",
+    "page": "payment_page",
+}
+
+
+def endpoint_family(path: str) -> str:
+    """Return the rate limit family for an API path, e.g. ``/transaction/1``."""
+    segment = path.lstrip("/").split("/", 1)[0]
+    return FAMILY_ALIASES.get(segment, segment)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Return how long the API asked us to wait, in seconds, if it said so."""
+    value = response.headers.get("Retry-After")
+    if value is not None:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                return None
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        reset = response.headers.get("X-RateLimit-Reset")
+        try:
+            reset = float(reset)
+        except (TypeError, ValueError):
+            return None
+        # The reset is either an epoch timestamp or a number of seconds.
+        return max(reset - time.time(), 0.0) if reset > 1e9 else reset
+    return None
+
+
+class TokenBucket:
+    """An adaptive token bucket.
+
+    Tokens refill at ``rate`` per second up to ``capacity``. Callers queue in
+    arrival order until a token is free. A 429 halves the rate and pauses the
+    bucket for the time the API asked for; every successful response then
+    nudges the rate back towards its configured maximum.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.max_rate = rate
+        self.min_rate = rate / 16
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.throttled = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        # Time spent paused after a 429 does not earn tokens.
+        start = max(self.updated, self.blocked_until)
+        if now > start:
+            self.tokens = min(self.capacity, self.tokens + (now - start) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def throttle(self, retry_after: float | None = None):
+        """Back off after the API rejected a request for exceeding its limit."""
+        self.throttled += 1
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0
+        delay = retry_after if retry_after is not None else 1 / self.rate
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+
+    def recover(self):
+        """Increase the rate a little after a request went through."""
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class RateLimiter:
+    """Per endpoint family token buckets shared by every call a client makes."""
+
+    def __init__(
+        self, rates: dict[str, float] | None = None, default_rate: float | None = None
+    ):
+        if default_rate is None:
+            default_rate = float(os.environ.get("PAYSTACK_RATE_LIMIT", DEFAULT_RATE))
+        if rates is None:
+            # e.g. PAYSTACK_RATE_LIMITS="transaction=10,verification=5"
+            rates = {
+                family.strip(): float(rate)
+                for family, rate in (
+                    item.split("=", 1)
+                    for item in os.environ.get("PAYSTACK_RATE_LIMITS", "").split(",")
+                    if "=" in item
+                )
+            }
+        self.rates = rates
+        self.default_rate = default_rate
+        self.buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, path: str) -> TokenBucket:
+        family = endpoint_family(path)
+        bucket = self.buckets.get(family)
+        if bucket is None:
+            rate = self.rates.get(family, self.default_rate)
+            bucket = self.buckets[family] = TokenBucket(rate)
+        return bucket
+
+    async def acquire(self, path: str):
+        """Wait for permission to call ``path``."""
+        await self.bucket(path).acquire()
+
+    def observe(self, path: str, response: httpx.Response):
+        """Adapt the family's rate to the API's response."""
+        bucket = self.bucket(path)
+        if response.status_code == 429:
+            bucket.throttle(_retry_after(response))
+            return
+        retry_after = _retry_after(response)
+        if retry_after:
+            bucket.blocked_until = max(
+                bucket.blocked_until, time.monotonic() + retry_after
+            )
+        bucket.recover()
+
+    def stats(self) -> dict:
+        return {
+            family: {
+                "rate": bucket.rate,
+                "max_rate": bucket.max_rate,
+                "throttled": bucket.throttled,
+            }
+            for family, bucket in self.buckets.items()
+        }
@@ -0,0 +1,174 @@
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# How often stored reference data is refreshed from Paystack, in seconds.
+# Snapshots older than this are not served once Paystack can be reached.
+DEFAULT_REFRESH_INTERVAL = 24 * 60 * 60
+
+# How often the refresh loop looks for snapshots due a refresh, in seconds.
+REFRESH_CHECK_INTERVAL = 60
+
+
+class ReferenceStore:
+    """A SQLite snapshot of Paystack reference data.
+
+    Bank lists, countries and AVS states are stored per endpoint and per
+    filter (country, currency, gateway, ...), so a fresh process or a new
+    container replica can answer them without touching the network.
+    Snapshots older than ``max_age`` seconds count as missing.
+    """
+
+    def __init__(self, path: str, max_age: float = DEFAULT_REFRESH_INTERVAL):
+        self.path = path
+        self.max_age = max_age
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS reference_data ("
+            " endpoint TEXT NOT NULL,"
+            " params TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (endpoint, params))"
+        )
+
+    @classmethod
+    def from_env(cls) -> "ReferenceStore | None":
+        """Open the store named by ``PAYSTACK_REFERENCE_DB``, if it is set."""
+        path = os.environ.get("PAYSTACK_REFERENCE_DB")
+        if not path:
+            return None
+        return cls(path, refresh_interval())
+
+    @staticmethod
+    def _key(params: dict) -> str:
+        return json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+    def get(self, endpoint: str, params: dict, max_age: float | None = None):
+        """Return the stored payload for an endpoint and filter, if any.
+
+        Payloads fetched more than ``max_age`` seconds ago are not returned.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload, fetched_at FROM reference_data"
+                " WHERE endpoint = ? AND params = ?",
+                (endpoint, self._key(params)),
+            ).fetchone()
+        if row is None or (max_age is not None and time.time() - row[1] > max_age):
+            return None
+        return json.loads(row[0])
+
+    def put(self, endpoint: str, params: dict, payload):
+        """Store (or replace) the payload for an endpoint and filter."""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO reference_data VALUES (?, ?, ?, ?)",
+                (endpoint, self._key(params), json.dumps(payload), time.time()),
+            )
+
+    def entries(self) -> list[tuple[str, dict, float]]:
+        """List every stored endpoint, filter and when it was fetched."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT endpoint, params, fetched_at FROM reference_data"
+            ).fetchall()
+        return [(endpoint, json.loads(params), at) for endpoint, params, at in rows]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def reference_data(func):
+    """Serve an async read method from ``self.reference_store`` when possible.
+
+    The first call for a given filter goes to Paystack and is written to the
+    store; later calls, including ones from new processes, read the snapshot
+    until it is older than the store's ``max_age``. An outdated snapshot is
+    still served if Paystack cannot be reached. Methods behave normally when
+    the client has no reference store.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        store = self.reference_store
+        if store is None:
+            return await func(self, *args, **kwargs)
+        bound = signature.bind(None, *args, **kwargs)
+        bound.apply_defaults()
+        params = dict(list(bound.arguments.items())[1:])
+        payload = store.get(func.__name__, params, store.max_age)
+        if payload is not None:
+            return payload
+        try:
+            payload = await func(self, *args, **kwargs)
+        except Exception:
+            payload = store.get(func.__name__, params)
+            if payload is None:
+                raise
+            logger.warning("Serving outdated %s %s", func.__name__, params)
+            return payload
+        store.put(func.__name__, params, payload)
+        return payload
+
+    return wrapper
+
+
+def refresh_interval() -> float:
+    return float(os.environ.get("PAYSTACK_REFERENCE_REFRESH", DEFAULT_REFRESH_INTERVAL))
+
+
+async def refresh_reference_data(client, max_age: float | None = None):
+    """Re-fetch stored reference snapshots from Paystack.
+
+    With ``max_age``, only snapshots fetched longer ago than that are.
+    """
+    store = client.reference_store
+    if store is None:
+        return
+    now = time.time()
+    for endpoint, params, fetched_at in store.entries():
+        if max_age is not None and now - fetched_at < max_age:
+            continue
+        fetch = inspect.unwrap(getattr(type(client), endpoint))
+        try:
+            payload = await fetch(client, **params)
+        except Exception:
+            logger.exception("Failed to refresh %s %s", endpoint, params)
+            continue
+        store.put(endpoint, params, payload)
+        client.cache.invalidate(endpoint)
+
+
+async def run_refresh_loop(clients, interval: float | None = None):
+    """Refresh stored reference data once it is ``interval`` seconds old.
+
+    ``clients`` is a ``ClientRegistry``. Snapshots are checked straight away
+    and then every :data:`REFRESH_CHECK_INTERVAL` seconds, so outdated data
+    left by an earlier process is refreshed as soon as a client is in use.
+    Reference data is the same for every merchant, so each refresh uses the
+    first tenant client that is in use. Runs until cancelled.
+    """
+    if interval is None:
+        interval = refresh_interval()
+    while True:
+        for client in clients.active().values():
+            if client.reference_store is not None:
+                await refresh_reference_data(client, interval)
+                break
+        await asyncio.sleep(min(interval, REFRESH_CHECK_INTERVAL))
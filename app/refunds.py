@@ -0,0 +1,144 @@
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+
+from app.batch import gather_each
+from app.pagination import DEFAULT_MAX_WORKERS
+from app.paystack_client import PaystackAPIError
+
+# Refunds in these states no longer count against a transaction's amount.
+VOID_REFUND_STATUSES = {"failed", "reversed"}
+
+
+def batch_key(refunds: list[tuple[str, int | None]]) -> str:
+    """Derive an idempotency key from the refunds requested in a batch.
+
+    Submitting exactly the same batch again yields the same key, so refunds
+    that already went through are not issued twice.
+    """
+    payload = json.dumps([list(refund) for refund in refunds])
+    return "refunds-" + hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+
+async def refundable_amount(client, transaction: str) -> dict:
+    """Look up how much of a transaction can still be refunded.
+
+    The value is looked up as a reference first, since references may be
+    numeric too, and fetched as a transaction ID only when no transaction
+    has that reference. A stale copy, served while the circuit is open, is
+    refused rather than trusted with a refund.
+    """
+    try:
+        response = await client.verify_transaction(transaction)
+    except PaystackAPIError as exc:
+        if exc.status_code != 404 or not transaction.isdigit():
+            raise
+        response = await client.fetch_transaction(transaction)
+    if response.get("stale"):
+        raise RuntimeError(
+            f"Transaction {transaction} cannot be checked while Paystack is "
+            "failing; only a stale copy is available."
+        )
+    data = response["data"]
+    refunds = await client.list_refunds(str(data["id"]), per_page=100)
+    refunded = sum(
+        refund.get("amount") or 0
+        for refund in refunds.get("data") or []
+        if refund.get("status") not in VOID_REFUND_STATUSES
+    )
+    return {
+        "id": str(data["id"]),
+        "status": data.get("status"),
+        "currency": data.get("currency"),
+        "amount": data["amount"],
+        "refunded": refunded,
+    }
+
+
+def _check(refund: tuple[str, int | None], details: dict, remaining: int) -> str | None:
+    """Return why a refund cannot be issued, or ``None`` if it can."""
+    transaction, amount = refund
+    if details["status"] != "success":
+        return f"Transaction {transaction} is {details['status']}, not successful."
+    if remaining <= 0:
+        return f"Transaction {transaction} has already been fully refunded."
+    if amount is not None and amount <= 0:
+        return "Refund amount must be positive."
+    if amount is not None and amount > remaining:
+        return (
+            f"Refund of {amount} exceeds the {remaining} {details['currency']} "
+            f"still refundable on transaction {transaction}."
+        )
+    return None
+
+
+async def bulk_refund(
+    client,
+    refunds: list[tuple[str, int | None]],
+    dry_run: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    idempotency_key: str | None = None,
+    on_progress: Callable[[int, int, object, dict], Awaitable[None]] | None = None,
+) -> list[dict]:
+    """Validate and issue refunds, returning one ledger entry per refund.
+
+    Every transaction is looked up first, and a refund is rejected when it,
+    together with earlier refunds of the same transaction (on Paystack or
+    earlier in ``refunds``), would exceed the amount paid. A refund without
+    an amount refunds whatever is left. Accepted refunds are then issued
+    concurrently, each with its own idempotency key; with ``dry_run`` they
+    are only reported.
+    """
+    transactions = list(dict.fromkeys(transaction for transaction, _ in refunds))
+    lookups = await gather_each(
+        lambda transaction: refundable_amount(client, transaction),
+        transactions,
+        max_workers,
+    )
+    details = dict(zip(transactions, lookups))
+    remaining = {
+        transaction: lookup["result"]["amount"] - lookup["result"]["refunded"]
+        for transaction, lookup in details.items()
+        if lookup["ok"]
+    }
+
+    ledger = []
+    accepted = []
+    for transaction, amount in refunds:
+        entry = {"transaction": transaction, "requested": amount}
+        lookup = details[transaction]
+        if not lookup["ok"]:
+            entry.update(status="rejected", error=lookup["error"])
+        elif error := _check(
+            (transaction, amount), lookup["result"], remaining[transaction]
+        ):
+            entry.update(status="rejected", error=error)
+        else:
+            entry["transaction_id"] = lookup["result"]["id"]
+            entry["amount"] = amount if amount is not None else remaining[transaction]
+            entry["currency"] = lookup["result"]["currency"]
+            entry["status"] = "would_refund" if dry_run else "pending"
+            remaining[transaction] -= entry["amount"]
+            accepted.append(entry)
+        ledger.append(entry)
+
+    if dry_run or not accepted:
+        return ledger
+
+    key = idempotency_key or batch_key(refunds)
+    for index, entry in enumerate(ledger):
+        if entry["status"] == "pending":
+            entry["idempotency_key"] = f"{key}:{index}"
+
+    async def issue(entry):
+        return await client.create_refund(
+            entry["transaction_id"], entry["amount"], entry["idempotency_key"]
+        )
+
+    outcomes = await gather_each(issue, accepted, max_workers, on_progress)
+    for entry, outcome in zip(accepted, outcomes):
+        if outcome["ok"]:
+            entry.update(status="refunded", refund=outcome["result"].get("data"))
+        else:
+            entry.update(status="failed", error=outcome["error"])
+    return ledger
@@ -0,0 +1,102 @@
+import os
+import threading
+
+from app.paystack_client import AsyncPaystackClient, load_env
+
+DEFAULT_TENANT = "default"
+
+# Environment variables that hold the secret key of a named tenant, e.g.
+# PAYSTACK_API_KEY_ACME for the "acme" tenant.
+TENANT_KEY_PREFIX = "PAYSTACK_API_KEY_"
+
+
+class UnknownTenantError(ValueError):
+    """Raised when a tool call names a tenant that has no API key."""
+
+
+def tenant_keys_from_env() -> dict[str, str]:
+    """Collect the API key of every tenant configured in the environment.
+
+    ``PAYSTACK_API_KEY`` belongs to the default tenant; ``PAYSTACK_API_KEY_<NAME>``
+    adds a tenant called ``<name>`` (lower-cased).
+    """
+    keys = {}
+    if os.environ.get("PAYSTACK_API_KEY"):
+        keys[DEFAULT_TENANT] = os.environ["PAYSTACK_API_KEY"]
+    for name, value in os.environ.items():
+        if name.startswith(TENANT_KEY_PREFIX) and value:
+            keys[name[len(TENANT_KEY_PREFIX) :].lower()] = value
+    return keys
+
+
+class ClientRegistry:
+    """One ``AsyncPaystackClient`` per merchant account (tenant).
+
+    Every tenant gets a client of its own, and with it its own API key,
+    connection pool, response cache and rate limiter, so one merchant's
+    traffic can neither read another's cached responses nor use up its rate
+    limit. Keys are read from the environment, and clients built, on first
+    use rather than at import time.
+    """
+
+    def __init__(self, keys: dict[str, str] | None = None, **client_options):
+        self._keys = None if keys is None else dict(keys)
+        self.client_options = client_options
+        self.clients: dict[str, AsyncPaystackClient] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def keys(self) -> dict[str, str]:
+        if self._keys is None:
+            load_env()
+            self._keys = tenant_keys_from_env()
+        return self._keys
+
+    async def register(self, tenant: str, api_key: str):
+        """Add a tenant, or replace the key of an existing one.
+
+        A client already built for the tenant is closed; the next call builds
+        one with the new key.
+        """
+        with self._lock:
+            self.keys[tenant] = api_key
+            old = self.clients.pop(tenant, None)
+        if old is not None:
+            await old.aclose()
+
+    def tenants(self) -> list[str]:
+        return sorted(self.keys)
+
+    def get(self, tenant: str | None = None) -> AsyncPaystackClient:
+        """Return the client for ``tenant``, or for the default tenant."""
+        tenant = tenant or DEFAULT_TENANT
+        client = self.clients.get(tenant)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self.clients.get(tenant)
+            if client is None:
+                api_key = self.keys.get(tenant)
+                if api_key is None and tenant == DEFAULT_TENANT:
+                    raise UnknownTenantError("Paystack API key not provided.")
+                if api_key is None:
+                    raise UnknownTenantError(f"Unknown Paystack tenant: {tenant!r}")
+                client = self.clients[tenant] = AsyncPaystackClient(
+                    api_key=api_key, tenant=tenant, **self.client_options
+                )
+        return client
+
+    def active(self) -> dict[str, AsyncPaystackClient]:
+        """Return the clients that have been built so far, by tenant."""
+        return dict(self.clients)
+
+    async def aclose(self):
+        """Close the connections of every client built so far."""
+        with self._lock:
+            clients, self.clients = self.clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+# The registry used by the tools
+clients = ClientRegistry()
@@ -0,0 +1,56 @@
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+from app.exports import exports
+from app.metrics import metrics
+from app.registry import clients
+from app.server import mcp
+from app.shaping import dumps
+
+
+@mcp.resource("paystack://pool/stats", mime_type="application/json")
+def pool_stats() -> dict:
+    """
+    Connection pool statistics for each tenant's Paystack HTTP client.
+    """
+    return {tenant: client.pool.stats() for tenant, client in clients.active().items()}
+
+
+@mcp.resource("paystack://cache/stats", mime_type="application/json")
+def cache_stats() -> dict:
+    """
+    Hit and miss counters for each tenant's Paystack response cache.
+    """
+    return {tenant: client.cache.stats() for tenant, client in clients.active().items()}
+
+
+@mcp.resource("paystack://breaker/stats", mime_type="application/json")
+def breaker_stats() -> dict:
+    """
+    Circuit breaker state and recent failures per Paystack endpoint, for each tenant.
+    """
+    return {
+        tenant: client.breakers.stats() for tenant, client in clients.active().items()
+    }
+
+
+@mcp.resource("paystack://exports/{export_id}/{chunk}", mime_type="application/json")
+def export_chunk(export_id: str, chunk: str) -> str:
+    """
+    One chunk of records from a `transaction.download` or `dispute.download` export, with the URI of the next chunk.
+    """
+    return dumps(exports.read(export_id, int(chunk)))
+
+
+@mcp.resource("paystack://metrics", mime_type="text/plain")
+def metrics_text() -> str:
+    """
+    Per-tool and per-endpoint latency, status, retry, cache and payload size metrics in the Prometheus text format.
+    """
+    return metrics.render()
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Serve the metrics to Prometheus on the HTTP transports."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,84 @@
+import asyncio
+import os
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import httpx
+
+# Upstream statuses worth another attempt: the request was not applied, or
+# the gateway lost track of it.
+RETRYABLE_STATUSES = frozenset({500, 502, 503, 504})
+
+# A write is only sent again when it cannot have reached Paystack: it was
+# never sent, or a gateway turned it away. After a read timeout or a 500
+# Paystack may already have applied it.
+WRITE_RETRYABLE_STATUSES = frozenset({502, 503, 504})
+WRITE_RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by attempts and time."""
+
+    max_attempts: int = 4
+    base_delay: float = 0.25
+    max_delay: float = 5.0
+    max_elapsed: float = 30.0
+
+    def __post_init__(self):
+        self.retries = 0
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build a retry policy from ``PAYSTACK_RETRY_*`` environment variables."""
+        return cls(
+            max_attempts=int(
+                os.environ.get("PAYSTACK_RETRY_ATTEMPTS", cls.max_attempts)
+            ),
+            max_elapsed=float(
+                os.environ.get("PAYSTACK_RETRY_MAX_ELAPSED", cls.max_elapsed)
+            ),
+        )
+
+    def should_retry(self, exc: Exception, write: bool = False) -> bool:
+        if write:
+            errors, statuses = WRITE_RETRYABLE_ERRORS, WRITE_RETRYABLE_STATUSES
+        else:
+            errors, statuses = httpx.TransportError, RETRYABLE_STATUSES
+        if isinstance(exc, errors):
+            return True
+        return getattr(exc, "status_code", None) in statuses
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before retry number ``attempt`` (starting at 0)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable],
+        on_retry: Callable[[], None] | None = None,
+        write: bool = False,
+    ):
+        """Await ``fn()``, retrying transient failures.
+
+        ``on_retry()`` is called before each retry. With ``write``, only
+        failures that show the request was not applied are retried.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return await fn()
+            except Exception as exc:
+                attempt += 1
+                if attempt >= self.max_attempts or not self.should_retry(exc, write):
+                    raise
+                delay = self.backoff(attempt - 1)
+                if time.monotonic() - started + delay > self.max_elapsed:
+                    raise
+                self.retries += 1
+                if on_retry is not None:
+                    on_retry()
+                await asyncio.sleep(delay)
@@ -0,0 +1,99 @@
+import argparse
+import os
+
+import anyio
+
+from app.paystack_client import load_env
+from app.server import closing, mcp, shutdown
+
+TRANSPORTS = ("stdio", "streamable-http", "sse")
+
+
+def create_app():
+    """Build the ASGI app for the configured HTTP transport.
+
+    Used as a uvicorn factory so that every worker process imports the tools
+    and builds its own app. The transport is read from
+    ``PAYSTACK_MCP_TRANSPORT``, which :func:`main` sets for the workers.
+    Every tenant's client is closed when the worker shuts down.
+    """
+    # The tools and resources register themselves with the mcp instance.
+    import app.resources
+    import app.tools
+
+    if os.environ.get("PAYSTACK_WEBHOOK_LOG"):
+        # Adds the webhook routes next to the MCP endpoint.
+        import app.webhooks  # noqa: F401
+
+    if os.environ.get("PAYSTACK_MCP_TRANSPORT") == "sse":
+        asgi = mcp.sse_app()
+    else:
+        # Sessions live in worker memory, so with several workers any request
+        # must be servable by any worker.
+        workers = int(os.environ.get("PAYSTACK_MCP_WORKERS", "1"))
+        mcp.settings.stateless_http = workers > 1
+        asgi = mcp.streamable_http_app()
+    asgi.router.lifespan_context = closing(asgi.router.lifespan_context)
+    return asgi
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Paystack MCP server.")
+    parser.add_argument(
+        "--transport",
+        choices=TRANSPORTS,
+        default=os.environ.get("PAYSTACK_MCP_TRANSPORT", "stdio"),
+    )
+    parser.add_argument(
+        "--host", default=os.environ.get("PAYSTACK_MCP_HOST", "127.0.0.1")
+    )
+    parser.add_argument(
+        "--port", type=int, default=int(os.environ.get("PAYSTACK_MCP_PORT", "8000"))
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("PAYSTACK_MCP_WORKERS", "1")),
+        help="Worker processes for the HTTP transports.",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=float(os.environ.get("PAYSTACK_MCP_GRACEFUL_TIMEOUT", "30")),
+        help="Seconds in-flight requests get to finish on shutdown.",
+    )
+    args = parser.parse_args(argv)
+    if args.transport == "sse" and args.workers > 1:
+        parser.error("the sse transport keeps sessions in memory; use --workers 1")
+    return args
+
+
+async def run_stdio():
+    """Serve the stdio session, then shut down."""
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        await shutdown()
+
+
+def main(argv: list[str] | None = None):
+    """Run the server over stdio or, with several workers, over HTTP."""
+    load_env()
+    args = parse_args(argv)
+    if args.transport == "stdio":
+        anyio.run(run_stdio)
+        return
+
+    import uvicorn
+
+    os.environ["PAYSTACK_MCP_TRANSPORT"] = args.transport
+    os.environ["PAYSTACK_MCP_WORKERS"] = str(args.workers)
+    uvicorn.run(
+        "app.serve:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        log_level=mcp.settings.log_level.lower(),
+    )
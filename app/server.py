@@ -1,4 +1,62 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from mcp.server.fastmcp import FastMCP
 
+# Background tasks shared by every session of this process.
+_background: set[asyncio.Task] = set()
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Start process-wide background maintenance with the first session.
+
+    FastMCP enters the lifespan once per session (once per request when the
+    HTTP transport is stateless), so the tasks started here outlive the
+    session that started them.
+    """
+    from app.mirror import run_sync_loop
+    from app.reference_store import run_refresh_loop
+    from app.registry import clients
+
+    if not _background:
+        # Clients are built by the first tool call that needs one; the loops
+        # only touch the ones that exist by then.
+        for loop in (run_refresh_loop, run_sync_loop):
+            task = asyncio.create_task(loop(clients))
+            _background.add(task)
+            task.add_done_callback(_background.discard)
+    yield
+
+
+async def shutdown():
+    """Stop the background maintenance and close every tenant's client.
+
+    Run once, when the process stops serving: after the stdio session ends,
+    or when an HTTP worker shuts down.
+    """
+    from app.registry import clients
+
+    tasks = list(_background)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await clients.aclose()
+
+
+def closing(app_lifespan):
+    """Wrap an ASGI app's lifespan so that :func:`shutdown` runs after it."""
+
+    @asynccontextmanager
+    async def wrapped(app):
+        try:
+            async with app_lifespan(app) as state:
+                yield state
+        finally:
+            await shutdown()
+
+    return wrapped
+
+
 # Initialize FastMCP server
-mcp = FastMCP("paystack")
+mcp = FastMCP("paystack", lifespan=lifespan)
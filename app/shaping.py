@@ -0,0 +1,175 @@
+import functools
+import inspect
+import json
+import time
+
+from app.metrics import metrics, span, upstream_time
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Nested blobs that compact mode leaves out unless they are asked for with
+# ``fields``: card authorizations, checkout logs and fee breakdowns.
+NOISY_KEYS = frozenset(
+    {"authorization", "log", "fees_breakdown", "fees_split", "plan_object"}
+)
+
+# Nested arrays longer than this are summarized in compact mode.
+MAX_LIST_ITEMS = 10
+
+SHAPING_DOCS = """
+        fields: Only return these fields of each record, as dotted paths like 'customer.email' (optional).
+        compact: Leave out empty fields and bulky nested data such as authorizations and logs, and shorten long lists (default is False)."""
+
+
+def dumps(value) -> str:
+    """Serialize a tool result to compact JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+def _records(result, key: str = "data"):
+    """Return the records of a result and a function that puts them back.
+
+    For Paystack responses the records are in ``data``; the status, message
+    and pagination meta around them are kept as they are. Batch tools keep
+    their per-item outcomes under another ``key``.
+    """
+    if isinstance(result, dict) and key in result:
+        return result[key], lambda records: {**result, key: records}
+    return result, lambda records: records
+
+
+def _pick(value, paths: list[list[str]]):
+    if isinstance(value, list):
+        return [_pick(item, paths) for item in value]
+    if not isinstance(value, dict):
+        return value
+    picked = {}
+    for path in paths:
+        key, rest = path[0], path[1:]
+        if key not in value:
+            continue
+        if not rest:
+            picked[key] = value[key]
+            continue
+        child = _pick(value[key], [rest])
+        if isinstance(picked.get(key), dict) and isinstance(child, dict):
+            picked[key].update(child)
+        else:
+            picked[key] = child
+    return picked
+
+
+def project_fields(result, fields: list[str], records_key: str = "data"):
+    """Keep only ``fields`` (dotted paths) of every record in ``result``."""
+    records, rebuild = _records(result, records_key)
+    paths = [field.split(".") for field in fields if field]
+    if isinstance(records, list):
+        return rebuild([_pick(record, paths) for record in records])
+    return rebuild(_pick(records, paths))
+
+
+def _compact(value, drop: frozenset):
+    if isinstance(value, dict):
+        return {
+            key: _compact(item, drop)
+            for key, item in value.items()
+            if item is not None and key not in drop
+        }
+    if isinstance(value, list):
+        items = [_compact(item, drop) for item in value[:MAX_LIST_ITEMS]]
+        if len(value) > MAX_LIST_ITEMS:
+            return {"count": len(value), "first": items}
+        return items
+    return value
+
+
+def compact_result(result, keep: frozenset = frozenset(), records_key: str = "data"):
+    """Drop nulls and noisy blobs from every record and shorten nested lists.
+
+    The list of records itself is never shortened. Keys named in ``keep``
+    are not dropped even if they are usually noisy.
+    """
+    records, rebuild = _records(result, records_key)
+    drop = NOISY_KEYS - keep
+    if isinstance(records, list):
+        return rebuild([_compact(record, drop) for record in records])
+    return rebuild(_compact(records, drop))
+
+
+def shaped(func=None, *, records: str = "data"):
+    """Give a tool optional ``fields`` and ``compact`` arguments.
+
+    The tool's result is projected and compacted as asked and returned as
+    compact JSON text, which is what the MCP client receives either way.
+    ``records`` names the key holding the result's records, for tools that
+    do not return them in ``data``, as in ``@shaped(records="results")``.
+    Each call's total time, time spent waiting on Paystack, serialization
+    time and response size are recorded in :data:`app.metrics.metrics`.
+    """
+    if func is None:
+        return functools.partial(shaped, records=records)
+    name = func.__name__
+
+    @functools.wraps(func)
+    async def tool(
+        *args, fields: list[str] | None = None, compact: bool = False, **kwargs
+    ):
+        started = time.perf_counter()
+        upstream = [0.0]
+        token = upstream_time.set(upstream)
+        outcome = "error"
+        try:
+            with span("mcp.tool", tool=name):
+                result = await func(*args, **kwargs)
+                serializing = time.perf_counter()
+                if fields:
+                    result = project_fields(result, fields, records)
+                if compact:
+                    keep = frozenset(field.split(".", 1)[0] for field in fields or ())
+                    result = compact_result(result, keep, records)
+                text = dumps(result)
+            metrics.tool_serialize_seconds.observe(
+                time.perf_counter() - serializing, name
+            )
+            metrics.tool_response_bytes.observe(len(text), name)
+            outcome = "ok"
+            return text
+        finally:
+            upstream_time.reset(token)
+            metrics.tool_seconds.observe(time.perf_counter() - started, name)
+            metrics.tool_upstream_seconds.observe(upstream[0], name)
+            metrics.tool_calls.inc(name, outcome)
+
+    # FastMCP builds the tool's arguments from its signature and description
+    # from its docstring, so both have to mention the new arguments.
+    signature = inspect.signature(func)
+    tool.__signature__ = signature.replace(
+        parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter(
+                "fields",
+                inspect.Parameter.KEYWORD_ONLY,
+                default=None,
+                annotation=list[str] | None,
+            ),
+            inspect.Parameter(
+                "compact",
+                inspect.Parameter.KEYWORD_ONLY,
+                default=False,
+                annotation=bool,
+            ),
+        ]
+    )
+    tool.__annotations__ = {
+        **func.__annotations__,
+        "fields": list[str] | None,
+        "compact": bool,
+    }
+    if func.__doc__:
+        tool.__doc__ = func.__doc__.rstrip() + SHAPING_DOCS + "\n    "
+    return tool
@@ -0,0 +1,47 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls into one in-flight call.
+
+    The first caller for a key starts the call; callers that arrive while it
+    is still running wait for and share its result (or exception). The call
+    runs as its own task, so a cancelled caller does not cancel it for the
+    others.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def _finished(self, key: Hashable, task: asyncio.Future):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every caller went away.
+            task.exception()
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable]) -> asyncio.Future:
+        """Start ``fn`` for ``key`` unless it is in flight, and return its task."""
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.coalesced += 1
+        return task
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        """Run ``fn`` for ``key``, or join the call already in flight."""
+        return await asyncio.shield(self.start(key, fn))
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._calls),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
@@ -1,34 +1,65 @@
+from mcp.server.fastmcp import Context
+
+from app.batch import summarize
+from app.customer_import import (
+    ImportCheckpoint,
+    import_customers,
+    import_path,
+    parse_customers,
+)
+from app.exports import exports
+from app.mirror import require_mirror, sync_mirror
+from app.refunds import bulk_refund
+from app.registry import clients
 from app.server import mcp
-from app.paystack_client import paystack_client
+from app.shaping import shaped
 
 
 @mcp.tool(name="balance.read")
-def get_balance():
+@shaped
+async def get_balance(tenant: str | None = None):
     """
     Retrieves the balance from a Paystack account.
+
+    Args:
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.get_balance()
+    return await clients.get(tenant).get_balance()
 
 
 @mcp.tool(name="balance.ledger")
-def get_balance_ledger():
+@shaped
+async def get_balance_ledger(tenant: str | None = None):
     """
     Retrieves the balance ledger from a Paystack account.
+
+    Args:
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.get_balance_ledger()
+    return await clients.get(tenant).get_balance_ledger()
 
 
 @mcp.tool(name="customer.list")
-def list_customers():
+@shaped
+async def list_customers(tenant: str | None = None):
     """
     Retrieves a list of all customers.
+
+    Args:
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.list_customers()
+    return await clients.get(tenant).list_customers()
 
 
 @mcp.tool(name="customer.create")
-def create_customer(
-    email: str, first_name: str, last_name: str, phone: str | None = None
+@shaped
+async def create_customer(
+    email: str,
+    first_name: str,
+    last_name: str,
+    phone: str | None = None,
+    idempotency_key: str | None = None,
+    tenant: str | None = None,
 ):
     """
     Creates a new customer.
@@ -38,24 +69,76 @@ def create_customer(
         first_name: The customer's first name.
         last_name: The customer's last name.
         phone: The customer's phone number (optional).
+        idempotency_key: A unique key for this operation (optional). Repeating a call with the same key returns the original result instead of creating a duplicate.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
+    """
+    return await clients.get(tenant).create_customer(
+        email, first_name, last_name, phone, idempotency_key
+    )
+
+
+@mcp.tool(name="customer.bulk_upsert")
+@shaped(records="failures")
+async def bulk_upsert_customers(
+    ctx: Context,
+    customers: str | None = None,
+    path: str | None = None,
+    checkpoint_path: str | None = None,
+    chunk_size: int = 500,
+    max_workers: int = 8,
+    tenant: str | None = None,
+):
     """
-    return paystack_client.create_customer(email, first_name, last_name, phone)
+    Creates or updates many customers, matched by email address.
+
+    Customers are read from CSV (with a header row) or JSON Lines containing email, first_name, last_name and phone. Rows with the same email are merged. Existing customers are updated and new ones created, concurrently and a chunk at a time, with progress reported after each chunk. Run the tool again with the same checkpoint to resume an interrupted import. Up to 50 failures are listed; all are recorded in the checkpoint.
+
+    Args:
+        customers: The customers as CSV or JSON Lines text (optional, use this or path).
+        path: Path of a .csv or .jsonl file in the server's import directory holding the customers (optional, use this or customers).
+        checkpoint_path: File in the import directory recording imported customers so a rerun skips them (optional, defaults to the file path plus '.checkpoint.jsonl' when path is given).
+        chunk_size: Number of customers processed between checkpoints (default is 500).
+        max_workers: Maximum number of customers upserted at once (default is 8).
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
+    """
+    rows = parse_customers(customers, import_path(path) if path else None)
+    if checkpoint_path is None and path is not None:
+        checkpoint_path = f"{path}.checkpoint.jsonl"
+    checkpoint = None
+    if checkpoint_path:
+        checkpoint = ImportCheckpoint(import_path(checkpoint_path))
+
+    async def on_progress(done, total):
+        await ctx.report_progress(done, total, f"{done} of {total} customers upserted")
+
+    summary = await import_customers(
+        clients.get(tenant), rows, checkpoint, chunk_size, max_workers, on_progress
+    )
+    summary["checkpoint"] = checkpoint_path
+    return summary
 
 
 @mcp.tool(name="customer.read")
-def fetch_customer(customer_code: str):
+@shaped
+async def fetch_customer(customer_code: str, tenant: str | None = None):
     """
     Fetches the details of a specific customer.
 
     Args:
         customer_code: The code of the customer to fetch.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.fetch_customer(customer_code)
+    return await clients.get(tenant).fetch_customer(customer_code)
 
 
 @mcp.tool(name="customer.update")
-def update_customer(
-    code: str, first_name: str, last_name: str, phone: str | None = None
+@shaped
+async def update_customer(
+    code: str,
+    first_name: str,
+    last_name: str,
+    phone: str | None = None,
+    tenant: str | None = None,
 ):
     """
     Updates the details of a specific customer.
@@ -65,21 +148,32 @@ def update_customer(
         first_name: The customer's new first name.
         last_name: The customer's new last name.
         phone: The customer's new phone number (optional).
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.update_customer(code, first_name, last_name, phone)
+    return await clients.get(tenant).update_customer(code, first_name, last_name, phone)
 
 
 @mcp.tool(name="product.list")
-def list_products():
+@shaped
+async def list_products(tenant: str | None = None):
     """
     Retrieves a list of all products.
+
+    Args:
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.list_products()
+    return await clients.get(tenant).list_products()
 
 
 @mcp.tool(name="product.create")
-def create_product(
-    name: str, description: str, price: int, currency: str, quantity: int = 1
+@shaped
+async def create_product(
+    name: str,
+    description: str,
+    price: int,
+    currency: str,
+    quantity: int = 1,
+    tenant: str | None = None,
 ):
     """
     Creates a new product.
@@ -90,29 +184,36 @@ def create_product(
         price: The price of the product in the smallest currency unit (e.g., kobo).
         currency: The currency of the price (e.g., NGN).
         quantity: The available quantity of the product (default is 1).
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.create_product(name, description, price, currency, quantity)
+    return await clients.get(tenant).create_product(
+        name, description, price, currency, quantity
+    )
 
 
 @mcp.tool(name="product.read")
-def fetch_product(product_code: str):
+@shaped
+async def fetch_product(product_code: str, tenant: str | None = None):
     """
     Fetches the details of a specific product.
 
     Args:
         product_code: The code of the product to fetch.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.fetch_product(product_code)
+    return await clients.get(tenant).fetch_product(product_code)
 
 
 @mcp.tool(name="product.update")
-def update_product(
+@shaped
+async def update_product(
     product_code: str,
     name: str | None = None,
     description: str | None = None,
     price: int | None = None,
     currency: str | None = None,
     quantity: int | None = None,
+    tenant: str | None = None,
 ):
     """
     Updates the details of a specific product.
@@ -123,52 +224,78 @@ def update_product(
         price: The new price of the product in the smallest currency unit (e.g., kobo) (optional).
         currency: The new currency of the price (e.g., NGN) (optional).
         quantity: The new available quantity of the product (optional).
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.update_product(
+    return await clients.get(tenant).update_product(
         product_code, name, description, price, currency, quantity
     )
 
 
 @mcp.tool(name="product.delete")
-def delete_product(product_code: str):
+@shaped
+async def delete_product(product_code: str, tenant: str | None = None):
     """
     Deletes a specific product.
     Args:
         product_code: The code of the product to delete.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.delete_product(product_code)
+    return await clients.get(tenant).delete_product(product_code)
 
 
 @mcp.tool(name="invoice.list")
-def list_invoices():
+@shaped
+async def list_invoices(tenant: str | None = None):
     """
     Retrieves a list of all invoices.
+
+    Args:
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.list_invoices()
+    return await clients.get(tenant).list_invoices()
 
 
 @mcp.tool(name="invoice.create")
-def create_invoice(customer: str, amount: int):
+@shaped
+async def create_invoice(
+    customer: str,
+    amount: int,
+    idempotency_key: str | None = None,
+    tenant: str | None = None,
+):
     """
     Creates a new invoice.
 
     Args:
         customer: The customer's code or email address.
         amount: The amount of the invoice in the smallest currency unit (e.g., kobo).
+        idempotency_key: A unique key for this operation (optional). Repeating a call with the same key returns the original result instead of creating a duplicate.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.create_invoice(customer, amount)
+    return await clients.get(tenant).create_invoice(customer, amount, idempotency_key)
 
 
 @mcp.tool(name="transaction.list")
-def list_transactions():
+@shaped
+async def list_transactions(tenant: str | None = None):
     """
     Retrieves a list of all transactions.
+
+    Args:
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.list_transactions()
+    return await clients.get(tenant).list_transactions()
 
 
 @mcp.tool(name="transaction.initialize")
-def initialize_transaction(email: str, amount: int, currency: str):
+@shaped
+async def initialize_transaction(
+    email: str,
+    amount: int,
+    currency: str,
+    idempotency_key: str | None = None,
+    tenant: str | None = None,
+):
     """
     Initializes a new transaction.
 
@@ -176,49 +303,155 @@ def initialize_transaction(email: str, amount: int, currency: str):
         email: The customer's email address.
         amount: The amount of the transaction in the smallest currency unit (e.g., kobo).
         currency: The currency of the transaction (e.g., NGN).
+        idempotency_key: A unique key for this operation (optional). Repeating a call with the same key returns the original result instead of creating a duplicate.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.initialize_transaction(email, amount, currency)
+    return await clients.get(tenant).initialize_transaction(
+        email, amount, currency, idempotency_key
+    )
 
 
 @mcp.tool(name="transaction.verify")
-def verify_transaction(reference: str):
+@shaped
+async def verify_transaction(reference: str, tenant: str | None = None):
     """
     Verifies the status of a transaction.
 
     Args:
         reference: The reference of the transaction to verify.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
+    """
+    return await clients.get(tenant).verify_transaction(reference)
+
+
+@mcp.tool(name="transaction.verify_many")
+@shaped(records="results")
+async def verify_transactions(
+    references: list[str],
+    ctx: Context,
+    max_workers: int = 8,
+    tenant: str | None = None,
+):
+    """
+    Verifies the status of many transactions at once.
+
+    Progress is reported as each reference is verified. One failing reference does not stop the others; its error is returned in its result.
+
+    Args:
+        references: The references of the transactions to verify.
+        max_workers: Maximum number of transactions verified at once (default is 8).
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
+    """
+
+    async def on_progress(done, total, reference, outcome):
+        status = "verified" if outcome["ok"] else f"failed: {outcome['error']}"
+        await ctx.report_progress(done, total, f"{reference} {status}")
+
+    results = await clients.get(tenant).verify_transactions(
+        references, max_workers, on_progress
+    )
+    return summarize(results)
+
+
+@mcp.tool(name="transaction.aggregate")
+@shaped
+async def aggregate_transactions(
+    group_by: list[str] | None = None,
+    status: str | None = None,
+    currency: str | None = None,
+    channel: str | None = None,
+    customer: str | None = None,
+    from_date: str | None = None,
+    to_date: str | None = None,
+    percentiles: list[float] | None = None,
+    tenant: str | None = None,
+):
     """
-    return paystack_client.verify_transaction(reference)
+    Computes transaction counts, sums and amount percentiles per group from the local mirror.
+
+    Amounts are in the smallest currency unit (e.g., kobo); group by currency when the account takes several. Run mirror.sync first to bring the mirror up to date.
+
+    Args:
+        group_by: Any of day, currency, channel, status and customer (optional, defaults to currency).
+        status: Only transactions with this status, e.g. success (optional).
+        currency: Only transactions in this currency, e.g. NGN (optional).
+        channel: Only transactions paid through this channel, e.g. card (optional).
+        customer: Only transactions of this customer code (optional).
+        from_date: The start date for filtering transactions (optional, format: 'YYYY-MM-DD').
+        to_date: The end date for filtering transactions, inclusive (optional, format: 'YYYY-MM-DD').
+        percentiles: Percentiles of the amount to report (default is [50, 90, 95, 99]).
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
+    """
+    filters = {
+        "status": status,
+        "currency": currency,
+        "channel": channel,
+        "customer": customer,
+    }
+    mirror = require_mirror(clients.get(tenant))
+    return mirror.aggregate(
+        "transactions",
+        group_by if group_by is not None else ["currency"],
+        {column: value for column, value in filters.items() if value is not None},
+        from_date,
+        to_date,
+        percentiles,
+    )
 
 
 @mcp.tool(name="transaction.read")
-def fetch_transaction(transaction_id: str):
+@shaped
+async def fetch_transaction(transaction_id: str, tenant: str | None = None):
     """
     Fetches the details of a specific transaction.
 
     Args:
         transaction_id: The ID of the transaction to fetch.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.fetch_transaction(transaction_id)
+    return await clients.get(tenant).fetch_transaction(transaction_id)
 
 
 @mcp.tool(name="transaction.timeline")
-def get_transaction_timeline(transaction_id_or_reference: str):
+@shaped
+async def get_transaction_timeline(
+    transaction_id_or_reference: str, tenant: str | None = None
+):
     """
     Retrieves the timeline of a specific transaction.
 
     Args:
         transaction_id_or_reference: The ID/Reference of the transaction to get the timeline for.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.get_transaction_timeline(transaction_id_or_reference)
+    return await clients.get(tenant).get_transaction_timeline(
+        transaction_id_or_reference
+    )
+
+
+async def export_records(records, ctx: Context | None, chunk_size: int) -> dict:
+    """Write an export to the export store, reporting progress per chunk."""
+
+    async def on_chunk(chunks, count):
+        if ctx is not None:
+            await ctx.report_progress(count, None, f"{count} records exported")
+
+    manifest = await exports.write(records, chunk_size, on_chunk)
+    return {"status": True, "message": "Export ready", **manifest}
 
 
 @mcp.tool(name="transaction.download")
-def download_transactions(
+@shaped
+async def download_transactions(
     per_page: int | None = 50,
     page: int | None = 1,
     from_date: str | None = None,
     to_date: str | None = None,
+    all_pages: bool = False,
+    max_workers: int = 8,
+    chunk_size: int = 500,
+    ctx: Context = None,
+    tenant: str | None = None,
 ):
     """
     Downloads a list of transactions with optional filters.
@@ -228,12 +461,29 @@ def download_transactions(
         page: The page number to retrieve (default is 1).
         from_date: The start date for filtering transactions (optional, format: 'YYYY-MM-DD').
         to_date: The end date for filtering transactions (optional, format: 'YYYY-MM-DD').
-    """
-    return paystack_client.download_transactions(per_page, page, from_date, to_date)
+        all_pages: Export every page instead of one, ignoring `page`. The records are stored in chunks read from the `paystack://exports/{export_id}/{chunk}` resource, and a summary pointing at the first chunk is returned (default is False).
+        max_workers: Maximum number of pages fetched ahead when `all_pages` is set (default is 8).
+        chunk_size: Number of records per export chunk when `all_pages` is set (default is 500).
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
+    """
+    if all_pages:
+        records = clients.get(tenant).iter_transaction_export(
+            per_page, from_date, to_date, prefetch=max_workers
+        )
+        return await export_records(records, ctx, chunk_size)
+    return await clients.get(tenant).download_transactions(
+        per_page, page, from_date, to_date
+    )
 
 
 @mcp.tool(name="refund.create")
-def create_refund(transaction: str, amount: int | None = None):
+@shaped
+async def create_refund(
+    transaction: str,
+    amount: int | None = None,
+    idempotency_key: str | None = None,
+    tenant: str | None = None,
+):
     """
     Creates a new refund.
 
@@ -241,55 +491,111 @@ def create_refund(transaction: str, amount: int | None = None):
         transaction: The transaction reference or ID to refund.
         amount: The amount to refund in the smallest currency unit (e.g., kobo).
                 If not provided, a full refund will be issued.
+        idempotency_key: A unique key for this operation (optional). Repeating a call with the same key returns the original result instead of creating a duplicate.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
+    """
+    return await clients.get(tenant).create_refund(transaction, amount, idempotency_key)
+
+
+@mcp.tool(name="refund.bulk_create")
+@shaped(records="ledger")
+async def bulk_create_refunds(
+    refunds: list[tuple[str, int | None]],
+    ctx: Context,
+    dry_run: bool = False,
+    max_workers: int = 8,
+    idempotency_key: str | None = None,
+    tenant: str | None = None,
+):
+    """
+    Creates many refunds at once, after checking that none would refund more than was paid.
+
+    Each transaction is looked up first. A refund is rejected when the transaction was not successful or when, together with its earlier refunds and earlier entries in this batch, it exceeds the amount paid. The remaining refunds are issued concurrently and a ledger entry is returned for every requested refund.
+
+    Args:
+        refunds: (transaction, amount) pairs. The transaction is a reference or ID; the amount is in the smallest currency unit (e.g., kobo), or null to refund whatever is left.
+        dry_run: Only validate and report what would be refunded (default is False).
+        max_workers: Maximum number of requests made at once (default is 8).
+        idempotency_key: A unique key for this batch (optional, derived from the refunds when not given). Submitting the batch again with the same key does not refund twice.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.create_refund(transaction, amount)
+
+    async def on_progress(done, total, entry, outcome):
+        status = "refunded" if outcome["ok"] else f"failed: {outcome['error']}"
+        await ctx.report_progress(done, total, f"{entry['transaction']} {status}")
+
+    ledger = await bulk_refund(
+        clients.get(tenant), refunds, dry_run, max_workers, idempotency_key, on_progress
+    )
+    counts = {}
+    for entry in ledger:
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+    return {"dry_run": dry_run, "total": len(ledger), **counts, "ledger": ledger}
 
 
 @mcp.tool(name="subscription.list")
-def list_subscriptions():
+@shaped
+async def list_subscriptions(tenant: str | None = None):
     """
     Retrieves a list of all subscriptions.
+
+    Args:
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.list_subscriptions()
+    return await clients.get(tenant).list_subscriptions()
 
 
 @mcp.tool(name="subscription.disable")
-def disable_subscription(code: str, token: str):
+@shaped
+async def disable_subscription(code: str, token: str, tenant: str | None = None):
     """
     Disables a subscription.
 
     Args:
         code: The subscription code.
         token: The email token of the customer.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.disable_subscription(code, token)
+    return await clients.get(tenant).disable_subscription(code, token)
 
 
 @mcp.tool(name="dispute.list")
-def list_disputes():
+@shaped
+async def list_disputes(tenant: str | None = None):
     """
     Retrieves a list of all disputes.
+
+    Args:
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.list_disputes()
+    return await clients.get(tenant).list_disputes()
 
 
 @mcp.tool(name="dispute.read")
-def fetch_dispute(dispute_id: str):
+@shaped
+async def fetch_dispute(dispute_id: str, tenant: str | None = None):
     """
     Fetches the details of a specific dispute.
 
     Args:
         dispute_id: The ID of the dispute to fetch.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.fetch_dispute(dispute_id)
+    return await clients.get(tenant).fetch_dispute(dispute_id)
 
 
 @mcp.tool(name="dispute.download")
-def download_dispute(
+@shaped
+async def download_dispute(
     per_page: int | None = 50,
     page: int | None = 1,
     from_date: str | None = None,
     to_date: str | None = None,
+    all_pages: bool = False,
+    max_workers: int = 8,
+    chunk_size: int = 500,
+    ctx: Context = None,
+    tenant: str | None = None,
 ):
     """
     Downloads a list of dispute with optional filters.
@@ -299,18 +605,31 @@ def download_dispute(
         page: The page number to retrieve (default is 1).
         from_date: The start date for filtering dispute (optional, format: 'YYYY-MM-DD').
         to_date: The end date for filtering dispute (optional, format: 'YYYY-MM-DD').
-    """
-    return paystack_client.download_dispute(per_page, page, from_date, to_date)
+        all_pages: Export every page instead of one, ignoring `page`. The records are stored in chunks read from the `paystack://exports/{export_id}/{chunk}` resource, and a summary pointing at the first chunk is returned (default is False).
+        max_workers: Maximum number of pages fetched ahead when `all_pages` is set (default is 8).
+        chunk_size: Number of records per export chunk when `all_pages` is set (default is 500).
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
+    """
+    if all_pages:
+        records = clients.get(tenant).iter_dispute_export(
+            per_page, from_date, to_date, prefetch=max_workers
+        )
+        return await export_records(records, ctx, chunk_size)
+    return await clients.get(tenant).download_dispute(
+        per_page, page, from_date, to_date
+    )
 
 
 @mcp.tool(name="dispute.resolve")
-def resolve_dispute(
+@shaped
+async def resolve_dispute(
     dispute_id: str,
     resolution: str,
     message: str,
     refund_amount: str,
     uploaded_filename: str,
     evidence: str | None = None,
+    tenant: str | None = None,
 ):
     """
     Resolves a dispute.
@@ -322,20 +641,22 @@ def resolve_dispute(
         refund_amount: 'refund_amount_example' # str | The amount to refund, in kobo if currency is NGN, pesewas, if currency is GHS, and cents, if currency is ZAR
         uploaded_filename: 'uploaded_filename_example' # str | Filename of attachment returned via response from the Dispute upload URL
         evidence: 'evidence_example' # str | Evidence Id for fraud claims (optional)
-
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.resolve_dispute(
+    return await clients.get(tenant).resolve_dispute(
         dispute_id, resolution, message, refund_amount, uploaded_filename, evidence
     )
 
 
 @mcp.tool(name="dispute.add_evidence")
-def add_evidence_to_dispute(
+@shaped
+async def add_evidence_to_dispute(
     dispute_id: str,
     customer_email: str,
     customer_name: str,
     customer_phone: str,
     service_details: str,
+    tenant: str | None = None,
 ):
     """
     Adds evidence to a dispute.
@@ -346,49 +667,60 @@ def add_evidence_to_dispute(
         customer_name: The name of the customer.
         customer_phone: The phone number of the customer.
         service_details: Details of the service provided.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.add_evidence_to_dispute(
+    return await clients.get(tenant).add_evidence_to_dispute(
         dispute_id, customer_email, customer_name, customer_phone, service_details
     )
 
 
 @mcp.tool(name="payment_page.create")
-def create_payment_page(name: str, amount: int):
+@shaped
+async def create_payment_page(name: str, amount: int, tenant: str | None = None):
     """
     Creates a new payment page.
 
     Args:
         name: The name of the payment page.
         amount: The amount for the payment page in the smallest currency unit (e.g., kobo).
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.create_payment_page(name, amount)
+    return await clients.get(tenant).create_payment_page(name, amount)
 
 
 @mcp.tool(name="payment_page.list")
-def list_payment_pages():
+@shaped
+async def list_payment_pages(tenant: str | None = None):
     """
     Retrieves a list of all payment pages.
+
+    Args:
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.list_payment_pages()
+    return await clients.get(tenant).list_payment_pages()
 
 
 @mcp.tool(name="payment_page.read")
-def fetch_payment_page(id: str):
+@shaped
+async def fetch_payment_page(id: str, tenant: str | None = None):
     """
     Fetches the details of a specific payment page.
 
     Args:
         id: The id of the payment page to fetch.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.fetch_payment_page(id)
+    return await clients.get(tenant).fetch_payment_page(id)
 
 
 @mcp.tool(name="payment_page.update")
-def update_payment_page(
+@shaped
+async def update_payment_page(
     id: str,
     name: str | None = None,
     description: str | None = None,
     amount: int | None = None,
+    tenant: str | None = None,
 ):
     """
     Updates the details of a specific payment page.
@@ -397,43 +729,59 @@ def update_payment_page(
         name: The new name of the payment page (optional).
         description: The new description of the payment page (optional).
         amount: The new amount for the payment page in the smallest currency unit (e.g., kobo) (optional).
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.update_payment_page(id, name, description, amount)
+    return await clients.get(tenant).update_payment_page(id, name, description, amount)
 
 
 @mcp.tool(name="payment_page.disable")
-def disable_payment_page(id: str):
+@shaped
+async def disable_payment_page(id: str, tenant: str | None = None):
     """
     Disables a specific payment page.
     Args:
         id: The id of the payment page to disable.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.disable_payment_page(id)
+    return await clients.get(tenant).disable_payment_page(id)
 
 
 @mcp.tool(name="payment_page.enable")
-def enable_payment_page(id: str):
+@shaped
+async def enable_payment_page(id: str, tenant: str | None = None):
     """
     Enables a specific payment page.
     Args:
         id: The id of the payment page to enable.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.enable_payment_page(id)
+    return await clients.get(tenant).enable_payment_page(id)
 
 
 @mcp.tool(name="payment_page.add_products")
-def add_products_to_payment_page(id: str, products: list[str]):
+@shaped
+async def add_products_to_payment_page(
+    id: str, products: list[str], tenant: str | None = None
+):
     """
     Adds products to a specific payment page.
     Args:
         id: The id of the payment page to add products to.
         products: A list of product codes to add to the payment page.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.add_products_to_payment_page(id, products)
+    return await clients.get(tenant).add_products_to_payment_page(id, products)
 
 
 @mcp.tool(name="plan.create")
-def create_plan(name: str, amount: int, interval: str):
+@shaped
+async def create_plan(
+    name: str,
+    amount: int,
+    interval: str,
+    idempotency_key: str | None = None,
+    tenant: str | None = None,
+):
     """
     Creates a new subscription plan.
 
@@ -441,31 +789,42 @@ def create_plan(name: str, amount: int, interval: str):
         name: The name of the plan.
         amount: The amount for the plan in the smallest currency unit (e.g., kobo).
         interval: The frequency of the plan (e.g., 'daily', 'weekly', 'monthly').
+        idempotency_key: A unique key for this operation (optional). Repeating a call with the same key returns the original result instead of creating a duplicate.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.create_plan(name, amount, interval)
+    return await clients.get(tenant).create_plan(
+        name, amount, interval, idempotency_key
+    )
 
 
 @mcp.tool(name="plan.list")
-def list_plans():
+@shaped
+async def list_plans(tenant: str | None = None):
     """
     Retrieves a list of all subscription plans.
+
+    Args:
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.list_plans()
+    return await clients.get(tenant).list_plans()
 
 
 @mcp.tool(name="plan.read")
-def fetch_plan(plan_code: str):
+@shaped
+async def fetch_plan(plan_code: str, tenant: str | None = None):
     """
     Fetches the details of a specific subscription plan.
 
     Args:
         plan_code: The code of the plan to fetch.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.fetch_plan(plan_code)
+    return await clients.get(tenant).fetch_plan(plan_code)
 
 
 @mcp.tool(name="verification.fetch_banks")
-def fetch_banks(
+@shaped
+async def fetch_banks(
     country: str | None = None,
     pay_with_bank_transfer: bool | None = None,
     use_cursor: bool | None = None,
@@ -473,6 +832,7 @@ def fetch_banks(
     next: str | None = None,
     previous: str | None = None,
     gateway: str | None = None,
+    tenant: str | None = None,
 ):
     """
     Fetches a list of banks.
@@ -485,50 +845,146 @@ def fetch_banks(
         next: The cursor for the next page (optional).
         previous: The cursor for the previous page (optional).
         gateway: Filter banks by payment gateway (optional).
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.fetch_banks(
+    return await clients.get(tenant).fetch_banks(
         country, pay_with_bank_transfer, use_cursor, per_page, next, previous, gateway
     )
 
 
 @mcp.tool(name="verification.list_avs")
-def list_avs(country: str, type: str | None = None, currency: str | None = None):
+@shaped
+async def list_avs(
+    country: str,
+    type: str | None = None,
+    currency: str | None = None,
+    tenant: str | None = None,
+):
     """
     Lists all available account verification services.
     Args:
         country: The country code to filter by.
         type: The type of verification service to filter by (optional).
         currency: The currency code to filter by (optional).
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.list_avs(type, country, currency)
+    return await clients.get(tenant).list_avs(country, type, currency)
 
 
 @mcp.tool(name="verification.list_countries")
-def list_countries():
+@shaped
+async def list_countries(tenant: str | None = None):
     """
     Retrieves a list of all countries.
+
+    Args:
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.list_countries()
+    return await clients.get(tenant).list_countries()
 
 
 @mcp.tool(name="verification.resolve_account_number")
-def resolve_account_number(account_number: str, bank_code: str):
+@shaped
+async def resolve_account_number(
+    account_number: str, bank_code: str, tenant: str | None = None
+):
     """
     Resolves an account number to get the account holder's name.
 
     Args:
         account_number: The account number to resolve.
         bank_code: The bank code of the account's bank.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
     """
-    return paystack_client.resolve_account_number(account_number, bank_code)
+    return await clients.get(tenant).resolve_account_number(account_number, bank_code)
 
 
 @mcp.tool(name="verification.resolve_card_bin")
-def resolve_card_bin(card_bin: str):
+@shaped
+async def resolve_card_bin(card_bin: str, tenant: str | None = None):
     """
     Resolves a card BIN to get the associated card details.
 
     Args:
         card_bin: The card BIN to resolve.
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
+    """
+    return await clients.get(tenant).resolve_card_bin(card_bin)
+
+
+@mcp.tool(name="mirror.sync")
+@shaped
+async def update_mirror(resources: list[str] | None = None, tenant: str | None = None):
+    """
+    Copies new and recently changed records from Paystack into the local mirror.
+
+    Requires PAYSTACK_MIRROR_DB to be set. The first sync downloads the full history; later ones only fetch records created since the previous sync.
+
+    Args:
+        resources: Which of transactions, customers, disputes and subscriptions to sync (optional, defaults to all).
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
+    """
+    return await sync_mirror(clients.get(tenant), resources)
+
+
+@mcp.tool(name="mirror.status")
+@shaped
+async def mirror_status(tenant: str | None = None):
     """
-    return paystack_client.resolve_card_bin(card_bin)
+    Shows how many records the local mirror holds and when each resource was last synced.
+
+    Args:
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
+    """
+    return require_mirror(clients.get(tenant)).status()
+
+
+@mcp.tool(name="mirror.query")
+@shaped
+async def query_mirror(
+    resource: str,
+    status: str | None = None,
+    currency: str | None = None,
+    channel: str | None = None,
+    customer: str | None = None,
+    reference: str | None = None,
+    from_date: str | None = None,
+    to_date: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+    tenant: str | None = None,
+):
+    """
+    Searches records in the local mirror, newest first, without calling Paystack.
+
+    Run mirror.sync first to bring the mirror up to date. Only filters that apply to the resource may be given.
+
+    Args:
+        resource: One of transactions, customers, disputes or subscriptions.
+        status: Only records with this status (optional).
+        currency: Only records in this currency, e.g. NGN (optional).
+        channel: Only transactions paid through this channel, e.g. card (optional).
+        customer: Only records of this customer code (optional).
+        reference: Only records with this transaction reference (optional).
+        from_date: The start date for filtering records (optional, format: 'YYYY-MM-DD').
+        to_date: The end date for filtering records, inclusive (optional, format: 'YYYY-MM-DD').
+        limit: Maximum number of records to return (default is 50).
+        offset: Number of matching records to skip (default is 0).
+        tenant: The merchant account to act for (optional, defaults to the account set by PAYSTACK_API_KEY).
+    """
+    filters = {
+        "status": status,
+        "currency": currency,
+        "channel": channel,
+        "customer": customer,
+        "reference": reference,
+    }
+    mirror = require_mirror(clients.get(tenant))
+    return mirror.query(
+        resource,
+        {column: value for column, value in filters.items() if value is not None},
+        from_date,
+        to_date,
+        limit,
+        offset,
+    )
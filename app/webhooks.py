@@ -0,0 +1,204 @@
+import asyncio
+import functools
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from app.registry import DEFAULT_TENANT, UnknownTenantError, clients
+from app.server import mcp
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "x-paystack-signature"
+
+# Seconds a pushed record answers reads before Paystack is asked again.
+DEFAULT_PUSH_TTL = 5 * 60
+
+# Pushed records are written to the mirror, and the event log synced to
+# disk, at most this often.
+FLUSH_INTERVAL = 0.5
+
+# Event name prefixes, most specific first, mapped to the read a pushed
+# record answers (the endpoint, the record field identifying it and the
+# message Paystack would send) and the mirror table it belongs in.
+EVENT_TARGETS = (
+    ("charge.dispute.", ("fetch_dispute", "id", "Dispute retrieved"), "disputes"),
+    (
+        "charge.",
+        ("verify_transaction", "reference", "Verification successful"),
+        "transactions",
+    ),
+    ("subscription.", None, "subscriptions"),
+)
+
+
+def verify_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    """Check a webhook body against its ``x-paystack-signature`` header.
+
+    Paystack signs the raw body with HMAC-SHA512 keyed by the secret key.
+    """
+    expected = hmac.new(secret.encode(), body, hashlib.sha512).hexdigest()
+    return hmac.compare_digest(expected, signature or "")
+
+
+class EventLog:
+    """An append-only JSON Lines log of received webhook events.
+
+    Each line holds the tenant, the time of receipt and the event exactly as
+    Paystack sent it. Lines are written as events arrive and synced to disk
+    in batches, so a burst of events costs one ``fsync`` per batch. Each line
+    is a single unbuffered write to an ``O_APPEND`` descriptor, so worker
+    processes sharing the log never interleave parts of their lines.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+        self._lock = threading.Lock()
+        self._unsynced = False
+
+    def append(self, tenant: str, body: bytes):
+        # Raw newlines in JSON can only be whitespace, so this keeps the
+        # event on one line without decoding and re-encoding it.
+        line = b'{"tenant":%s,"received_at":%.3f,"event":%s}\n' % (
+            json.dumps(tenant).encode(),
+            time.time(),
+            body.replace(b"\r", b" ").replace(b"\n", b" "),
+        )
+        with self._lock:
+            if self._fd is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._fd = os.open(
+                    self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+                )
+            os.write(self._fd, line)
+            self._unsynced = True
+
+    def sync(self):
+        with self._lock:
+            if self._fd is not None and self._unsynced:
+                os.fsync(self._fd)
+                self._unsynced = False
+
+    def close(self):
+        self.sync()
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+class WebhookReceiver:
+    """Verify, log and apply Paystack webhook events.
+
+    A verified event is logged, and the record it carries is put in the
+    tenant's response cache straight away, so ``transaction.verify`` and
+    ``dispute.read`` answer from it without calling Paystack. Records are
+    also queued for the tenant's mirror, which is written in batches.
+    """
+
+    def __init__(self, clients, log: EventLog, ttl: float = DEFAULT_PUSH_TTL):
+        self.clients = clients
+        self.log = log
+        self.ttl = ttl
+        self._pending: dict[str, dict[str, list[dict]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        self._flush_scheduled = False
+
+    @classmethod
+    def from_env(cls, clients) -> "WebhookReceiver":
+        return cls(
+            clients,
+            EventLog(os.environ["PAYSTACK_WEBHOOK_LOG"]),
+            float(os.environ.get("PAYSTACK_WEBHOOK_TTL", DEFAULT_PUSH_TTL)),
+        )
+
+    def receive(self, tenant: str | None, body: bytes, signature: str | None) -> int:
+        """Handle one delivery and return the HTTP status to answer with."""
+        try:
+            client = self.clients.get(tenant)
+        except UnknownTenantError:
+            return 404
+        if not verify_signature(client.api_key, body, signature):
+            return 401
+        try:
+            event = json.loads(body)
+        except ValueError:
+            return 400
+        if not isinstance(event, dict):
+            return 400
+        self.log.append(tenant or DEFAULT_TENANT, body)
+        self.apply(client, event)
+        self._schedule_flush()
+        return 200
+
+    def apply(self, client, event: dict):
+        """Put the record an event carries in the cache and mirror queue."""
+        name = event.get("event") or ""
+        data = event.get("data")
+        if not isinstance(data, dict):
+            return
+        for prefix, read, table in EVENT_TARGETS:
+            if not name.startswith(prefix):
+                continue
+            if read is not None:
+                endpoint, field, message = read
+                if data.get(field) is not None:
+                    response = {"status": True, "message": message, "data": data}
+                    key = (endpoint, str(data[field]))
+                    client.cache.set(key, response, self.ttl)
+            if client.mirror is not None and data.get("id") is not None:
+                self._pending[client.tenant][table].append(data)
+            return
+
+    def _schedule_flush(self):
+        if self._flush_scheduled:
+            return
+        self._flush_scheduled = True
+        try:
+            asyncio.get_running_loop().call_later(FLUSH_INTERVAL, self.flush)
+        except RuntimeError:
+            # Not running in an event loop; write everything now.
+            self.flush()
+
+    def flush(self):
+        """Write queued records to the mirrors and sync the event log."""
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, defaultdict(lambda: defaultdict(list))
+        active = self.clients.active()
+        for tenant, tables in pending.items():
+            mirror = getattr(active.get(tenant), "mirror", None)
+            if mirror is None:
+                continue
+            for table, records in tables.items():
+                try:
+                    mirror.upsert(table, records)
+                except Exception:
+                    logger.exception("Writing pushed %s to the mirror failed", table)
+        self.log.sync()
+
+
+@functools.cache
+def receiver() -> WebhookReceiver:
+    return WebhookReceiver.from_env(clients)
+
+
+@mcp.custom_route("/webhooks/paystack", methods=["POST"])
+@mcp.custom_route("/webhooks/paystack/{tenant}", methods=["POST"])
+async def paystack_webhook(request: Request) -> JSONResponse:
+    """Receive Paystack events for the default tenant or the one in the path."""
+    status = receiver().receive(
+        request.path_params.get("tenant"),
+        await request.body(),
+        request.headers.get(SIGNATURE_HEADER),
+    )
+    return JSONResponse({"received": status == 200}, status_code=status)
@@ -0,0 +1,163 @@
+"""A local stand-in for the Paystack API, for benchmarks.
+
+Answers every endpoint the MCP server calls with generated records, after a
+configurable delay, failing a configurable share of requests with a 500 so
+the client's retries are exercised. List endpoints are paginated over
+``--records`` records::
+
+    python benchmarks/fake_paystack.py --port 8900 --latency 40 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import random
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+# GET paths answered with a page of records rather than a single record.
+LIST_PATHS = frozenset(
+    {
+        "/address_verification/states",
+        "/balance",
+        "/balance/ledger",
+        "/bank",
+        "/country",
+        "/customer",
+        "/dispute",
+        "/dispute/export",
+        "/page",
+        "/paymentrequest",
+        "/plan",
+        "/product",
+        "/refund",
+        "/subscription",
+        "/transaction",
+        "/transaction/export",
+    }
+)
+
+# Refund lists are per transaction and kept short, so refunds validate.
+SHORT_LISTS = {"/refund": 0}
+
+
+def make_record(index: int) -> dict:
+    """Return a record with the fields every tool reads from responses."""
+    return {
+        "id": index,
+        "reference": f"ref_{index}",
+        "status": "success",
+        "amount": 10_000 + index,
+        "currency": "NGN",
+        "channel": "card" if index % 3 else "bank",
+        "created_at": f"2026-01-{index % 28 + 1:02d}T10:00:00.000Z",
+        "email": f"customer{index}@example.com",
+        "customer_code": f"CUS_{index}",
+        "customer": {
+            "id": index,
+            "email": f"customer{index}@example.com",
+            "customer_code": f"CUS_{index}",
+        },
+        "authorization": {
+            "authorization_code": f"AUTH_{index}",
+            "bin": "408408",
+            "last4": "4081",
+            "card_type": "visa",
+        },
+        "log": {"time_spent": 9, "attempts": 1, "history": []},
+    }
+
+
+def create_app(
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    records: int = 1000,
+    seed: int | None = None,
+) -> Starlette:
+    """Build the stand-in; ``latency`` and ``jitter`` are in seconds."""
+    rng = random.Random(seed)
+
+    async def handle(request: Request) -> JSONResponse:
+        delay = latency + rng.uniform(-jitter, jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if rng.random() < error_rate:
+            return JSONResponse(
+                {"status": False, "message": "Simulated failure"}, status_code=500
+            )
+
+        path = "/" + request.path_params["path"].strip("/")
+        if request.method == "GET" and path in LIST_PATHS:
+            per_page = int(request.query_params.get("perPage") or 50)
+            page = int(request.query_params.get("page") or 1)
+            total = SHORT_LISTS.get(path, records)
+            start = (page - 1) * per_page
+            data = [
+                make_record(index)
+                for index in range(start, min(start + per_page, total))
+            ]
+            return JSONResponse(
+                {
+                    "status": True,
+                    "message": "Records retrieved",
+                    "data": data,
+                    "meta": {
+                        "total": total,
+                        "page": page,
+                        "perPage": per_page,
+                        "pageCount": max(-(-total // per_page), 1),
+                    },
+                }
+            )
+
+        record = make_record(rng.randrange(records or 1))
+        if request.method != "GET":
+            body = await request.body()
+            if body:
+                record.update(await request.json())
+        return JSONResponse({"status": True, "message": "Success", "data": record})
+
+    return Starlette(
+        routes=[Route("/{path:path}", handle, methods=["GET", "POST", "PUT", "DELETE"])]
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Mean response delay in ms."
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Uniform +/- delay jitter in ms."
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of requests failing."
+    )
+    parser.add_argument(
+        "--records", type=int, default=1000, help="Records behind each list."
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    import uvicorn
+
+    args = parse_args(argv)
+    app = create_app(
+        args.latency / 1000,
+        args.jitter / 1000,
+        args.error_rate,
+        args.records,
+        args.seed,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measure how long the MCP server takes to import.
+
+Runs ``python -X importtime -c "import main"`` in fresh interpreters without
+any Paystack credentials, then reports the median wall time and the modules
+with the largest cumulative import time::
+
+    python benchmarks/startup.py --runs 5 --top 15
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that should only be imported once a tool is actually called.
+DEFERRED_MODULES = ("paystack",)
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_once(module: str) -> tuple[float, list[tuple[str, int, int, int]]]:
+    """Import ``module`` in a new interpreter; return wall time and import rows."""
+    env = {
+        name: value
+        for name, value in os.environ.items()
+        if not name.startswith("PAYSTACK_")
+    }
+    started = time.perf_counter()
+    try:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError as exc:
+        raise SystemExit(f"importing {module} failed:\n{exc.stderr}") from None
+    elapsed = time.perf_counter() - started
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            rows.append((name, int(own), int(cumulative), len(indent)))
+    return elapsed, rows
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    timings = []
+    for _ in range(args.runs):
+        elapsed, rows = run_once(args.module)
+        timings.append(elapsed)
+
+    print(f"import {args.module}: median {statistics.median(timings) * 1000:.0f} ms")
+    print(f"  runs: {', '.join(f'{t * 1000:.0f}' for t in timings)} ms")
+    print()
+    print(f"{'cumulative (ms)':>16} {'self (ms)':>10}  module")
+    for name, own, cumulative, _ in sorted(rows, key=lambda row: -row[2])[: args.top]:
+        print(f"{cumulative / 1000:16.1f} {own / 1000:10.1f}  {name}")
+
+    imported = {name for name, *_ in rows}
+    eager = [name for name in DEFERRED_MODULES if name in imported]
+    print()
+    if eager:
+        print(f"imported at startup but should be deferred: {', '.join(eager)}")
+        raise SystemExit(1)
+    print(f"deferred until first use: {', '.join(DEFERRED_MODULES)}")
+
+
+if __name__ == "__main__":
+    main()
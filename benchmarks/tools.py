@@ -0,0 +1,356 @@
+"""Benchmark every MCP tool against a local Paystack stand-in.
+
+Starts ``benchmarks/fake_paystack.py`` and the MCP server (over stdio, the
+streamable HTTP transport, or both), calls every tool the server lists
+through a real MCP client session at each concurrency level, and reports
+p50/p95/p99 latency, calls per second and the server's peak RSS. Results
+are written to a JSON file; pass an earlier one with ``--compare`` to see
+what changed::
+
+    python benchmarks/tools.py --transport stdio http --concurrency 1 8 32 \\
+        --calls 50 --latency 40 --error-rate 0.01 --output after.json \\
+        --compare before.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TRANSPORTS = ("stdio", "http")
+
+# Arguments for tools whose required arguments cannot be made up from their
+# types alone. Every other tool gets placeholder values (see tool_arguments).
+TOOL_ARGUMENTS = {
+    "customer.bulk_upsert": {
+        "customers": "email,first_name\n"
+        + "".join(f"bench{index}@example.com,Bench\n" for index in range(20))
+    },
+    "mirror.query": {"resource": "transactions"},
+    "refund.bulk_create": {"refunds": [["ref_1", 100], ["ref_2", None]]},
+    "transaction.aggregate": {"group_by": ["currency", "channel"]},
+    "transaction.download": {"all_pages": True, "per_page": 100},
+    "transaction.verify_many": {"references": [f"ref_{i}" for i in range(10)]},
+}
+
+# Placeholder values by JSON schema type.
+PLACEHOLDERS = {
+    "string": "bench_1",
+    "integer": 1000,
+    "number": 1000,
+    "boolean": False,
+}
+
+
+def tool_arguments(tool) -> dict:
+    """Return arguments for a tool call, filling required ones by type."""
+    if tool.name in TOOL_ARGUMENTS:
+        return TOOL_ARGUMENTS[tool.name]
+    properties = tool.inputSchema.get("properties", {})
+    arguments = {}
+    for name in tool.inputSchema.get("required", []):
+        schema = properties[name]
+        if schema.get("type") == "array":
+            item = schema.get("items", {}).get("type", "string")
+            arguments[name] = [PLACEHOLDERS.get(item, "bench_1")]
+        else:
+            arguments[name] = PLACEHOLDERS.get(schema.get("type"), "bench_1")
+    return arguments
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"{' '.join(process.args)} exited early")
+        with contextlib.suppress(OSError):
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        time.sleep(0.1)
+    raise SystemExit(f"nothing listening on port {port} after {timeout}s")
+
+
+@contextlib.contextmanager
+def running(args: list[str], port: int, env: dict | None = None, log=None):
+    """Run a server process, its output going to ``log``, until the block exits."""
+    process = subprocess.Popen(
+        args, cwd=ROOT, env=env, stdout=log, stderr=log or subprocess.DEVNULL
+    )
+    try:
+        wait_for_port(port, process)
+        yield process
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def peak_rss_kb(pid: int) -> int | None:
+    """Return a process's peak resident set size, where /proc is available."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def child_pid(command: str) -> int | None:
+    """Find the pid of this process's child running ``command``."""
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                ppid = int(stat.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{entry}/cmdline", "rb") as cmdline:
+                args = cmdline.read().decode(errors="replace")
+        except (OSError, ValueError, IndexError):
+            continue
+        if ppid == os.getpid() and command in args:
+            return int(entry)
+    return None
+
+
+@contextlib.asynccontextmanager
+async def connect(transport: str, env: dict, workers: int, log):
+    """Open an MCP session with a fresh server; yield it and the server's pid."""
+    if transport == "stdio":
+        params = StdioServerParameters(
+            command=sys.executable, args=["main.py"], env=env, cwd=ROOT
+        )
+        async with (
+            stdio_client(params, errlog=log) as (read, write),
+            ClientSession(read, write) as session,
+        ):
+            await session.initialize()
+            yield session, child_pid("main.py")
+        return
+
+    port = free_port()
+    args = [sys.executable, "main.py", "--transport", "streamable-http"]
+    args += ["--port", str(port), "--workers", str(workers)]
+    with running(args, port, env, log) as process:
+        url = f"http://127.0.0.1:{port}/mcp"
+        async with (
+            streamablehttp_client(url) as (read, write, _),
+            ClientSession(read, write) as session,
+        ):
+            await session.initialize()
+            yield session, process.pid
+
+
+def percentile(ordered: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(int(-(-p * len(ordered) // 100)), 1)
+    return ordered[rank - 1]
+
+
+async def drive(
+    session: ClientSession, name: str, arguments: dict, calls: int, concurrency: int
+) -> dict:
+    """Call one tool ``calls`` times with ``concurrency`` calls in flight."""
+    latencies = []
+    errors = 0
+    remaining = iter(range(calls))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                result = await session.call_tool(name, arguments)
+                failed = result.isError
+            except (McpError, httpx.HTTPError, OSError):
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    async with asyncio.TaskGroup() as group:
+        for _ in range(min(concurrency, calls)):
+            group.create_task(worker())
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "tool": name,
+        "calls": calls,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "calls_per_sec": round(calls / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+async def run_transport(transport: str, args, env: dict, log) -> dict:
+    """Benchmark every tool over one transport at each concurrency level."""
+    async with connect(transport, env, args.workers, log) as (session, pid):
+        tools = (await session.list_tools()).tools
+        if args.tools:
+            tools = [tool for tool in tools if tool.name in args.tools]
+        # One warm-up call each; syncing first gives the mirror tools data.
+        await session.call_tool("mirror.sync", {})
+        for tool in tools:
+            await session.call_tool(tool.name, tool_arguments(tool))
+
+        runs = []
+        for concurrency in args.concurrency:
+            for tool in tools:
+                result = await drive(
+                    session, tool.name, tool_arguments(tool), args.calls, concurrency
+                )
+                result.update(transport=transport, concurrency=concurrency)
+                runs.append(result)
+                print(
+                    f"{transport:>5} c={concurrency:<3} {tool.name:<38}"
+                    f" p50 {result['p50_ms']:8.1f} ms  p95 {result['p95_ms']:8.1f} ms"
+                    f"  p99 {result['p99_ms']:8.1f} ms"
+                    f"  {result['calls_per_sec']:8.1f}/s"
+                    + (f"  {result['errors']} errors" if result["errors"] else "")
+                )
+        return {"runs": runs, "server_peak_rss_kb": peak_rss_kb(pid) if pid else None}
+
+
+def git_commit() -> str | None:
+    result = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return result.stdout.strip() or None
+
+
+def compare(previous: dict, current: dict):
+    """Print how p95 latency and throughput moved since ``previous``."""
+    before = {
+        (run["transport"], run["concurrency"], run["tool"]): run
+        for run in previous["runs"]
+    }
+    print(f"\ncompared with {previous.get('commit') or 'previous run'}:")
+    for run in current["runs"]:
+        old = before.get((run["transport"], run["concurrency"], run["tool"]))
+        if old is None or not old["p95_ms"] or not old["calls_per_sec"]:
+            continue
+        p95 = run["p95_ms"] / old["p95_ms"] - 1
+        rate = run["calls_per_sec"] / old["calls_per_sec"] - 1
+        print(
+            f"{run['transport']:>5} c={run['concurrency']:<3} {run['tool']:<38}"
+            f" p95 {p95:+7.1%}  calls/s {rate:+7.1%}"
+        )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--transport", nargs="+", choices=TRANSPORTS, default=TRANSPORTS
+    )
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8])
+    parser.add_argument(
+        "--calls", type=int, default=20, help="Calls per tool and level."
+    )
+    parser.add_argument("--tools", nargs="*", help="Only these tools (default: all).")
+    parser.add_argument("--workers", type=int, default=1, help="HTTP server workers.")
+    parser.add_argument(
+        "--latency", type=float, default=20.0, help="Paystack delay in ms."
+    )
+    parser.add_argument("--jitter", type=float, default=5.0, help="Delay jitter in ms.")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--records", type=int, default=500, help="Records per list.")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", help="An earlier results file to compare with.")
+    parser.add_argument("--verbose", action="store_true", help="Show server logs.")
+    return parser.parse_args(argv)
+
+
+async def run(args, log) -> dict:
+    port = free_port()
+    fake = [sys.executable, "benchmarks/fake_paystack.py", "--port", str(port)]
+    fake += ["--latency", str(args.latency), "--jitter", str(args.jitter)]
+    fake += ["--error-rate", str(args.error_rate), "--records", str(args.records)]
+
+    with tempfile.TemporaryDirectory() as scratch, running(fake, port, log=log):
+        env = {
+            **{k: v for k, v in os.environ.items() if not k.startswith("PAYSTACK_")},
+            "PAYSTACK_API_KEY": "sk_test_benchmark",
+            "PAYSTACK_BASE_URL": f"http://127.0.0.1:{port}",
+            "PAYSTACK_MIRROR_DB": os.path.join(scratch, "mirror.db"),
+            "PAYSTACK_EXPORT_DIR": os.path.join(scratch, "exports"),
+            # Measure the server, not the client-side rate limiter.
+            "PAYSTACK_RATE_LIMIT": "100000",
+        }
+        results = {}
+        for transport in args.transport:
+            results[transport] = await run_transport(
+                transport, args, env, log or sys.stderr
+            )
+
+    return {
+        "commit": git_commit(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "config": {
+            "calls": args.calls,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "latency_ms": args.latency,
+            "jitter_ms": args.jitter,
+            "error_rate": args.error_rate,
+            "records": args.records,
+        },
+        "server_peak_rss_kb": {
+            transport: result["server_peak_rss_kb"]
+            for transport, result in results.items()
+        },
+        "runs": [run for result in results.values() for run in result["runs"]],
+    }
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    # Server logs would skew the timings of a terminal-bound run.
+    with open(os.devnull, "w") as devnull:
+        report = asyncio.run(run(args, None if args.verbose else devnull))
+    for transport, rss in report["server_peak_rss_kb"].items():
+        if rss is not None:
+            print(f"{transport} server peak RSS: {rss / 1024:.1f} MiB")
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"results written to {args.output}")
+    if args.compare:
+        with open(args.compare) as file:
+            compare(json.load(file), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
-from app.server import mcp
-
-# The tools are decorated with the mcp instance, so they need to be imported
-# after the mcp object is created.
+# The tools and resources register themselves with the mcp instance when
+# they are imported.
+from app.resources import *
+from app.serve import main
 from app.tools import *
 
 if __name__ == "__main__":
-    # Initialize and run the server
-    mcp.run(transport="stdio")
+    # Initialize and run the server (stdio by default, see --help)
+    main()
@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    """
+    Run async tests on asyncio only, which is what the MCP server uses.
+    """
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def mock_env_vars():
+    """
+    Mock environment variables to avoid errors during test collection.
+    """
+    with patch.dict("os.environ", {"PAYSTACK_API_KEY": "test_key"}):
+        yield
+
+
+@pytest.fixture
+def make_client():
+    """
+    Build an AsyncPaystackClient whose requests are answered by ``handler``.
+
+    Retries are not delayed. Other keyword arguments, including a
+    ``transport`` to use instead of ``handler``, go to the client.
+    """
+    from app.paystack_client import AsyncPaystackClient
+    from app.retry import RetryPolicy
+
+    def make(handler=None, **options):
+        if "transport" not in options:
+            options["transport"] = httpx.MockTransport(handler)
+        options.setdefault("retry_policy", RetryPolicy(base_delay=0, max_delay=0))
+        return AsyncPaystackClient(api_key="sk_test", **options)
+
+    return make
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from app.batch import gather_each, summarize
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_gather_each_keeps_input_order_and_isolates_errors():
+    async def fn(item):
+        await asyncio.sleep(0.01 * (3 - item))
+        if item == 2:
+            raise ValueError("bad item")
+        return item * 10
+
+    outcomes = await gather_each(fn, [0, 1, 2, 3], max_workers=4)
+
+    assert outcomes == [
+        {"ok": True, "result": 0},
+        {"ok": True, "result": 10},
+        {"ok": False, "error": "bad item", "status_code": None},
+        {"ok": True, "result": 30},
+    ]
+
+
+async def test_gather_each_bounds_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def fn(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+
+    await gather_each(fn, range(50), max_workers=3)
+
+    assert peak == 3
+
+
+async def test_gather_each_reports_progress():
+    seen = []
+
+    async def fn(item):
+        return item
+
+    async def on_progress(done, total, item, outcome):
+        seen.append((done, total, item, outcome["ok"]))
+
+    await gather_each(fn, ["a", "b"], max_workers=1, on_progress=on_progress)
+
+    assert seen == [(1, 2, "a", True), (2, 2, "b", True)]
+
+
+def test_summarize():
+    summary = summarize([{"ok": True}, {"ok": False}, {"ok": True}])
+
+    assert (summary["total"], summary["succeeded"], summary["failed"]) == (3, 2, 1)
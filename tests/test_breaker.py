@@ -0,0 +1,192 @@
+import asyncio
+import random
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.breaker import (
+    CLOSED,
+    HALF_OPEN,
+    HEDGE_BUDGET,
+    OPEN,
+    BreakerConfig,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+from app.retry import RetryPolicy
+
+pytestmark = pytest.mark.anyio
+
+
+def test_breaker_opens_on_error_rate_and_closes_after_a_probe():
+    breaker = CircuitBreaker("GET /balance", BreakerConfig(min_calls=4, cooldown=30))
+    with patch("app.breaker.time.monotonic", return_value=100.0):
+        for failed in (False, True, False, True):
+            breaker.allow()
+            breaker.record(0.1, failed)
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+
+    with patch("app.breaker.time.monotonic", return_value=131.0):
+        breaker.allow()
+        assert breaker.state == HALF_OPEN
+        # Only one probe at a time.
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+        breaker.record(0.1, False)
+
+    assert breaker.state == CLOSED
+
+
+def test_slow_requests_count_as_failures():
+    breaker = CircuitBreaker("GET /balance", BreakerConfig(min_calls=2, slow_call=1))
+    breaker.record(0.5, False)
+    breaker.record(2.0, False)
+
+    assert breaker.state == OPEN
+
+
+def test_failed_probe_reopens_the_circuit():
+    breaker = CircuitBreaker("GET /balance", BreakerConfig(min_calls=1, cooldown=0))
+    breaker.record(0.1, True)
+    breaker.allow()
+    breaker.record(0.1, True)
+
+    assert breaker.state == OPEN
+
+
+def test_disabled_breaker_never_opens():
+    breaker = CircuitBreaker("GET /balance", BreakerConfig(enabled=False, min_calls=1))
+    breaker.record(0.1, True)
+    breaker.allow()
+
+    assert breaker.state == CLOSED
+
+
+def test_hedge_delay_is_the_p95_of_recent_successes():
+    breaker = CircuitBreaker("GET /balance", BreakerConfig())
+    for ms in range(1, 20):
+        breaker.record(ms / 1000, False)
+    assert breaker.hedge_delay() is None
+
+    for ms in range(20, 101):
+        breaker.record(ms / 1000, False)
+    assert breaker.hedge_delay() == pytest.approx(0.095)
+
+
+def test_cancelled_requests_count_as_latency_samples():
+    breaker = CircuitBreaker("GET /balance", BreakerConfig(min_calls=1))
+    for _ in range(19):
+        breaker.record(0.01, False)
+    breaker.release(2.0)
+
+    assert breaker.hedge_delay() == pytest.approx(0.01)
+    assert breaker.stats() == {"state": CLOSED, "calls": 20, "failures": 0}
+
+
+def test_hedge_rate_stays_bounded_under_a_slow_tail():
+    breaker = CircuitBreaker("GET /balance", BreakerConfig())
+    rng = random.Random(1)
+
+    def latency():
+        slow = rng.random() < 0.1
+        return rng.uniform(0.2, 2.0) if slow else rng.uniform(0.01, 0.05)
+
+    hedges = 0
+    for _ in range(5000):
+        first = latency()
+        delay = breaker.hedge_delay()
+        if delay is None or first <= delay:
+            breaker.record(first, False)
+            continue
+        # The first of the two answers wins and the other is cancelled.
+        hedges += 1
+        breaker.hedged()
+        second = latency()
+        if first <= delay + second:
+            breaker.record(first, False)
+            breaker.release(first - delay)
+        else:
+            breaker.record(second, False)
+            breaker.release(delay + second)
+
+    assert hedges / 5000 <= HEDGE_BUDGET * 1.1
+
+
+async def test_open_circuit_fails_fast(make_client):
+    from app.paystack_client import PaystackAPIError
+
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503, json={"status": False, "message": "Down"})
+
+    async with make_client(
+        handler,
+        retry_policy=RetryPolicy(max_attempts=1),
+        breaker_config=BreakerConfig(min_calls=2),
+    ) as client:
+        for _ in range(2):
+            with pytest.raises(PaystackAPIError) as error:
+                await client.fetch_transaction("1")
+            assert error.value.status_code == 503
+        with pytest.raises(CircuitOpenError):
+            await client.fetch_transaction("1")
+        stats = client.breakers.stats()
+
+    assert calls == 2
+    assert stats["GET /transaction/{id}"]["state"] == OPEN
+
+
+async def test_open_circuit_serves_the_last_verification_as_stale(make_client):
+    from app.paystack_client import PaystackAPIError
+
+    healthy = True
+
+    def handler(request):
+        if healthy:
+            return httpx.Response(200, json={"status": True, "data": {"id": 1}})
+        return httpx.Response(503, json={"status": False, "message": "Down"})
+
+    async with make_client(
+        handler,
+        retry_policy=RetryPolicy(max_attempts=1),
+        breaker_config=BreakerConfig(min_calls=1),
+    ) as client:
+        fresh = await client.verify_transaction("ref_1")
+        healthy = False
+        with pytest.raises(PaystackAPIError) as error:
+            await client.verify_transaction("ref_1")
+        assert error.value.status_code == 503
+        stale = await client.verify_transaction("ref_1")
+        with pytest.raises(CircuitOpenError):
+            await client.verify_transaction("ref_2")
+
+    assert "stale" not in fresh
+    assert stale == {**fresh, "stale": True}
+
+
+async def test_slow_reads_are_hedged(make_client):
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        if calls == 22:
+            await asyncio.sleep(1)
+        return httpx.Response(200, json={"status": True, "data": {"id": calls}})
+
+    async with make_client(
+        handler,
+        retry_policy=RetryPolicy(max_attempts=1),
+        breaker_config=BreakerConfig(hedge=True),
+    ) as client:
+        for _ in range(21):
+            await client.fetch_transaction("1")
+        result = await client.fetch_transaction("1")
+
+    assert result["data"] == {"id": 23}
@@ -0,0 +1,148 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.cache import TTLCache
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10)
+    with patch("app.cache.time.monotonic", return_value=100.0):
+        cache.set(("fetch_plan", "PLN_1"), "plan", ttl=5)
+        assert cache.get(("fetch_plan", "PLN_1")) == "plan"
+    with patch("app.cache.time.monotonic", return_value=106.0):
+        assert cache.get(("fetch_plan", "PLN_1")) is None
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2)
+    cache.set(("a",), 1, ttl=60)
+    cache.set(("b",), 2, ttl=60)
+    cache.get(("a",))
+    cache.set(("c",), 3, ttl=60)
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_invalidates_by_prefix():
+    cache = TTLCache()
+    cache.set(("fetch_product", "1"), "one", ttl=60)
+    cache.set(("fetch_product", "2"), "two", ttl=60)
+    cache.invalidate("fetch_product", "1")
+
+    assert cache.get(("fetch_product", "1")) is None
+    assert cache.get(("fetch_product", "2")) == "two"
+
+
+@pytest.mark.anyio
+async def test_async_client_caches_reads_and_invalidates_on_write(make_client):
+    calls = []
+
+    def handler(request):
+        calls.append((request.method, request.url.path))
+        return httpx.Response(200, json={"status": True, "data": {"id": 1}})
+
+    async with make_client(handler) as client:
+        await client.fetch_product("PROD_1")
+        await client.fetch_product("PROD_1")
+        await client.update_product("PROD_1", "New", None, None, None)
+        await client.fetch_product("PROD_1")
+
+    assert calls == [
+        ("GET", "/product/PROD_1"),
+        ("PUT", "/product/PROD_1"),
+        ("GET", "/product/PROD_1"),
+    ]
+
+
+@pytest.mark.anyio
+async def test_update_drops_customers_cached_under_any_identifier(make_client):
+    calls = []
+
+    def handler(request):
+        calls.append((request.method, request.url.path))
+        return httpx.Response(200, json={"status": True, "data": {"id": 1}})
+
+    async with make_client(handler) as client:
+        await client.fetch_customer("ada@example.com")
+        await client.update_customer("CUS_ada", "Ada", "Lovelace")
+        await client.fetch_customer("ada@example.com")
+
+    assert calls == [
+        ("GET", "/customer/ada@example.com"),
+        ("PUT", "/customer/CUS_ada"),
+        ("GET", "/customer/ada@example.com"),
+    ]
+
+
+def test_sync_client_caches_reads():
+    from app.paystack_client import PaystackClient
+
+    client = PaystackClient(api_key="sk_test")
+    with patch("app.paystack_client.paystack.Verification") as verification:
+        client.list_countries()
+        client.list_countries()
+
+    verification.list_countries.assert_called_once()
+
+
+def test_ttl_cache_keeps_last_good_responses_apart():
+    cache = TTLCache(maxsize=2, stale_size=2)
+    with patch("app.cache.time.monotonic", return_value=100.0):
+        cache.set(("list_countries",), "countries", ttl=60)
+        for reference in ("ref_1", "ref_2", "ref_3"):
+            cache.keep(("verify_transaction", reference), reference)
+    with patch("app.cache.time.monotonic", return_value=100.0):
+        assert cache.get(("list_countries",)) == "countries"
+    with patch("app.cache.time.monotonic", return_value=200.0):
+        assert cache.get(("list_countries",)) is None
+
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["evictions"] == 0
+    assert cache.get_stale(("verify_transaction", "ref_1")) is None
+    assert cache.get_stale(("verify_transaction", "ref_3")) == "ref_3"
+
+
+@pytest.mark.anyio
+async def test_balance_is_revalidated_in_the_background(make_client):
+    balances = iter([1, 2])
+
+    def handler(request):
+        return httpx.Response(
+            200, json={"status": True, "data": [{"balance": next(balances)}]}
+        )
+
+    async with make_client(handler, revalidate_after={"get_balance": 0}) as client:
+        first = await client.get_balance()
+        served = await client.get_balance()
+        await asyncio.sleep(0.01)
+        refreshed = await client.get_balance()
+
+    assert served == first
+    assert first["data"][0]["balance"] == 1
+    assert refreshed["data"][0]["balance"] == 2
+    assert refreshed["fetched_at"] >= first["fetched_at"]
+
+
+@pytest.mark.anyio
+async def test_fresh_balance_is_served_from_the_cache(make_client):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"status": True, "data": []})
+
+    async with make_client(handler) as client:
+        first = await client.get_balance_ledger()
+        second = await client.get_balance_ledger()
+
+    assert calls == ["/balance/ledger"]
+    assert second == first
+    assert first["fetched_at"].endswith("+00:00")
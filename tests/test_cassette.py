@@ -0,0 +1,96 @@
+import gzip
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.cassette import (
+    Cassette,
+    CassetteMissError,
+    RecordingTransport,
+    ReplayTransport,
+    request_key,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_recorded_responses_replay_in_order(tmp_path, make_client):
+    path = str(tmp_path / "paystack.jsonl.gz")
+    amounts = iter([1, 2])
+
+    def upstream(request):
+        return httpx.Response(
+            200, json={"status": True, "data": {"amount": next(amounts)}}
+        )
+
+    async with make_client(
+        transport=RecordingTransport(Cassette(path), httpx.MockTransport(upstream))
+    ) as client:
+        await client.fetch_transaction("1")
+        await client.fetch_transaction("1")
+
+    async with make_client(transport=ReplayTransport(Cassette(path))) as client:
+        replayed = [
+            (await client.fetch_transaction("1"))["data"]["amount"] for _ in range(3)
+        ]
+
+    assert replayed == [1, 2, 1]
+
+
+async def test_cassette_is_compressed_and_holds_no_credentials(tmp_path, make_client):
+    path = tmp_path / "paystack.jsonl.gz"
+
+    def upstream(request):
+        return httpx.Response(200, json={"status": True})
+
+    async with make_client(
+        transport=RecordingTransport(Cassette(str(path)), httpx.MockTransport(upstream))
+    ) as client:
+        await client.verify_transaction("ref_1")
+
+    text = gzip.decompress(path.read_bytes()).decode()
+    assert "/transaction/verify/ref_1" in text
+    assert "sk_test" not in text
+
+
+async def test_unrecorded_requests_fail(tmp_path, make_client):
+    async with make_client(
+        transport=ReplayTransport(Cassette(str(tmp_path / "empty.gz")))
+    ) as client:
+        with pytest.raises(CassetteMissError):
+            await client.get_balance()
+
+
+def test_request_key_ignores_headers_and_query_order():
+    first = httpx.Request(
+        "GET",
+        "https://api.paystack.co/transaction?page=1&perPage=50",
+        headers={"Authorization": "Bearer sk_a"},
+    )
+    second = httpx.Request(
+        "GET",
+        "https://api.paystack.co/transaction?perPage=50&page=1",
+        headers={"Authorization": "Bearer sk_b"},
+    )
+    posted = httpx.Request("POST", "https://api.paystack.co/refund", json={"amount": 1})
+
+    assert request_key(first) == request_key(second)
+    assert request_key(posted) != request_key(
+        httpx.Request("POST", "https://api.paystack.co/refund", json={"amount": 2})
+    )
+
+
+def test_pool_uses_the_configured_cassette(tmp_path):
+    from app.pool import ConnectionPool
+
+    env = {
+        "PAYSTACK_CASSETTE": str(tmp_path / "paystack.jsonl.gz"),
+        "PAYSTACK_CASSETTE_LATENCY": "5",
+    }
+    with patch.dict("os.environ", env):
+        pool = ConnectionPool("https://api.paystack.co", {}, 30.0)
+
+    transport = pool.http._transport
+    assert isinstance(transport, ReplayTransport)
+    assert transport.latency == 0.005
@@ -0,0 +1,125 @@
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def test_parse_customers_reads_csv_and_jsonl(tmp_path):
+    from app.customer_import import parse_customers
+
+    csv_text = (
+        "Email,First Name,lastName,Phone,notes\nada@example.com,Ada,Lovelace,,vip\n"
+    )
+    jsonl_path = tmp_path / "customers.jsonl"
+    jsonl_path.write_text('{"email": "alan@example.com", "first_name": "Alan"}\n\n')
+
+    assert parse_customers(csv_text) == [
+        {
+            "email": "ada@example.com",
+            "first_name": "Ada",
+            "last_name": "Lovelace",
+            "phone": None,
+        }
+    ]
+    assert parse_customers(path=str(jsonl_path)) == [
+        {"email": "alan@example.com", "first_name": "Alan"}
+    ]
+    with pytest.raises(ValueError):
+        parse_customers()
+
+
+def test_dedupe_by_email_merges_rows():
+    from app.customer_import import dedupe_by_email
+
+    customers = dedupe_by_email(
+        [
+            {"email": "Ada@Example.com", "first_name": "Ada", "phone": "0801"},
+            {"email": "ada@example.com", "first_name": "Augusta", "phone": None},
+            {"first_name": "Nobody"},
+        ]
+    )
+
+    assert customers == [
+        {"email": "ada@example.com", "first_name": "Augusta", "phone": "0801"},
+        {"first_name": "Nobody"},
+    ]
+
+
+def fake_client():
+    from app.paystack_client import PaystackAPIError
+
+    async def fetch_customer(email):
+        if email == "ada@example.com":
+            return {"data": {"customer_code": "CUS_ada"}}
+        raise PaystackAPIError(404, "Customer not found", None)
+
+    client = AsyncMock()
+    client.fetch_customer.side_effect = fetch_customer
+    client.create_customer.return_value = {"data": {"customer_code": "CUS_new"}}
+    client.update_customer.return_value = {"data": {"customer_code": "CUS_ada"}}
+    return client
+
+
+async def test_import_customers_creates_updates_and_reports_failures(tmp_path):
+    from app.customer_import import ImportCheckpoint, import_customers
+
+    client = fake_client()
+    checkpoint = ImportCheckpoint(str(tmp_path / "checkpoint.jsonl"))
+    progress = []
+
+    async def on_progress(done, total):
+        progress.append((done, total))
+
+    summary = await import_customers(
+        client,
+        [
+            {"email": "ada@example.com", "first_name": "Ada"},
+            {"email": "alan@example.com", "first_name": "Alan"},
+            {"email": "ada@example.com", "last_name": "Lovelace"},
+            {"first_name": "Nobody"},
+        ],
+        checkpoint,
+        chunk_size=2,
+        on_progress=on_progress,
+    )
+
+    assert (summary["created"], summary["updated"], summary["failed"]) == (1, 1, 1)
+    assert summary["duplicates"] == 1
+    client.update_customer.assert_awaited_once_with("CUS_ada", "Ada", "Lovelace", None)
+    assert progress == [(2, 3), (3, 3)]
+    lines = (tmp_path / "checkpoint.jsonl").read_text().splitlines()
+    assert [json.loads(line)["ok"] for line in lines] == [True, True, False]
+
+
+async def test_import_customers_resumes_from_checkpoint(tmp_path):
+    from app.customer_import import ImportCheckpoint, import_customers
+
+    path = tmp_path / "checkpoint.jsonl"
+    path.write_text(
+        json.dumps({"email": "ada@example.com", "ok": True}) + "\n" + '{"email": "al'
+    )
+    client = fake_client()
+
+    summary = await import_customers(
+        client,
+        [{"email": "ada@example.com"}, {"email": "alan@example.com"}],
+        ImportCheckpoint(str(path)),
+    )
+
+    assert summary["skipped"] == 1
+    assert summary["created"] == 1
+    client.update_customer.assert_not_awaited()
+
+
+async def test_import_summary_lists_a_bounded_number_of_failures():
+    from app.customer_import import import_customers
+
+    with patch("app.customer_import.MAX_REPORTED_FAILURES", 1):
+        summary = await import_customers(
+            fake_client(), [{"first_name": "Nobody"}, {"first_name": "Noone"}]
+        )
+
+    assert summary["failed"] == 2
+    assert len(summary["failures"]) == 1
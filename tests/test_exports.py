@@ -0,0 +1,73 @@
+import os
+import time
+
+import pytest
+
+from app.exports import ExportStore
+
+pytestmark = pytest.mark.anyio
+
+
+async def records(count):
+    for index in range(count):
+        yield {"id": index}
+
+
+async def test_write_splits_records_into_chunks(tmp_path):
+    store = ExportStore(str(tmp_path))
+    progress = []
+
+    async def on_chunk(chunks, count):
+        progress.append((chunks, count))
+
+    manifest = await store.write(
+        records(5), chunk_size=2, on_chunk=on_chunk, tenant="acme"
+    )
+
+    assert (manifest["records"], manifest["chunks"], manifest["tenant"]) == (
+        5,
+        3,
+        "acme",
+    )
+    assert progress == [(1, 2), (2, 4), (3, 5)]
+
+
+async def test_read_pages_through_an_export(tmp_path):
+    store = ExportStore(str(tmp_path))
+    manifest = await store.write(records(3), chunk_size=2)
+
+    first = store.read(manifest["export"], 0)
+    last = store.read(manifest["export"], 1)
+
+    assert [record["id"] for record in first["records"]] == [0, 1]
+    assert first["next"] == f"paystack://exports/{manifest['export']}/1"
+    assert [record["id"] for record in last["records"]] == [2]
+    assert last["next"] is None
+
+
+async def test_empty_export_has_one_empty_chunk(tmp_path):
+    store = ExportStore(str(tmp_path))
+    manifest = await store.write(records(0))
+
+    assert manifest["chunks"] == 1
+    assert store.read(manifest["export"], 0)["records"] == []
+
+
+async def test_read_rejects_unknown_exports(tmp_path):
+    store = ExportStore(str(tmp_path))
+
+    with pytest.raises(ValueError):
+        store.read("../secrets", 0)
+    with pytest.raises(ValueError):
+        store.read("abc123", 0)
+
+
+async def test_write_prunes_expired_exports(tmp_path):
+    store = ExportStore(str(tmp_path), ttl=60)
+    old = await store.write(records(1))
+    expired = time.time() - 120
+    os.utime(tmp_path / old["export"], (expired, expired))
+
+    await store.write(records(1))
+
+    assert not (tmp_path / old["export"]).exists()
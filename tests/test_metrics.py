@@ -0,0 +1,80 @@
+import httpx
+import pytest
+
+from app.metrics import Counter, Histogram, endpoint_name, metrics
+
+pytestmark = pytest.mark.anyio
+
+
+def test_endpoint_name_replaces_ids():
+    assert endpoint_name("GET", "/transaction/verify/ref_1") == (
+        "GET /transaction/verify/{id}"
+    )
+    assert endpoint_name("POST", "/page/12/product") == "POST /page/{id}/product"
+    assert endpoint_name("GET", "/balance/ledger") == "GET /balance/ledger"
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency.", ("tool",), (0.1, 1.0))
+    histogram.observe(0.05, "a")
+    histogram.observe(0.5, "a")
+    histogram.observe(5, "a")
+
+    assert list(histogram.samples()) == [
+        'latency_seconds_bucket{tool="a",le="0.1"} 1',
+        'latency_seconds_bucket{tool="a",le="1.0"} 2',
+        'latency_seconds_bucket{tool="a",le="+Inf"} 3',
+        'latency_seconds_sum{tool="a"} 5.55',
+        'latency_seconds_count{tool="a"} 3',
+    ]
+
+
+def test_counter_escapes_label_values():
+    counter = Counter("calls_total", "Calls.", ("tool",))
+    counter.inc('say "hi"')
+
+    assert list(counter.samples()) == ['calls_total{tool="say \\"hi\\""} 1']
+
+
+def test_samples_are_labelled_by_worker_when_several_run(monkeypatch):
+    from app.metrics import Metrics
+
+    registry = Metrics()
+    registry.tool_calls.inc("list_banks", "ok")
+    assert 'outcome="ok"} 1' in registry.render()
+
+    monkeypatch.setenv("PAYSTACK_MCP_WORKERS", "4")
+    monkeypatch.setattr("app.metrics.os.getpid", lambda: 42)
+    assert 'outcome="ok",worker="42"} 1' in registry.render()
+
+
+async def test_client_records_requests_and_retries(make_client):
+    responses = iter([httpx.Response(503), httpx.Response(200, json={"data": {}})])
+    client = make_client(lambda request: next(responses), tenant="metrics")
+    endpoint = "GET /dispute/{id}"
+
+    async with client:
+        await client.fetch_dispute("7")
+
+    assert metrics.requests.value("metrics", endpoint, "503") == 1
+    assert metrics.requests.value("metrics", endpoint, "200") == 1
+    assert metrics.retries.value("metrics", endpoint) == 1
+    assert metrics.request_seconds.count("metrics", endpoint) == 2
+    # Nothing was pushed by a webhook, which is not a cache miss.
+    assert metrics.cache_lookups.value("metrics", "fetch_dispute", "miss") == 0
+    assert client.cache.stats()["misses"] == 0
+
+
+async def test_tools_record_latency_and_size():
+    from app.shaping import shaped
+
+    @shaped
+    async def metered_tool():
+        return {"data": [1, 2, 3]}
+
+    await metered_tool()
+
+    assert metrics.tool_calls.value("metered_tool", "ok") == 1
+    assert metrics.tool_seconds.count("metered_tool") == 1
+    assert metrics.tool_response_bytes.count("metered_tool") == 1
+    assert "paystack_mcp_tool_calls_total" in metrics.render()
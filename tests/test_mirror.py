@@ -0,0 +1,159 @@
+import pytest
+
+from app.mirror import Mirror, sync_mirror
+
+pytestmark = pytest.mark.anyio
+
+
+def transaction(id, created_at, status="success", channel="card"):
+    return {
+        "id": id,
+        "reference": f"ref_{id}",
+        "status": status,
+        "amount": 1000 * id,
+        "currency": "NGN",
+        "channel": channel,
+        "createdAt": created_at,
+        "customer": {"customer_code": "CUS_1", "email": "ada@example.com"},
+    }
+
+
+class FakeClient:
+    def __init__(self, mirror, transactions):
+        self.mirror = mirror
+        self.transactions = transactions
+        self.calls = []
+
+    async def iter_transactions(self, from_date=None):
+        self.calls.append(from_date)
+        for record in self.transactions:
+            yield record
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror = Mirror(str(tmp_path / "mirror.db"))
+    yield mirror
+    mirror.close()
+
+
+async def test_sync_is_incremental(mirror):
+    client = FakeClient(
+        mirror,
+        [
+            transaction(2, "2024-01-02T09:00:00.000Z"),
+            transaction(1, "2024-01-01T09:00:00.000Z", status="failed"),
+        ],
+    )
+
+    assert await sync_mirror(client, ["transactions"]) == {"transactions": 2}
+    client.transactions = [transaction(1, "2024-01-01T09:00:00.000Z")]
+    await sync_mirror(client, ["transactions"], lookback=3600)
+
+    assert client.calls == [None, "2024-01-02T08:00:00+00:00"]
+    assert mirror.high_water("transactions") == "2024-01-02T09:00:00.000Z"
+    assert [record["status"] for record in mirror.query("transactions")] == [
+        "success",
+        "success",
+    ]
+    assert mirror.status()["transactions"]["records"] == 2
+
+
+async def test_failed_sync_keeps_high_water(mirror):
+    class FailingClient(FakeClient):
+        async def iter_transactions(self, from_date=None):
+            yield transaction(3, "2024-01-03T09:00:00.000Z")
+            raise RuntimeError("connection lost")
+
+    with pytest.raises(RuntimeError):
+        await sync_mirror(FailingClient(mirror, []), ["transactions"])
+
+    assert mirror.high_water("transactions") is None
+
+
+def test_query_filters(mirror):
+    mirror.upsert(
+        "transactions",
+        [
+            transaction(1, "2024-01-01T09:00:00.000Z", channel="bank"),
+            transaction(2, "2024-01-07T23:00:00.000Z"),
+            transaction(3, "2024-01-08T09:00:00.000Z"),
+        ],
+    )
+
+    assert [r["id"] for r in mirror.query("transactions", {"channel": "card"})] == [
+        3,
+        2,
+    ]
+    assert [
+        r["id"]
+        for r in mirror.query(
+            "transactions", from_date="2024-01-02", to_date="2024-01-07"
+        )
+    ] == [2]
+    with pytest.raises(ValueError):
+        mirror.query("customers", {"channel": "card"})
+    with pytest.raises(ValueError):
+        mirror.query("invoices")
+
+
+def test_numeric_looking_references_are_kept_as_text(mirror):
+    record = {**transaction(1, "2024-01-01T09:00:00.000Z"), "reference": "007"}
+    mirror.upsert("transactions", [record])
+
+    assert mirror.aggregate("transactions", ["reference"])[0]["reference"] == "007"
+    assert [r["id"] for r in mirror.query("transactions", {"reference": "007"})] == [1]
+    assert mirror.query("transactions", {"reference": "7"}) == []
+
+
+def test_from_env_gives_each_tenant_a_file(tmp_path):
+    path = str(tmp_path / "mirror.db")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("PAYSTACK_MIRROR_DB", path)
+        mirror = Mirror.from_env("acme")
+
+    assert mirror.path == str(tmp_path / "mirror.acme.db")
+    mirror.close()
+
+
+def test_aggregate_groups_and_percentiles(mirror):
+    mirror.upsert(
+        "transactions",
+        [transaction(id, f"2024-01-0{1 + id % 2}T09:00:00.000Z") for id in range(1, 11)]
+        + [transaction(11, "2024-01-01T10:00:00.000Z", status="failed")],
+    )
+
+    by_day = mirror.aggregate(
+        "transactions", ["day"], {"status": "success"}, percentiles=[50, 100]
+    )
+
+    assert by_day == [
+        {
+            "day": "2024-01-01",
+            "count": 5,
+            "sum": 30000,
+            "mean": 6000.0,
+            "min": 2000,
+            "max": 10000,
+            "p50": 6000,
+            "p100": 10000,
+        },
+        {
+            "day": "2024-01-02",
+            "count": 5,
+            "sum": 25000,
+            "mean": 5000.0,
+            "min": 1000,
+            "max": 9000,
+            "p50": 5000,
+            "p100": 9000,
+        },
+    ]
+    total = mirror.aggregate("transactions", percentiles=[90])
+    assert total[0]["count"] == 11
+    assert total[0]["p90"] == 10000
+    assert mirror.aggregate("transactions", to_date="2023-12-31") == []
+    with pytest.raises(ValueError):
+        mirror.aggregate("transactions", ["email_domain"])
+    with pytest.raises(ValueError):
+        mirror.aggregate("customers")
@@ -0,0 +1,81 @@
+import httpx
+import pytest
+
+from app.pagination import aiter_pages, iter_pages
+
+
+def test_iter_pages_stops_on_short_page():
+    pages = {1: [1, 2], 2: [3, 4], 3: [5]}
+    fetched = []
+
+    def fetch_page(page):
+        fetched.append(page)
+        return {"data": pages.get(page, [])}
+
+    assert list(iter_pages(fetch_page, per_page=2)) == [1, 2, 3, 4, 5]
+    assert set(fetched) <= {1, 2, 3, 4}
+
+
+def test_iter_pages_is_lazy():
+    fetched = []
+
+    def fetch_page(page):
+        fetched.append(page)
+        return {"data": [page] * 2}
+
+    records = iter_pages(fetch_page, per_page=2, prefetch=1)
+    assert next(records) == 1
+    assert max(fetched) <= 2
+    records.close()
+
+
+@pytest.mark.anyio
+async def test_aiter_pages_uses_meta_page_count():
+    async def fetch_page(page):
+        return {"data": [page, page], "meta": {"pageCount": 3}}
+
+    records = [record async for record in aiter_pages(fetch_page, per_page=2)]
+
+    assert records == [1, 1, 2, 2, 3, 3]
+
+
+@pytest.mark.anyio
+async def test_async_client_iter_transactions_sends_filters(make_client):
+    seen = []
+
+    def handler(request):
+        seen.append(dict(request.url.params))
+        page = int(request.url.params["page"])
+        return httpx.Response(
+            200, json={"data": [{"id": page}], "meta": {"pageCount": 2}}
+        )
+
+    async with make_client(handler) as client:
+        records = [
+            record
+            async for record in client.iter_transactions(
+                per_page=1, from_date="2024-01-01", to_date="2024-01-31"
+            )
+        ]
+
+    assert records == [{"id": 1}, {"id": 2}]
+    assert seen[0] == {
+        "perPage": "1",
+        "page": "1",
+        "from": "2024-01-01",
+        "to": "2024-01-31",
+    }
+
+
+@pytest.mark.anyio
+async def test_aiter_pages_prefetches_no_further_than_the_page_count():
+    requested = []
+
+    async def fetch_page(page):
+        requested.append(page)
+        return {"data": [page], "meta": {"pageCount": 2}}
+
+    records = [record async for record in aiter_pages(fetch_page, 1, prefetch=8)]
+
+    assert records == [1, 2]
+    assert requested == [1, 2]
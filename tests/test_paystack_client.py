@@ -0,0 +1,92 @@
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_request_sends_bearer_auth(make_client):
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"status": True, "data": {"balance": 1}})
+
+    async with make_client(handler) as client:
+        result = await client.get_balance()
+
+    assert result["data"] == {"balance": 1}
+    assert seen[0].url.path == "/balance"
+    assert seen[0].headers["Authorization"] == "Bearer sk_test"
+
+
+async def test_path_segments_are_quoted(make_client):
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"status": True})
+
+    async with make_client(handler) as client:
+        await client.verify_transaction("ref/1")
+
+    assert seen[0].url.raw_path == b"/transaction/verify/ref%2F1"
+
+
+async def test_unset_arguments_are_not_sent(make_client):
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"status": True})
+
+    async with make_client(handler) as client:
+        await client.download_transactions(per_page=10, page=2)
+        await client.create_customer("a@example.com", "Ada", "Lovelace")
+
+    assert dict(seen[0].url.params) == {"perPage": "10", "page": "2"}
+    assert b"phone" not in seen[1].content
+
+
+async def test_error_status_raises_paystack_api_error(make_client):
+    from app.paystack_client import PaystackAPIError
+
+    def handler(request):
+        return httpx.Response(404, json={"status": False, "message": "Not found"})
+
+    async with make_client(handler) as client:
+        with pytest.raises(PaystackAPIError) as excinfo:
+            await client.fetch_customer("CUS_missing")
+
+    assert excinfo.value.status_code == 404
+    assert excinfo.value.message == "Not found"
+
+
+async def test_verify_transactions_reports_each_reference(make_client):
+    def handler(request):
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404, json={"status": False, "message": "Not found"})
+        return httpx.Response(200, json={"status": True, "data": {"status": "success"}})
+
+    async with make_client(handler) as client:
+        results = await client.verify_transactions(["ref_1", "missing"], max_workers=2)
+
+    assert results[0]["reference"] == "ref_1"
+    assert results[0]["ok"] is True
+    assert results[1] == {
+        "reference": "missing",
+        "ok": False,
+        "error": "404: Not found",
+        "status_code": 404,
+    }
+
+
+async def test_base_url_can_be_set_from_env():
+    from app.paystack_client import AsyncPaystackClient
+
+    with patch.dict("os.environ", {"PAYSTACK_BASE_URL": "http://127.0.0.1:8900"}):
+        client = AsyncPaystackClient(api_key="sk_test")
+
+    assert str(client.pool.http.base_url) == "http://127.0.0.1:8900"
+    await client.aclose()
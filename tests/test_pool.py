@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from app.pool import ConnectionPool, PoolConfig
+
+
+def test_pool_config_from_env():
+    env = {
+        "PAYSTACK_MAX_CONNECTIONS": "5",
+        "PAYSTACK_MAX_KEEPALIVE_CONNECTIONS": "2",
+        "PAYSTACK_KEEPALIVE_EXPIRY": "60",
+        "PAYSTACK_HTTP2": "true",
+    }
+    with (
+        patch.dict("os.environ", env),
+        patch("app.pool.importlib.util.find_spec", return_value=object()),
+    ):
+        config = PoolConfig.from_env()
+
+    assert config == PoolConfig(
+        max_connections=5,
+        max_keepalive_connections=2,
+        keepalive_expiry=60.0,
+        http2=True,
+    )
+    assert config.limits.max_keepalive_connections == 2
+
+
+def test_http2_falls_back_without_h2(caplog):
+    with (
+        patch.dict("os.environ", {"PAYSTACK_HTTP2": "1"}),
+        patch("app.pool.importlib.util.find_spec", return_value=None),
+    ):
+        config = PoolConfig.from_env()
+
+    assert config.http2 is False
+    assert "h2 is not installed" in caplog.text
+
+
+@pytest.mark.anyio
+async def test_pool_stats_count_handshakes():
+    pool = ConnectionPool(
+        base_url="https://api.paystack.co",
+        headers={},
+        timeout=5,
+        config=PoolConfig(),
+        transport=httpx.MockTransport(lambda request: httpx.Response(200)),
+    )
+    await pool.request("GET", "/balance")
+    await pool.request("GET", "/balance")
+    await pool.trace("connection.connect_tcp.complete", {})
+    await pool.trace("connection.start_tls.complete", {})
+
+    stats = pool.stats()
+    await pool.aclose()
+
+    assert stats["requests"] == 2
+    assert stats["connections_opened"] == 1
+    assert stats["tls_handshakes"] == 1
+    assert stats["reuse_ratio"] == 0.5
+
+
+def test_pool_stats_resource():
+    from app.resources import pool_stats
+
+    with patch("app.resources.clients") as mock_clients:
+        client = MagicMock()
+        client.pool.stats.return_value = {"requests": 3}
+        mock_clients.active.return_value = {"default": client}
+        assert pool_stats() == {"default": {"requests": 3}}
@@ -0,0 +1,65 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.ratelimit import RateLimiter, TokenBucket, endpoint_family
+
+pytestmark = pytest.mark.anyio
+
+
+def test_endpoint_families():
+    assert endpoint_family("/transaction/verify/REF") == "transaction"
+    assert endpoint_family("/refund") == "transaction"
+    assert endpoint_family("/bank/resolve") == "verification"
+    assert endpoint_family("/customer/CUS_1") == "customer"
+
+
+async def test_bucket_queues_callers_at_the_configured_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    started = time.monotonic()
+    await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+
+    assert time.monotonic() - started >= 0.09
+
+
+async def test_429_halves_rate_and_honours_retry_after():
+    limiter = RateLimiter(default_rate=10)
+    limiter.observe(
+        "/transaction", httpx.Response(429, headers={"Retry-After": "0.05"})
+    )
+    bucket = limiter.bucket("/transaction")
+
+    assert bucket.rate == 5
+    assert bucket.blocked_until > time.monotonic()
+
+    limiter.observe("/transaction", httpx.Response(200))
+    assert bucket.rate == 5.5
+
+
+async def test_client_retries_throttled_requests(make_client):
+    statuses = iter([429, 429, 200])
+
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(
+            status, headers={"Retry-After": "0"}, json={"status": status == 200}
+        )
+
+    async with make_client(handler) as client:
+        result = await client.get_balance()
+
+    assert result["status"] is True
+    assert client.rate_limiter.stats()["balance"]["throttled"] == 2
+
+
+def test_family_rates_from_env():
+    with patch.dict(
+        "os.environ", {"PAYSTACK_RATE_LIMITS": "transaction=4, verification=2"}
+    ):
+        limiter = RateLimiter(default_rate=10)
+
+    assert limiter.bucket("/transaction").max_rate == 4
+    assert limiter.bucket("/customer").max_rate == 10
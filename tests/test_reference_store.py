@@ -0,0 +1,106 @@
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from app.reference_store import (
+    ReferenceStore,
+    refresh_reference_data,
+    run_refresh_loop,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def test_store_round_trips_payload_by_filter(tmp_path):
+    store = ReferenceStore(str(tmp_path / "reference.db"))
+    store.put("fetch_banks", {"country": "nigeria", "gateway": None}, {"data": [1]})
+
+    assert store.get("fetch_banks", {"gateway": None, "country": "nigeria"}) == {
+        "data": [1]
+    }
+    assert store.get("fetch_banks", {"country": "ghana", "gateway": None}) is None
+
+
+async def test_reads_survive_a_new_client(tmp_path, make_client):
+    path = str(tmp_path / "reference.db")
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"status": True, "data": ["NG"]})
+
+    async with make_client(
+        handler, reference_store=ReferenceStore(path), cache_ttls={}
+    ) as client:
+        first = await client.list_countries()
+    async with make_client(
+        handler, reference_store=ReferenceStore(path), cache_ttls={}
+    ) as client:
+        second = await client.list_countries()
+
+    assert first == second
+    assert calls == ["/country"]
+
+
+async def test_refresh_replaces_stored_payload(tmp_path, make_client):
+    store = ReferenceStore(str(tmp_path / "reference.db"))
+    responses = iter([["GH"], ["GH", "KE"]])
+
+    def handler(request):
+        return httpx.Response(200, json={"data": next(responses)})
+
+    async with make_client(handler, reference_store=store, cache_ttls={}) as client:
+        await client.list_avs("GH")
+        await refresh_reference_data(client)
+        result = await client.list_avs("GH")
+
+    assert result == {"data": ["GH", "KE"]}
+
+
+async def test_outdated_snapshots_are_fetched_again(tmp_path, make_client):
+    store = ReferenceStore(str(tmp_path / "reference.db"), max_age=60)
+    store.put("list_countries", {}, {"data": ["NG"]})
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if len(calls) > 1:
+            return httpx.Response(503, json={"status": False, "message": "Down"})
+        return httpx.Response(200, json={"data": ["NG", "GH"]})
+
+    async with make_client(handler, reference_store=store, cache_ttls={}) as client:
+        assert await client.list_countries() == {"data": ["NG"]}
+        assert calls == []
+        with patch("app.reference_store.time.time", return_value=time.time() + 120):
+            assert await client.list_countries() == {"data": ["NG", "GH"]}
+        assert calls == ["/country"]
+        with patch("app.reference_store.time.time", return_value=time.time() + 240):
+            # Paystack is down: the outdated snapshot is better than nothing.
+            assert await client.list_countries() == {"data": ["NG", "GH"]}
+
+
+async def test_refresh_loop_refreshes_outdated_snapshots_at_startup(
+    tmp_path, make_client
+):
+    store = ReferenceStore(str(tmp_path / "reference.db"))
+    store.put("list_countries", {}, {"data": ["NG"]})
+    store.put("list_avs", {"country": "GH"}, {"data": ["GH"]})
+
+    def handler(request):
+        return httpx.Response(200, json={"data": ["new"]})
+
+    async with make_client(handler, reference_store=store, cache_ttls={}) as client:
+        registry = MagicMock()
+        registry.active.return_value = {"default": client}
+        with patch("app.reference_store.time.time", return_value=time.time() + 90):
+            store.put("list_avs", {"country": "GH"}, {"data": ["GH"]})
+        with patch("app.reference_store.time.time", return_value=time.time() + 100):
+            task = asyncio.create_task(run_refresh_loop(registry, interval=50))
+            await asyncio.sleep(0.05)
+            task.cancel()
+
+    assert store.get("list_countries", {}) == {"data": ["new"]}
+    assert store.get("list_avs", {"country": "GH"}) == {"data": ["GH"]}
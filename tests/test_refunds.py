@@ -0,0 +1,117 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+TRANSACTIONS = {
+    "ref_paid": {"id": 1, "status": "success", "amount": 10000, "currency": "NGN"},
+    "ref_failed": {"id": 2, "status": "failed", "amount": 5000, "currency": "NGN"},
+    "20240101": {"id": 7, "status": "success", "amount": 10000, "currency": "NGN"},
+}
+
+
+def fake_client():
+    from app.paystack_client import PaystackAPIError
+
+    async def verify_transaction(reference):
+        if reference == "ref_stale":
+            return {"data": TRANSACTIONS["ref_paid"], "stale": True}
+        if reference not in TRANSACTIONS:
+            raise PaystackAPIError(404, "Transaction reference not found", None)
+        return {"data": TRANSACTIONS[reference]}
+
+    async def fetch_transaction(transaction_id):
+        for data in TRANSACTIONS.values():
+            if str(data["id"]) == transaction_id:
+                return {"data": data}
+        raise PaystackAPIError(404, "Transaction not found", None)
+
+    client = AsyncMock()
+    client.verify_transaction.side_effect = verify_transaction
+    client.fetch_transaction.side_effect = fetch_transaction
+    client.list_refunds.return_value = {
+        "data": [
+            {"amount": 3000, "status": "processed"},
+            {"amount": 9000, "status": "failed"},
+        ]
+    }
+    client.create_refund.return_value = {"data": {"id": 99}}
+    return client
+
+
+async def test_bulk_refund_rejects_over_refunds():
+    from app.refunds import bulk_refund
+
+    client = fake_client()
+
+    ledger = await bulk_refund(
+        client,
+        [
+            ("ref_paid", 5000),
+            ("ref_paid", 4000),
+            ("ref_paid", None),
+            ("ref_failed", 100),
+            ("ref_missing", 100),
+        ],
+    )
+
+    assert [entry["status"] for entry in ledger] == [
+        "refunded",
+        "rejected",
+        "refunded",
+        "rejected",
+        "rejected",
+    ]
+    assert ledger[2]["amount"] == 2000
+    assert "exceeds the 2000 NGN" in ledger[1]["error"]
+    assert client.create_refund.await_count == 2
+    keys = {call.args[2] for call in client.create_refund.await_args_list}
+    assert len(keys) == 2
+    assert {call.args[0] for call in client.create_refund.await_args_list} == {"1"}
+
+
+async def test_bulk_refund_resolves_numeric_references_before_ids():
+    from app.refunds import bulk_refund
+
+    client = fake_client()
+
+    ledger = await bulk_refund(client, [("20240101", 1000), ("1", 1000)])
+
+    assert [entry["status"] for entry in ledger] == ["refunded", "refunded"]
+    assert [entry["transaction_id"] for entry in ledger] == ["7", "1"]
+    client.fetch_transaction.assert_awaited_once_with("1")
+    assert [call.args[0] for call in client.create_refund.await_args_list] == [
+        "7",
+        "1",
+    ]
+
+
+async def test_bulk_refund_dry_run_issues_nothing():
+    from app.refunds import bulk_refund
+
+    client = fake_client()
+
+    ledger = await bulk_refund(client, [("ref_paid", 5000)], dry_run=True)
+
+    assert ledger[0]["status"] == "would_refund"
+    client.create_refund.assert_not_awaited()
+
+
+async def test_bulk_refund_rejects_stale_transactions():
+    from app.refunds import bulk_refund
+
+    client = fake_client()
+
+    ledger = await bulk_refund(client, [("ref_stale", 100)])
+
+    assert ledger[0]["status"] == "rejected"
+    assert "stale" in ledger[0]["error"]
+    client.create_refund.assert_not_awaited()
+
+
+def test_batch_key_is_stable():
+    from app.refunds import batch_key
+
+    assert batch_key([("ref_1", 100)]) == batch_key([("ref_1", 100)])
+    assert batch_key([("ref_1", 100)]) != batch_key([("ref_1", 200)])
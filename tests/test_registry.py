@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+def test_tenant_keys_from_env():
+    from app.registry import tenant_keys_from_env
+
+    env = {"PAYSTACK_API_KEY": "sk_default", "PAYSTACK_API_KEY_ACME": "sk_acme"}
+    with patch.dict("os.environ", env, clear=True):
+        assert tenant_keys_from_env() == {"default": "sk_default", "acme": "sk_acme"}
+
+
+async def test_each_tenant_gets_its_own_client():
+    from app.registry import ClientRegistry
+
+    registry = ClientRegistry({"default": "sk_default", "acme": "sk_acme"})
+
+    default = registry.get()
+    acme = registry.get("acme")
+
+    assert registry.get("acme") is acme
+    assert acme.api_key == "sk_acme"
+    assert acme.tenant == "acme"
+    assert default.pool is not acme.pool
+    assert default.cache is not acme.cache
+    assert default.rate_limiter is not acme.rate_limiter
+    assert set(registry.active()) == {"default", "acme"}
+    await registry.aclose()
+    assert registry.active() == {}
+
+
+def test_unknown_tenant():
+    from app.registry import ClientRegistry, UnknownTenantError
+
+    registry = ClientRegistry({"default": "sk_default"})
+
+    with pytest.raises(UnknownTenantError):
+        registry.get("globex")
+
+
+async def test_register_replaces_the_client():
+    from app.registry import ClientRegistry
+
+    registry = ClientRegistry({})
+    await registry.register("acme", "sk_old")
+    old = registry.get("acme")
+
+    await registry.register("acme", "sk_new")
+
+    assert registry.get("acme") is not old
+    assert registry.get("acme").api_key == "sk_new"
+    assert old.pool.http.is_closed
+    await registry.aclose()
+
+
+def test_missing_default_key_is_reported_on_first_use():
+    from app.registry import ClientRegistry
+
+    with patch.dict("os.environ", {}, clear=True):
+        registry = ClientRegistry()
+        with pytest.raises(ValueError, match="API key not provided"):
+            registry.get()
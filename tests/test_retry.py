@@ -0,0 +1,128 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.idempotency import IdempotencyKeyReused, IdempotencyLedger
+from app.retry import RetryPolicy
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_retry_policy_gives_up_after_max_attempts():
+    attempts = 0
+
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        raise httpx.ConnectTimeout("timed out")
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    with pytest.raises(httpx.ConnectTimeout):
+        await policy.call(flaky)
+
+    assert attempts == 3
+    assert policy.retries == 2
+
+
+async def test_retry_policy_does_not_retry_client_errors():
+    from app.paystack_client import PaystackAPIError
+
+    attempts = 0
+
+    async def rejected():
+        nonlocal attempts
+        attempts += 1
+        raise PaystackAPIError(400, "Invalid amount", None)
+
+    with pytest.raises(PaystackAPIError):
+        await RetryPolicy(base_delay=0).call(rejected)
+
+    assert attempts == 1
+
+
+async def test_writes_are_retried_with_a_stable_idempotency_key(make_client):
+    keys = []
+
+    def handler(request):
+        keys.append(request.headers["Idempotency-Key"])
+        if len(keys) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        if len(keys) == 2:
+            return httpx.Response(503, json={"status": False, "message": "Busy"})
+        return httpx.Response(200, json={"status": True, "data": {"id": 7}})
+
+    async with make_client(handler) as client:
+        result = await client.create_refund("TRX_1", 500)
+
+    assert result["data"] == {"id": 7}
+    assert len(keys) == 3 and len(set(keys)) == 1
+
+
+@pytest.mark.parametrize("failure", [500, httpx.ReadTimeout])
+async def test_writes_that_may_have_been_applied_are_not_retried(failure, make_client):
+    from app.paystack_client import PaystackAPIError
+
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        if failure == 500:
+            return httpx.Response(500, json={"status": False, "message": "Error"})
+        raise failure("timed out", request=request)
+
+    async with make_client(handler) as client:
+        with pytest.raises((PaystackAPIError, httpx.ReadTimeout)):
+            await client.create_refund("TRX_1", 500)
+
+    assert calls == 1
+
+
+async def test_repeated_idempotency_key_is_answered_from_the_ledger(make_client):
+    calls = []
+
+    def handler(request):
+        calls.append(request.headers["Idempotency-Key"])
+        return httpx.Response(200, json={"status": True, "data": {"id": 1}})
+
+    async with make_client(handler) as client:
+        first = await client.create_plan("Gold", 5000, "monthly", "plan-gold")
+        second = await client.create_plan("Gold", 5000, "monthly", "plan-gold")
+        with pytest.raises(IdempotencyKeyReused):
+            await client.create_plan("Silver", 2500, "monthly", "plan-gold")
+
+    assert first == second
+    assert calls == ["plan-gold"]
+
+
+async def test_concurrent_reuse_of_an_idempotency_key_is_rejected(make_client):
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(200, json={"status": True, "data": {"id": 1}})
+
+    async with make_client(handler) as client:
+        gold = asyncio.create_task(
+            client.create_plan("Gold", 5000, "monthly", "plan-key")
+        )
+        await asyncio.sleep(0)
+        with pytest.raises(IdempotencyKeyReused):
+            await client.create_plan("Silver", 2500, "monthly", "plan-key")
+        release.set()
+        result = await gold
+
+    assert result["data"] == {"id": 1}
+
+
+def test_ledger_purges_expired_results():
+    ledger = IdempotencyLedger(retention=60)
+    with patch("app.idempotency.time.time", return_value=1000.0):
+        ledger.put("old", "fp", {"id": 1})
+    with patch("app.idempotency.time.time", return_value=1100.0):
+        ledger.put("new", "fp", {"id": 2})
+
+    rows = ledger._db.execute("SELECT key FROM idempotency").fetchall()
+    assert rows == [("new",)]
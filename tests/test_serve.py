@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.serve import create_app, parse_args
+
+
+def test_parse_args_defaults_to_stdio():
+    with patch.dict("os.environ", {}, clear=True):
+        args = parse_args([])
+
+    assert args.transport == "stdio"
+    assert args.workers == 1
+
+
+def test_parse_args_rejects_multi_worker_sse():
+    with pytest.raises(SystemExit):
+        parse_args(["--transport", "sse", "--workers", "2"])
+
+
+def test_create_app_is_stateless_with_several_workers():
+    from app.server import mcp
+
+    env = {"PAYSTACK_MCP_TRANSPORT": "streamable-http", "PAYSTACK_MCP_WORKERS": "4"}
+    with (
+        patch.dict("os.environ", env),
+        patch.object(mcp, "streamable_http_app") as streamable_http_app,
+        patch.object(mcp.settings, "stateless_http", False),
+    ):
+        app = create_app()
+        assert mcp.settings.stateless_http is True
+
+    assert app is streamable_http_app.return_value
+
+
+def test_main_runs_uvicorn_workers():
+    from app.serve import main
+
+    with patch("uvicorn.run") as run, patch.dict("os.environ", {}):
+        main(["--transport", "streamable-http", "--port", "9000", "--workers", "3"])
+
+    run.assert_called_once()
+    assert run.call_args.args == ("app.serve:create_app",)
+    assert run.call_args.kwargs["workers"] == 3
+    assert run.call_args.kwargs["factory"] is True
+
+
+def test_create_app_mounts_webhooks_when_enabled(tmp_path):
+    env = {"PAYSTACK_WEBHOOK_LOG": str(tmp_path / "events.jsonl")}
+    with patch.dict("os.environ", env):
+        app = create_app()
+
+    paths = {getattr(route, "path", None) for route in app.routes}
+    assert "/webhooks/paystack/{tenant}" in paths
+
+
+@pytest.mark.anyio
+async def test_worker_shutdown_closes_every_client():
+    from app.registry import ClientRegistry
+
+    registry = ClientRegistry({"default": "sk_default"})
+    client = registry.get()
+    env = {"PAYSTACK_MCP_TRANSPORT": "streamable-http"}
+    with patch.dict("os.environ", env), patch("app.registry.clients", registry):
+        app = create_app()
+        async with app.router.lifespan_context(app):
+            pass
+
+    assert registry.active() == {}
+    assert client.pool.http.is_closed
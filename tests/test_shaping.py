@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from app.shaping import MAX_LIST_ITEMS, compact_result, dumps, project_fields
+
+
+def test_project_fields_keeps_envelope_and_picks_from_each_record():
+    response = {
+        "status": True,
+        "meta": {"total": 2},
+        "data": [
+            {"id": 1, "amount": 100, "customer": {"email": "a@x.com", "id": 9}},
+            {"id": 2, "amount": 200},
+        ],
+    }
+
+    result = project_fields(response, ["id", "customer.email"])
+
+    assert result == {
+        "status": True,
+        "meta": {"total": 2},
+        "data": [{"id": 1, "customer": {"email": "a@x.com"}}, {"id": 2}],
+    }
+
+
+def test_project_fields_merges_paths_under_the_same_key():
+    record = {"customer": {"email": "a@x.com", "phone": "1", "id": 9}}
+
+    assert project_fields(record, ["customer.email", "customer.phone"]) == {
+        "customer": {"email": "a@x.com", "phone": "1"}
+    }
+
+
+def test_compact_result_drops_nulls_and_noisy_blobs():
+    response = {
+        "data": {
+            "reference": "ref_1",
+            "paid_at": None,
+            "authorization": {"last4": "4081"},
+            "log": {"history": []},
+        }
+    }
+
+    assert compact_result(response) == {"data": {"reference": "ref_1"}}
+    assert compact_result(response, keep=frozenset({"log"})) == {
+        "data": {"reference": "ref_1", "log": {"history": []}}
+    }
+
+
+def test_compact_result_summarizes_nested_lists_but_not_records():
+    records = [{"items": list(range(MAX_LIST_ITEMS + 5))} for _ in range(20)]
+
+    result = compact_result({"data": records})
+
+    assert len(result["data"]) == 20
+    assert result["data"][0]["items"] == {
+        "count": MAX_LIST_ITEMS + 5,
+        "first": list(range(MAX_LIST_ITEMS)),
+    }
+
+
+def test_dumps_is_compact_json():
+    text = dumps({"a": [1, 2], "b": "₦"})
+
+    assert text == '{"a":[1,2],"b":"₦"}'
+    assert json.loads(text) == {"a": [1, 2], "b": "₦"}
+
+
+def test_dumps_with_orjson_matches_json():
+    pytest.importorskip("orjson")
+    import app.shaping
+
+    value = {"a": [1, 2], "b": "₦", 3: None}
+
+    assert json.loads(app.shaping.dumps(value)) == {"a": [1, 2], "b": "₦", "3": None}
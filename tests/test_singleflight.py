@@ -0,0 +1,75 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.singleflight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"balance": 100}
+
+    results = await asyncio.gather(*(flight.do("balance", fetch) for _ in range(5)))
+
+    assert calls == 1
+    assert results == [{"balance": 100}] * 5
+    assert flight.stats() == {"in_flight": 0, "calls": 1, "coalesced": 4}
+
+
+async def test_exceptions_reach_every_caller():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream failed")
+
+    results = await asyncio.gather(
+        flight.do("key", fetch), flight.do("key", fetch), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_cancelled_caller_does_not_cancel_the_call():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    leader = asyncio.ensure_future(flight.do("key", fetch))
+    follower = asyncio.ensure_future(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "done"
+
+
+async def test_client_coalesces_identical_reads(make_client):
+    requests = []
+
+    async def handler(request):
+        requests.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"status": True, "data": {}})
+
+    async with make_client(handler) as client:
+        await asyncio.gather(
+            client.verify_transaction("REF_1"),
+            client.verify_transaction("REF_1"),
+            client.verify_transaction("REF_2"),
+        )
+
+    assert sorted(requests) == [
+        "/transaction/verify/REF_1",
+        "/transaction/verify/REF_2",
+    ]
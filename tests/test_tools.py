@@ -1,14 +1,14 @@
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
-from unittest.mock import patch, MagicMock
 
+# Registers the tools with the mcp instance.
+import app.tools  # noqa: F401
+from app.exports import ExportStore
+from app.server import mcp
 
-@pytest.fixture(autouse=True)
-def mock_env_vars():
-    """
-    Mock environment variables to avoid errors during test collection.
-    """
-    with patch.dict("os.environ", {"PAYSTACK_API_KEY": "test_key"}):
-        yield
+pytestmark = pytest.mark.anyio
 
 
 @pytest.fixture
@@ -16,301 +16,516 @@ def mock_paystack_client():
     """
     Mock the paystack_client to avoid actual API calls during tests.
     """
-    with patch("app.tools.paystack_client", MagicMock()) as mock_client:
-        yield mock_client
+    with patch("app.tools.clients") as mock_clients:
+        mock_clients.get.return_value = AsyncMock()
+        yield mock_clients.get.return_value
 
 
-def test_get_balance(mock_paystack_client):
+async def test_get_balance(mock_paystack_client):
     from app.tools import get_balance
 
-    get_balance()
-    mock_paystack_client.get_balance.assert_called_once()
+    await get_balance()
+    mock_paystack_client.get_balance.assert_awaited_once()
 
 
-def test_get_balance_ledger(mock_paystack_client):
+async def test_get_balance_ledger(mock_paystack_client):
     from app.tools import get_balance_ledger
 
-    get_balance_ledger()
-    mock_paystack_client.get_balance_ledger.assert_called_once()
+    await get_balance_ledger()
+    mock_paystack_client.get_balance_ledger.assert_awaited_once()
 
 
-def test_list_customers(mock_paystack_client):
+async def test_list_customers(mock_paystack_client):
     from app.tools import list_customers
 
-    list_customers()
-    mock_paystack_client.list_customers.assert_called_once()
+    await list_customers()
+    mock_paystack_client.list_customers.assert_awaited_once()
 
 
-def test_create_customer(mock_paystack_client):
+async def test_create_customer(mock_paystack_client):
     from app.tools import create_customer
 
-    create_customer("test@example.com", "John", "Doe")
-    mock_paystack_client.create_customer.assert_called_once()
+    await create_customer("test@example.com", "John", "Doe")
+    mock_paystack_client.create_customer.assert_awaited_once()
 
 
-def test_fetch_customer(mock_paystack_client):
+async def test_fetch_customer(mock_paystack_client):
     from app.tools import fetch_customer
 
-    fetch_customer("CUS_123")
-    mock_paystack_client.fetch_customer.assert_called_once()
+    await fetch_customer("CUS_123")
+    mock_paystack_client.fetch_customer.assert_awaited_once()
 
 
-def test_update_customer(mock_paystack_client):
+async def test_update_customer(mock_paystack_client):
     from app.tools import update_customer
 
-    update_customer("CUS_123", "John", "Doe")
-    mock_paystack_client.update_customer.assert_called_once()
+    await update_customer("CUS_123", "John", "Doe")
+    mock_paystack_client.update_customer.assert_awaited_once()
 
 
-def test_list_products(mock_paystack_client):
+async def test_list_products(mock_paystack_client):
     from app.tools import list_products
 
-    list_products()
-    mock_paystack_client.list_products.assert_called_once()
+    await list_products()
+    mock_paystack_client.list_products.assert_awaited_once()
 
 
-def test_create_product(mock_paystack_client):
+async def test_create_product(mock_paystack_client):
     from app.tools import create_product
 
-    create_product("Test Product", "A product for testing", 1000, "NGN")
-    mock_paystack_client.create_product.assert_called_once()
+    await create_product("Test Product", "A product for testing", 1000, "NGN")
+    mock_paystack_client.create_product.assert_awaited_once()
 
 
-def test_fetch_product(mock_paystack_client):
+async def test_fetch_product(mock_paystack_client):
     from app.tools import fetch_product
 
-    fetch_product("PROD_123")
-    mock_paystack_client.fetch_product.assert_called_once()
+    await fetch_product("PROD_123")
+    mock_paystack_client.fetch_product.assert_awaited_once()
 
 
-def test_update_product(mock_paystack_client):
+async def test_update_product(mock_paystack_client):
     from app.tools import update_product
 
-    update_product("PROD_123", name="New Name")
-    mock_paystack_client.update_product.assert_called_once()
+    await update_product("PROD_123", name="New Name")
+    mock_paystack_client.update_product.assert_awaited_once()
 
 
-def test_delete_product(mock_paystack_client):
+async def test_delete_product(mock_paystack_client):
     from app.tools import delete_product
 
-    delete_product("PROD_123")
-    mock_paystack_client.delete_product.assert_called_once()
+    await delete_product("PROD_123")
+    mock_paystack_client.delete_product.assert_awaited_once()
 
 
-def test_list_invoices(mock_paystack_client):
+async def test_list_invoices(mock_paystack_client):
     from app.tools import list_invoices
 
-    list_invoices()
-    mock_paystack_client.list_invoices.assert_called_once()
+    await list_invoices()
+    mock_paystack_client.list_invoices.assert_awaited_once()
 
 
-def test_create_invoice(mock_paystack_client):
+async def test_create_invoice(mock_paystack_client):
     from app.tools import create_invoice
 
-    create_invoice("CUS_123", 5000)
-    mock_paystack_client.create_invoice.assert_called_once()
+    await create_invoice("CUS_123", 5000)
+    mock_paystack_client.create_invoice.assert_awaited_once()
 
 
-def test_list_transactions(mock_paystack_client):
+async def test_list_transactions(mock_paystack_client):
     from app.tools import list_transactions
 
-    list_transactions()
-    mock_paystack_client.list_transactions.assert_called_once()
+    await list_transactions()
+    mock_paystack_client.list_transactions.assert_awaited_once()
 
 
-def test_initialize_transaction(mock_paystack_client):
+async def test_initialize_transaction(mock_paystack_client):
     from app.tools import initialize_transaction
 
-    initialize_transaction("test@example.com", 2500, "NGN")
-    mock_paystack_client.initialize_transaction.assert_called_once()
+    await initialize_transaction("test@example.com", 2500, "NGN")
+    mock_paystack_client.initialize_transaction.assert_awaited_once()
 
 
-def test_verify_transaction(mock_paystack_client):
+async def test_verify_transaction(mock_paystack_client):
     from app.tools import verify_transaction
 
-    verify_transaction("REF_123")
-    mock_paystack_client.verify_transaction.assert_called_once()
+    await verify_transaction("REF_123")
+    mock_paystack_client.verify_transaction.assert_awaited_once()
 
 
-def test_fetch_transaction(mock_paystack_client):
+async def test_fetch_transaction(mock_paystack_client):
     from app.tools import fetch_transaction
 
-    fetch_transaction("TRANS_123")
-    mock_paystack_client.fetch_transaction.assert_called_once()
+    await fetch_transaction("TRANS_123")
+    mock_paystack_client.fetch_transaction.assert_awaited_once()
 
 
-def test_get_transaction_timeline(mock_paystack_client):
+async def test_get_transaction_timeline(mock_paystack_client):
     from app.tools import get_transaction_timeline
 
-    get_transaction_timeline("TRANS_123")
-    mock_paystack_client.get_transaction_timeline.assert_called_once()
+    await get_transaction_timeline("TRANS_123")
+    mock_paystack_client.get_transaction_timeline.assert_awaited_once()
+
 
+async def test_download_transactions(mock_paystack_client):
+    from app.tools import download_transactions
+
+    await download_transactions()
+    mock_paystack_client.download_transactions.assert_awaited_once()
 
-def test_download_transactions(mock_paystack_client):
+
+async def test_download_transactions_all_pages(mock_paystack_client, tmp_path):
     from app.tools import download_transactions
 
-    download_transactions()
-    mock_paystack_client.download_transactions.assert_called_once()
+    async def records():
+        for index in range(3):
+            yield {"id": index}
+
+    mock_paystack_client.iter_transaction_export = MagicMock(return_value=records())
+    ctx = AsyncMock()
+    with patch("app.tools.exports", ExportStore(str(tmp_path))):
+        result = json.loads(
+            await download_transactions(
+                per_page=100, all_pages=True, max_workers=4, chunk_size=2, ctx=ctx
+            )
+        )
+
+    mock_paystack_client.iter_transaction_export.assert_called_once_with(
+        100, None, None, prefetch=4
+    )
+    mock_paystack_client.download_transactions.assert_not_called()
+    assert (result["records"], result["chunks"]) == (3, 2)
+    assert ctx.report_progress.await_count == 2
 
 
-def test_create_refund(mock_paystack_client):
+async def test_create_refund(mock_paystack_client):
     from app.tools import create_refund
 
-    create_refund("TRANS_123")
-    mock_paystack_client.create_refund.assert_called_once()
+    await create_refund("TRANS_123")
+    mock_paystack_client.create_refund.assert_awaited_once()
 
 
-def test_list_subscriptions(mock_paystack_client):
+async def test_list_subscriptions(mock_paystack_client):
     from app.tools import list_subscriptions
 
-    list_subscriptions()
-    mock_paystack_client.list_subscriptions.assert_called_once()
+    await list_subscriptions()
+    mock_paystack_client.list_subscriptions.assert_awaited_once()
 
 
-def test_disable_subscription(mock_paystack_client):
+async def test_disable_subscription(mock_paystack_client):
     from app.tools import disable_subscription
 
-    disable_subscription("SUB_123", "TOKEN_123")
-    mock_paystack_client.disable_subscription.assert_called_once()
+    await disable_subscription("SUB_123", "TOKEN_123")
+    mock_paystack_client.disable_subscription.assert_awaited_once()
 
 
-def test_list_disputes(mock_paystack_client):
+async def test_list_disputes(mock_paystack_client):
     from app.tools import list_disputes
 
-    list_disputes()
-    mock_paystack_client.list_disputes.assert_called_once()
+    await list_disputes()
+    mock_paystack_client.list_disputes.assert_awaited_once()
 
 
-def test_fetch_dispute(mock_paystack_client):
+async def test_fetch_dispute(mock_paystack_client):
     from app.tools import fetch_dispute
 
-    fetch_dispute("DIS_123")
-    mock_paystack_client.fetch_dispute.assert_called_once()
+    await fetch_dispute("DIS_123")
+    mock_paystack_client.fetch_dispute.assert_awaited_once()
 
 
-def test_download_dispute(mock_paystack_client):
+async def test_download_dispute(mock_paystack_client):
     from app.tools import download_dispute
 
-    download_dispute()
-    mock_paystack_client.download_dispute.assert_called_once()
+    await download_dispute()
+    mock_paystack_client.download_dispute.assert_awaited_once()
 
 
-def test_resolve_dispute(mock_paystack_client):
+async def test_download_dispute_all_pages(mock_paystack_client, tmp_path):
+    from app.tools import download_dispute
+
+    async def records():
+        yield {"id": 1}
+
+    mock_paystack_client.iter_dispute_export = MagicMock(return_value=records())
+    with patch("app.tools.exports", ExportStore(str(tmp_path))):
+        result = json.loads(await download_dispute(all_pages=True))
+
+    assert result["resource"] == f"paystack://exports/{result['export']}/0"
+
+
+async def test_resolve_dispute(mock_paystack_client):
     from app.tools import resolve_dispute
 
-    resolve_dispute("DIS_123", "resolved", "Message", "1000", "file.pdf")
-    mock_paystack_client.resolve_dispute.assert_called_once()
+    await resolve_dispute("DIS_123", "resolved", "Message", "1000", "file.pdf")
+    mock_paystack_client.resolve_dispute.assert_awaited_once()
 
 
-def test_add_evidence_to_dispute(mock_paystack_client):
+async def test_add_evidence_to_dispute(mock_paystack_client):
     from app.tools import add_evidence_to_dispute
 
-    add_evidence_to_dispute(
+    await add_evidence_to_dispute(
         "DIS_123", "test@example.com", "John Doe", "12345", "Details"
     )
-    mock_paystack_client.add_evidence_to_dispute.assert_called_once()
+    mock_paystack_client.add_evidence_to_dispute.assert_awaited_once()
 
 
-def test_create_payment_page(mock_paystack_client):
+async def test_create_payment_page(mock_paystack_client):
     from app.tools import create_payment_page
 
-    create_payment_page("Test Page", 1000)
-    mock_paystack_client.create_payment_page.assert_called_once()
+    await create_payment_page("Test Page", 1000)
+    mock_paystack_client.create_payment_page.assert_awaited_once()
 
 
-def test_list_payment_pages(mock_paystack_client):
+async def test_list_payment_pages(mock_paystack_client):
     from app.tools import list_payment_pages
 
-    list_payment_pages()
-    mock_paystack_client.list_payment_pages.assert_called_once()
+    await list_payment_pages()
+    mock_paystack_client.list_payment_pages.assert_awaited_once()
 
 
-def test_fetch_payment_page(mock_paystack_client):
+async def test_fetch_payment_page(mock_paystack_client):
     from app.tools import fetch_payment_page
 
-    fetch_payment_page("PAGE_123")
-    mock_paystack_client.fetch_payment_page.assert_called_once()
+    await fetch_payment_page("PAGE_123")
+    mock_paystack_client.fetch_payment_page.assert_awaited_once()
 
 
-def test_update_payment_page(mock_paystack_client):
+async def test_update_payment_page(mock_paystack_client):
     from app.tools import update_payment_page
 
-    update_payment_page("PAGE_123", name="New Page Name")
-    mock_paystack_client.update_payment_page.assert_called_once()
+    await update_payment_page("PAGE_123", name="New Page Name")
+    mock_paystack_client.update_payment_page.assert_awaited_once()
 
 
-def test_disable_payment_page(mock_paystack_client):
+async def test_disable_payment_page(mock_paystack_client):
     from app.tools import disable_payment_page
 
-    disable_payment_page("PAGE_123")
-    mock_paystack_client.disable_payment_page.assert_called_once()
+    await disable_payment_page("PAGE_123")
+    mock_paystack_client.disable_payment_page.assert_awaited_once()
 
 
-def test_enable_payment_page(mock_paystack_client):
+async def test_enable_payment_page(mock_paystack_client):
     from app.tools import enable_payment_page
 
-    enable_payment_page("PAGE_123")
-    mock_paystack_client.enable_payment_page.assert_called_once()
+    await enable_payment_page("PAGE_123")
+    mock_paystack_client.enable_payment_page.assert_awaited_once()
 
 
-def test_add_products_to_payment_page(mock_paystack_client):
+async def test_add_products_to_payment_page(mock_paystack_client):
     from app.tools import add_products_to_payment_page
 
-    add_products_to_payment_page("PAGE_123", ["PROD_123"])
-    mock_paystack_client.add_products_to_payment_page.assert_called_once()
+    await add_products_to_payment_page("PAGE_123", ["PROD_123"])
+    mock_paystack_client.add_products_to_payment_page.assert_awaited_once()
 
 
-def test_create_plan(mock_paystack_client):
+async def test_create_plan(mock_paystack_client):
     from app.tools import create_plan
 
-    create_plan("Test Plan", 1000, "monthly")
-    mock_paystack_client.create_plan.assert_called_once()
+    await create_plan("Test Plan", 1000, "monthly")
+    mock_paystack_client.create_plan.assert_awaited_once()
 
 
-def test_list_plans(mock_paystack_client):
+async def test_list_plans(mock_paystack_client):
     from app.tools import list_plans
 
-    list_plans()
-    mock_paystack_client.list_plans.assert_called_once()
+    await list_plans()
+    mock_paystack_client.list_plans.assert_awaited_once()
 
 
-def test_fetch_plan(mock_paystack_client):
+async def test_fetch_plan(mock_paystack_client):
     from app.tools import fetch_plan
 
-    fetch_plan("PLAN_123")
-    mock_paystack_client.fetch_plan.assert_called_once()
+    await fetch_plan("PLAN_123")
+    mock_paystack_client.fetch_plan.assert_awaited_once()
 
 
-def test_fetch_banks(mock_paystack_client):
+async def test_fetch_banks(mock_paystack_client):
     from app.tools import fetch_banks
 
-    fetch_banks(country="NG")
-    mock_paystack_client.fetch_banks.assert_called_once()
+    await fetch_banks(country="NG")
+    mock_paystack_client.fetch_banks.assert_awaited_once()
 
 
-def test_list_avs(mock_paystack_client):
+async def test_list_avs(mock_paystack_client):
     from app.tools import list_avs
 
-    list_avs(country="Nigeria")
-    mock_paystack_client.list_avs.assert_called_once()
+    await list_avs(country="Nigeria")
+    mock_paystack_client.list_avs.assert_awaited_once()
 
 
-def test_list_countries(mock_paystack_client):
+async def test_list_countries(mock_paystack_client):
     from app.tools import list_countries
 
-    list_countries()
-    mock_paystack_client.list_countries.assert_called_once()
+    await list_countries()
+    mock_paystack_client.list_countries.assert_awaited_once()
 
 
-def test_resolve_account_number(mock_paystack_client):
+async def test_resolve_account_number(mock_paystack_client):
     from app.tools import resolve_account_number
 
-    resolve_account_number("1234567890", "058")
-    mock_paystack_client.resolve_account_number.assert_called_once()
+    await resolve_account_number("1234567890", "058")
+    mock_paystack_client.resolve_account_number.assert_awaited_once()
 
 
-def test_resolve_card_bin(mock_paystack_client):
+async def test_resolve_card_bin(mock_paystack_client):
     from app.tools import resolve_card_bin
 
-    resolve_card_bin("539983")
-    mock_paystack_client.resolve_card_bin.assert_called_once()
+    await resolve_card_bin("539983")
+    mock_paystack_client.resolve_card_bin.assert_awaited_once()
+
+
+async def test_tools_use_the_requested_tenant():
+    from app.tools import get_balance
+
+    with patch("app.tools.clients") as mock_clients:
+        mock_clients.get.return_value = AsyncMock()
+        await get_balance(tenant="acme")
+    mock_clients.get.assert_called_once_with("acme")
+    mock_clients.get.return_value.get_balance.assert_awaited_once()
+
+
+async def test_verify_transactions(mock_paystack_client):
+    from app.tools import verify_transactions
+
+    mock_paystack_client.verify_transactions.return_value = [
+        {"reference": "ref_1", "ok": True, "result": {}},
+        {"reference": "ref_2", "ok": False, "error": "404: Not found"},
+    ]
+
+    result = json.loads(await verify_transactions(["ref_1", "ref_2"], AsyncMock()))
+
+    mock_paystack_client.verify_transactions.assert_awaited_once()
+    assert (result["succeeded"], result["failed"]) == (1, 1)
+
+
+async def test_bulk_upsert_customers(mock_paystack_client, tmp_path):
+    from app.tools import bulk_upsert_customers
+
+    path = tmp_path / "customers.csv"
+    path.write_text("email,first_name\nada@example.com,Ada\n")
+    mock_paystack_client.fetch_customer.return_value = {
+        "data": {"customer_code": "CUS_ada"}
+    }
+    mock_paystack_client.update_customer.return_value = {
+        "data": {"customer_code": "CUS_ada"}
+    }
+
+    with patch.dict("os.environ", {"PAYSTACK_IMPORT_DIR": str(tmp_path)}):
+        result = json.loads(
+            await bulk_upsert_customers(AsyncMock(), path="customers.csv")
+        )
+
+    assert result["updated"] == 1
+    assert result["checkpoint"] == "customers.csv.checkpoint.jsonl"
+    assert (tmp_path / "customers.csv.checkpoint.jsonl").exists()
+
+
+async def test_bulk_upsert_customers_stays_in_the_import_directory(
+    mock_paystack_client, tmp_path
+):
+    from app.tools import bulk_upsert_customers
+
+    (tmp_path / "imports").mkdir()
+    with patch.dict("os.environ", {"PAYSTACK_IMPORT_DIR": str(tmp_path / "imports")}):
+        with pytest.raises(ValueError, match="outside the import directory"):
+            await bulk_upsert_customers(AsyncMock(), path="../customers.csv")
+        with pytest.raises(ValueError, match="outside the import directory"):
+            await bulk_upsert_customers(
+                AsyncMock(), customers="email\n", checkpoint_path="/etc/passwd"
+            )
+
+    with pytest.raises(ValueError, match="PAYSTACK_IMPORT_DIR"):
+        await bulk_upsert_customers(AsyncMock(), path="customers.csv")
+
+
+async def test_bulk_create_refunds(mock_paystack_client):
+    from app.tools import bulk_create_refunds
+
+    mock_paystack_client.verify_transaction.return_value = {
+        "data": {"id": 1, "status": "success", "amount": 500, "currency": "NGN"}
+    }
+    mock_paystack_client.list_refunds.return_value = {"data": []}
+
+    result = json.loads(
+        await bulk_create_refunds([("ref_1", 500)], AsyncMock(), dry_run=True)
+    )
+
+    assert result["would_refund"] == 1
+    mock_paystack_client.create_refund.assert_not_awaited()
+
+
+async def test_batch_tools_shape_every_outcome(mock_paystack_client):
+    from app.tools import bulk_create_refunds, verify_transactions
+
+    references = [f"ref_{index}" for index in range(30)]
+    mock_paystack_client.verify_transactions.return_value = [
+        {"reference": reference, "ok": True, "result": {"data": {"log": None}}}
+        for reference in references[:25]
+    ]
+    mock_paystack_client.verify_transaction.return_value = {
+        "data": {"id": 1, "status": "success", "amount": 500, "currency": "NGN"}
+    }
+    mock_paystack_client.list_refunds.return_value = {"data": []}
+
+    verified = json.loads(
+        await verify_transactions(references[:25], AsyncMock(), compact=True)
+    )
+    picked = json.loads(
+        await verify_transactions(references[:25], AsyncMock(), fields=["reference"])
+    )
+    ledger = json.loads(
+        await bulk_create_refunds(
+            [(reference, None) for reference in references],
+            AsyncMock(),
+            dry_run=True,
+            fields=["transaction", "status"],
+            compact=True,
+        )
+    )
+
+    assert len(verified["results"]) == 25
+    assert verified["results"][0] == {
+        "reference": "ref_0",
+        "ok": True,
+        "result": {"data": {}},
+    }
+    assert picked["results"] == [
+        {"reference": reference} for reference in references[:25]
+    ]
+    assert picked["succeeded"] == 25
+    assert ledger["ledger"] == [
+        {"transaction": reference, "status": "would_refund"} for reference in references
+    ]
+
+
+async def test_query_mirror(mock_paystack_client):
+    from app.tools import query_mirror
+
+    mock_paystack_client.mirror = MagicMock()
+    await query_mirror("transactions", status="failed", channel="card")
+
+    mock_paystack_client.mirror.query.assert_called_once_with(
+        "transactions", {"status": "failed", "channel": "card"}, None, None, 50, 0
+    )
+
+
+async def test_aggregate_transactions(mock_paystack_client):
+    from app.tools import aggregate_transactions
+
+    mock_paystack_client.mirror = MagicMock()
+    await aggregate_transactions(group_by=["day"], status="success")
+
+    mock_paystack_client.mirror.aggregate.assert_called_once_with(
+        "transactions", ["day"], {"status": "success"}, None, None, None
+    )
+
+
+async def test_tool_fields_and_compact(mock_paystack_client):
+    from app.tools import verify_transaction
+
+    mock_paystack_client.verify_transaction.return_value = {
+        "status": True,
+        "data": {
+            "reference": "ref_1",
+            "amount": 500,
+            "paid_at": None,
+            "customer": {"email": "ada@example.com", "phone": None},
+            "authorization": {"last4": "4081"},
+        },
+    }
+
+    result = await verify_transaction(
+        "ref_1", fields=["reference", "customer"], compact=True
+    )
+
+    assert json.loads(result) == {
+        "status": True,
+        "data": {"reference": "ref_1", "customer": {"email": "ada@example.com"}},
+    }
+
+
+def test_tool_schema_includes_shaping_arguments():
+    tool = mcp._tool_manager.get_tool("transaction.verify")
+
+    assert {"fields", "compact", "reference"} <= set(tool.parameters["properties"])
+    assert "compact:" in tool.description
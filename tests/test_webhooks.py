@@ -0,0 +1,129 @@
+import hashlib
+import hmac
+import json
+
+import anyio
+import httpx
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+SECRET = "sk_test"
+
+
+def sign(body: bytes, secret: str = SECRET) -> str:
+    return hmac.new(secret.encode(), body, hashlib.sha512).hexdigest()
+
+
+def offline(request):
+    raise AssertionError(f"Unexpected request to {request.url}")
+
+
+@pytest.fixture
+def receiver(tmp_path):
+    from app.mirror import Mirror
+    from app.registry import ClientRegistry
+    from app.webhooks import EventLog, WebhookReceiver
+
+    registry = ClientRegistry(
+        {"default": SECRET, "acme": "sk_acme"},
+        transport=httpx.MockTransport(offline),
+        mirror=Mirror(str(tmp_path / "mirror.db")),
+    )
+    return WebhookReceiver(registry, EventLog(str(tmp_path / "events.jsonl")))
+
+
+def event(name: str, data: dict) -> bytes:
+    return json.dumps({"event": name, "data": data}, indent=2).encode()
+
+
+def test_verify_signature():
+    from app.webhooks import verify_signature
+
+    body = b'{"event":"charge.success"}'
+
+    assert verify_signature(SECRET, body, sign(body))
+    assert not verify_signature(SECRET, body, sign(body, "sk_other"))
+    assert not verify_signature(SECRET, body, None)
+
+
+async def test_rejects_bad_signatures_and_unknown_tenants(receiver):
+    body = event("charge.success", {"id": 1, "reference": "ref_1"})
+
+    assert receiver.receive(None, body, sign(body, "sk_other")) == 401
+    assert receiver.receive("globex", body, sign(body)) == 404
+    assert receiver.receive("acme", body, sign(body)) == 401
+    assert receiver.log._fd is None
+
+
+async def test_charge_event_answers_verify_without_a_request(receiver):
+    data = {"id": 1, "reference": "ref_1", "status": "success", "amount": 500}
+    body = event("charge.success", data)
+
+    assert receiver.receive(None, body, sign(body)) == 200
+
+    client = receiver.clients.get()
+    result = await client.verify_transaction("ref_1")
+    assert result == {
+        "status": True,
+        "message": "Verification successful",
+        "data": data,
+    }
+
+
+async def test_dispute_event_answers_fetch_dispute(receiver):
+    data = {"id": 7, "status": "awaiting-merchant-feedback", "currency": "NGN"}
+    body = event("charge.dispute.create", data)
+
+    assert receiver.receive(None, body, sign(body)) == 200
+
+    result = await receiver.clients.get().fetch_dispute("7")
+    assert result["data"] == data
+
+
+async def test_flush_writes_the_mirror_and_log(receiver):
+    first = event(
+        "charge.success", {"id": 1, "reference": "ref_1", "status": "success"}
+    )
+    second = event(
+        "charge.success", {"id": 2, "reference": "ref_2", "status": "failed"}
+    )
+    receiver.receive(None, first, sign(first))
+    receiver.receive(None, second, sign(second))
+
+    receiver.flush()
+
+    mirror = receiver.clients.get().mirror
+    rows = mirror.query("transactions", {"status": "failed"})
+    assert [row["reference"] for row in rows] == ["ref_2"]
+    text = await anyio.Path(receiver.log.path).read_text()
+    lines = [json.loads(line) for line in text.splitlines()]
+    assert [line["event"]["data"]["id"] for line in lines] == [1, 2]
+    assert lines[0]["tenant"] == "default"
+
+
+async def test_route_answers_with_the_receiver_status(receiver, monkeypatch):
+    from starlette.applications import Starlette
+
+    import app.webhooks
+    from app.server import mcp
+
+    monkeypatch.setattr(app.webhooks, "receiver", lambda: receiver)
+    asgi = Starlette(routes=mcp._custom_starlette_routes)
+    body = event("charge.success", {"id": 1, "reference": "ref_1"})
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(asgi), base_url="http://test"
+    ) as http:
+        ok = await http.post(
+            "/webhooks/paystack",
+            content=body,
+            headers={"x-paystack-signature": sign(body)},
+        )
+        forged = await http.post(
+            "/webhooks/paystack/acme",
+            content=body,
+            headers={"x-paystack-signature": sign(body)},
+        )
+
+    assert (ok.status_code, forged.status_code) == (200, 401)